@@ -0,0 +1,49 @@
+import os
+import tempfile
+import time
+
+import joblib
+import pandas as pd
+
+from src.model.data_ingestion import load_raw_data
+from src.model.data_preprocessing import (
+    map_diagnosis_to_numerical,
+    prepare_features_and_target,
+)
+from src.model.model_training import train_and_save_pipeline
+
+
+def load_or_train_pipeline(model_path="models/model.joblib", data_path="data/data.csv"):
+    """Loads the trained pipeline, training a throwaway one if it does not exist yet."""
+    if not os.path.exists(model_path):
+        model_path = os.path.join(tempfile.mkdtemp(), "model.joblib")
+        train_and_save_pipeline(data_path=data_path, model_path=model_path)
+    return joblib.load(model_path)
+
+
+def load_features(data_path="data/data.csv"):
+    """Returns the raw feature DataFrame (X) of the dataset."""
+    X, _ = prepare_features_and_target(
+        map_diagnosis_to_numerical(load_raw_data(data_path))
+    )
+    return X
+
+
+def time_call(func, repeat=5, number=10):
+    """Returns the best per-call time in seconds over `repeat` rounds of `number` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def make_scaled_dataset(output_path, factor, data_path="data/data.csv"):
+    """Writes `factor` stacked copies of the dataset (with fresh ids) to output_path."""
+    df = pd.read_csv(data_path)
+    scaled = pd.concat([df] * factor, ignore_index=True)
+    scaled["id"] = range(len(scaled))
+    scaled.to_csv(output_path, index=False)
+    return output_path
@@ -0,0 +1,70 @@
+"""Compares sklearn pipeline inference with the compiled NumPy engine.
+
+Usage: python -m benchmarks.bench_compiled_model [--model-path models/model.joblib]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import joblib
+import numpy as np
+
+from benchmarks._common import load_features, load_or_train_pipeline, time_call
+from src.model.compiled_model import export_compiled_model, load_compiled_model
+
+
+def import_time(statement):
+    """Wall time (s) of a fresh interpreter that runs `statement`."""
+    code = (
+        "import time; t = time.perf_counter(); "
+        f"{statement}; print(time.perf_counter() - t)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return float(output.stdout.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", default="models/model.joblib")
+    args = parser.parse_args()
+
+    pipeline = load_or_train_pipeline(args.model_path)
+    compiled_path = os.path.join(tempfile.mkdtemp(), "model.npz")
+    export_compiled_model(pipeline, compiled_path)
+    compiled = load_compiled_model(compiled_path)
+    X = load_features()
+    assert np.array_equal(pipeline.predict_proba(X), compiled.predict_proba(X))
+
+    features = list(compiled.feature_names_in_)
+    print(f"{'rows':>6} {'sklearn (ms)':>13} {'compiled (ms)':>14} {'speedup':>8}")
+    for n_rows in (1, 10, 100, len(X)):
+        batch = X.iloc[:n_rows]
+        matrix = batch[features].to_numpy()
+        before = time_call(lambda: pipeline.predict_proba(batch))
+        after = time_call(lambda: compiled.predict_proba(matrix))
+        print(
+            f"{n_rows:>6} {before * 1e3:>13.3f} {after * 1e3:>14.3f} "
+            f"{before / after:>7.1f}x"
+        )
+
+    joblib_path = os.path.join(os.path.dirname(compiled_path), "model.joblib")
+    joblib.dump(pipeline, joblib_path)
+    joblib_load = import_time(f"import joblib; joblib.load({joblib_path!r})")
+    compiled_load = import_time(
+        "from src.model.compiled_model import load_compiled_model; "
+        f"load_compiled_model({compiled_path!r})"
+    )
+    print(f"\nimport + load: joblib {joblib_load:.3f}s, compiled {compiled_load:.3f}s")
+    print(
+        f"artifact size: joblib {os.path.getsize(joblib_path)} B, "
+        f"compiled {os.path.getsize(compiled_path)} B"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Compares CSV parsing + preprocessing with loading the cached Arrow columns.
+
+Usage: python -m benchmarks.bench_data_cache [--factors 1 10 100]
+"""
+
+import argparse
+import os
+import tempfile
+
+from benchmarks._common import make_scaled_dataset, time_call
+from src.model.data_cache import load_preprocessed_data, warm_cache
+from src.model.data_ingestion import load_raw_data
+from src.model.data_preprocessing import (
+    drop_unnecessary_columns,
+    map_diagnosis_to_numerical,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--factors", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    cache_dir = os.path.join(work_dir, "cache")
+    print(f"{'rows':>8} {'csv (ms)':>10} {'cached (ms)':>12} {'speedup':>8}")
+    for factor in args.factors:
+        data_path = make_scaled_dataset(
+            os.path.join(work_dir, f"data_x{factor}.csv"), factor
+        )
+        warm_cache(data_path, cache_dir)
+        n_rows = len(load_preprocessed_data(data_path, cache_dir))
+
+        before = time_call(
+            lambda: map_diagnosis_to_numerical(
+                drop_unnecessary_columns(load_raw_data(data_path))
+            ),
+            repeat=3,
+            number=3,
+        )
+        after = time_call(
+            lambda: load_preprocessed_data(data_path, cache_dir), repeat=3, number=3
+        )
+        print(
+            f"{n_rows:>8} {before * 1e3:>10.1f} {after * 1e3:>12.1f} "
+            f"{before / after:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
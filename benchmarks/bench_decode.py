@@ -0,0 +1,72 @@
+"""Compares the pydantic + DataFrame request decoding with the FeatureDecoder fast path.
+
+Usage: python -m benchmarks.bench_decode [--model-path models/model.joblib]
+"""
+
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import load_or_train_pipeline, time_call
+from src.model.model_inference import predict_with_proba
+from src.schemas import PredictRequest
+from src.serving.decoding import FeatureDecoder
+
+
+def pydantic_decode(data, feature_names):
+    """The decode steps /predict ran before the fast path."""
+    payload = PredictRequest.model_validate(data)
+    input_df = pd.DataFrame([payload.model_dump(by_alias=True)])
+    missing_features = set(feature_names) - set(input_df.columns)
+    for feature in missing_features:
+        input_df[feature] = 0
+    return input_df[feature_names]
+
+
+def fast_decode(decoder, data):
+    """The decode steps /predict runs now."""
+    return pd.DataFrame(decoder.decode(data), columns=decoder.feature_names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", default="models/model.joblib")
+    parser.add_argument("--payload", default="tests/fixtures/sample_payload.json")
+    args = parser.parse_args()
+
+    pipeline = load_or_train_pipeline(args.model_path)
+    feature_names = list(pipeline.feature_names_in_)
+    decoder = FeatureDecoder(feature_names)
+    with open(args.payload) as f:
+        data = json.load(f)
+
+    before_df = pydantic_decode(data, feature_names)
+    after_df = fast_decode(decoder, data)
+    assert np.array_equal(before_df.to_numpy(dtype=float), after_df.to_numpy())
+
+    rows = [
+        (
+            "decode only",
+            lambda: pydantic_decode(data, feature_names),
+            lambda: fast_decode(decoder, data),
+        ),
+        (
+            "decode + inference",
+            lambda: predict_with_proba(pipeline, pydantic_decode(data, feature_names)),
+            lambda: predict_with_proba(pipeline, fast_decode(decoder, data)),
+        ),
+    ]
+    print(f"{'stage':<20} {'pydantic (us)':>14} {'fast path (us)':>15} {'speedup':>8}")
+    for label, before_func, after_func in rows:
+        before = time_call(before_func, number=200)
+        after = time_call(after_func, number=200)
+        print(
+            f"{label:<20} {before * 1e6:>14.1f} {after * 1e6:>15.1f} "
+            f"{before / after:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
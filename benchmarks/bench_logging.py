@@ -0,0 +1,159 @@
+"""Compares synchronous logging with the queued, sampled JSON setup used by the API.
+
+Reports the time the per-request log lines of /predict cost in the request
+thread, and end-to-end /predict throughput. "sync" reproduces the previous configuration: a FileHandler plus a stdout
+handler on the root logger, formatting and writing every line in the request
+thread. "queued" is src.serving.logging_config as the API uses it. Both write
+real files; stdout is redirected to a file, optionally slowed down by
+--sink-latency-ms per write to mimic a congested log pipe (container log
+driver, network filesystem).
+
+Usage: python -m benchmarks.bench_logging [--model-path PATH] [--requests 2000] [--threads 8]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks._common import time_call
+from src.model.model_training import train_and_save_pipeline
+
+RESULT = {"prediction": 1, "probability_benign": 0.02, "probability_malignant": 0.98}
+
+
+class SlowStream:
+    """File-like wrapper that sleeps before every write."""
+
+    def __init__(self, stream, latency):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, text):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def run_requests(client_factory, payload, n_requests, n_threads):
+    """Returns requests per second for n_requests POSTs to /predict split over n_threads."""
+    per_thread = n_requests // n_threads
+
+    def worker():
+        client = client_factory()
+        for _ in range(per_thread):
+            assert client.post("/predict", json=payload).status_code == 200
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return per_thread * n_threads / (time.perf_counter() - start)
+
+
+def log_request_sync():
+    """The per-request lines /predict logged before (f-strings on the root logger)."""
+    logging.info("Prediction endpoint hit.")
+    logging.info(f"Prediction successful: {RESULT}")
+
+
+def log_request_queued(request_log):
+    """The per-request lines /predict logs now."""
+    request_log.info("Prediction endpoint hit.")
+    request_log.info("Prediction successful.", extra={"result": RESULT})
+
+
+def configure_sync_logging(log_file, stdout):
+    """The logging setup src/app.py used before the queue-based pipeline."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="*** FLASK API LOG: %(asctime)s - %(levelname)s - %(message)s ***",
+        handlers=[logging.FileHandler(log_file), logging.StreamHandler(stdout)],
+        force=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", default="models/model.joblib")
+    parser.add_argument("--payload", default="tests/fixtures/sample_payload.json")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    parser.add_argument("--sink-latency-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    model_path = args.model_path
+    if not os.path.exists(model_path):
+        model_path = os.path.join(workdir, "model.joblib")
+        train_and_save_pipeline(data_path="data/data.csv", model_path=model_path)
+    os.environ["MODEL_PATH"] = model_path
+    os.environ["LOG_FILE"] = os.path.join(workdir, "api_logs.log")
+
+    with open(args.payload) as f:
+        payload = json.load(f)
+
+    stdout_file = open(os.path.join(workdir, "stdout.log"), "w")
+    real_stdout = sys.stdout
+    results = {}
+    try:
+        sys.stdout = stdout_file
+        # Importing the app installs the queued logging setup
+        import src.app as app_module
+        from src.serving.logging_config import (
+            REQUEST_LOGGER,
+            configure_logging,
+            stop_logging,
+        )
+
+        request_log = logging.getLogger(REQUEST_LOGGER)
+
+        client_factory = app_module.app.test_client
+        run_requests(client_factory, payload, 200, args.threads)  # warm-up
+
+        for latency_ms in sorted({0.0, args.sink_latency_ms}):
+            sys.stdout = SlowStream(stdout_file, latency_ms / 1e3)
+            configure_sync_logging(os.path.join(workdir, "sync.log"), sys.stdout)
+            results[latency_ms, "sync, every line"] = (
+                time_call(log_request_sync, number=100),
+                run_requests(client_factory, payload, args.requests, args.threads),
+            )
+            for rate in (1.0, args.sample_rate):
+                configure_logging(
+                    log_file=os.path.join(workdir, f"queued-{rate}.log"),
+                    sample_rate=rate,
+                )
+                results[latency_ms, f"queued JSON, sample {rate:g}"] = (
+                    time_call(lambda: log_request_queued(request_log), number=100),
+                    run_requests(client_factory, payload, args.requests, args.threads),
+                )
+                stop_logging()  # drain the queue so the next round starts clean
+    finally:
+        sys.stdout = real_stdout
+        stdout_file.close()
+
+    print(f"{args.requests} requests to /predict from {args.threads} threads")
+    print(
+        f"{'stdout latency':>14} {'logging':<26} {'log us/request':>15} "
+        f"{'req/s':>8} {'vs sync':>8}"
+    )
+    for (latency_ms, label), (log_time, throughput) in results.items():
+        baseline = results[latency_ms, "sync, every line"][1]
+        print(
+            f"{latency_ms:>11.1f} ms {label:<26} {log_time * 1e6:>15.1f} "
+            f"{throughput:>8.1f} {throughput / baseline:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
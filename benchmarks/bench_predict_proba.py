@@ -0,0 +1,48 @@
+"""Compares predict() + predict_proba() with the single-pass predict_with_proba().
+
+Usage: python -m benchmarks.bench_predict_proba [--model-path models/model.joblib]
+"""
+
+import argparse
+
+import numpy as np
+
+from benchmarks._common import load_features, load_or_train_pipeline, time_call
+from src.model.model_inference import predict_with_proba
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", default="models/model.joblib")
+    parser.add_argument("--data-path", default="data/data.csv")
+    args = parser.parse_args()
+
+    pipeline = load_or_train_pipeline(args.model_path, args.data_path)
+    X = load_features(args.data_path)
+
+    print(
+        f"{'rows':>6} {'predict+proba (ms)':>20} {'proba only (ms)':>16} {'speedup':>8}"
+    )
+    for n_rows in (1, 10, 100, len(X)):
+        batch = X.iloc[:n_rows]
+
+        def two_passes():
+            return pipeline.predict(batch), pipeline.predict_proba(batch)
+
+        def one_pass():
+            return predict_with_proba(pipeline, batch)
+
+        labels, proba = one_pass()
+        expected_labels, expected_proba = two_passes()
+        assert np.array_equal(labels, expected_labels)
+        assert np.array_equal(proba, expected_proba)
+
+        before = time_call(two_passes)
+        after = time_call(one_pass)
+        print(
+            f"{n_rows:>6} {before * 1e3:>20.3f} {after * 1e3:>16.3f} {before / after:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
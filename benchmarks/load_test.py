@@ -0,0 +1,119 @@
+"""Load test for /predict: Flask under gunicorn vs. the micro-batching ASGI app.
+
+Starts each server (or uses --url), fires --requests single-row predictions from
+--concurrency client threads, and reports p50/p99 latency and throughput.
+
+Usage: python -m benchmarks.load_test [--model-path PATH] [--concurrency 32] [--requests 2000]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+import requests
+
+SERVERS = {
+    "flask (gunicorn sync)": lambda port, workers: [
+        sys.executable, "-m", "gunicorn", "--config", "config/gunicorn.conf.py",
+        "--bind", f"127.0.0.1:{port}", "--workers", str(workers), "src.app:app",
+    ],
+    "asgi (uvicorn, micro-batching)": lambda port, workers: [
+        sys.executable, "-m", "uvicorn", "src.asgi_app:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+        "--log-level", "warning",
+    ],
+}  # fmt: skip
+
+
+def wait_until_ready(url, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url, timeout=1).json().get("model_loaded"):
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Server at {url} did not become ready in time.")
+
+
+def run_load(url, payload, n_requests, concurrency):
+    """Returns (latencies in seconds, wall time) for n_requests POSTs to url/predict."""
+    latencies = []
+    lock = threading.Lock()
+    remaining = iter(range(n_requests))
+
+    def client():
+        with requests.Session() as session:
+            local = []
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        break
+                start = time.perf_counter()
+                session.post(f"{url}/predict", json=payload).raise_for_status()
+                local.append(time.perf_counter() - start)
+            with lock:
+                latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.array(latencies), time.perf_counter() - start
+
+
+def report(label, latencies, wall):
+    print(
+        f"{label:<32} {np.percentile(latencies, 50) * 1e3:>9.2f} "
+        f"{np.percentile(latencies, 99) * 1e3:>9.2f} {len(latencies) / wall:>10.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", default="models/model.joblib")
+    parser.add_argument("--url", help="Load test an already running server instead.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=5077)
+    parser.add_argument("--payload", default="tests/fixtures/sample_payload.json")
+    args = parser.parse_args()
+
+    with open(args.payload) as f:
+        payload = json.load(f)
+
+    print(f"{args.requests} requests, {args.concurrency} concurrent clients")
+    print(f"{'server':<32} {'p50 (ms)':>9} {'p99 (ms)':>9} {'req/s':>10}")
+    if args.url:
+        report(args.url, *run_load(args.url, payload, args.requests, args.concurrency))
+        return
+
+    env = {**os.environ, "MODEL_PATH": args.model_path}
+    for label, command in SERVERS.items():
+        server = subprocess.Popen(
+            command(args.port, args.workers),
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        url = f"http://127.0.0.1:{args.port}"
+        try:
+            wait_until_ready(url)
+            run_load(url, payload, min(100, args.requests), args.concurrency)  # warm-up
+            report(label, *run_load(url, payload, args.requests, args.concurrency))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Reports memory per gunicorn worker for different model layouts and preload settings.
+
+Starts the API under gunicorn for each configuration, sends some predictions so
+the model pages are touched, then reads /proc/<pid>/smaps_rollup of every worker.
+RSS counts shared pages in full for every worker; PSS splits them between the
+processes sharing them, and "private" is memory no other process shares. Linux only.
+
+Usage: python -m benchmarks.measure_worker_memory [--model-path PATH] [--workers 4]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+from benchmarks._common import load_or_train_pipeline
+from src.model.compiled_model import export_compiled_model
+
+
+def worker_pids(master_pid):
+    """PIDs of the direct children of master_pid."""
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name can contain spaces; ppid follows the closing paren
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == master_pid:
+            children.append(int(entry))
+    return children
+
+
+def memory_kb(pid):
+    """RSS, PSS and private memory (kB) of a process."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def measure(model_path, workers, preload, port, payload, n_requests):
+    """Runs gunicorn with the given settings and returns per-worker memory."""
+    env = {
+        **os.environ,
+        "MODEL_PATH": model_path,
+        "GUNICORN_WORKERS": str(workers),
+        "GUNICORN_PRELOAD": str(preload).lower(),
+        "GUNICORN_BIND": f"127.0.0.1:{port}",
+    }
+    master = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "--config",
+            "config/gunicorn.conf.py",
+            "src.app:app",
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 120
+        while time.monotonic() < deadline:
+            try:
+                if requests.get(url, timeout=1).json().get("model_loaded"):
+                    break
+            except requests.RequestException:
+                pass
+            time.sleep(0.5)
+        else:
+            raise RuntimeError("gunicorn did not become ready in time.")
+
+        with requests.Session() as session:
+            for _ in range(n_requests):
+                session.post(f"{url}/predict", json=payload).raise_for_status()
+        time.sleep(1)
+        return [memory_kb(pid) for pid in worker_pids(master.pid)]
+    finally:
+        master.terminate()
+        master.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", default="models/model.joblib")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--payload", default="tests/fixtures/sample_payload.json")
+    args = parser.parse_args()
+
+    pipeline = load_or_train_pipeline(args.model_path)
+    work_dir = tempfile.mkdtemp()
+    joblib_path = os.path.abspath(args.model_path)
+    if not os.path.exists(joblib_path):
+        import joblib
+
+        joblib_path = os.path.join(work_dir, "model.joblib")
+        joblib.dump(pipeline, joblib_path)
+    arrays_path = os.path.join(work_dir, "model_arrays")
+    export_compiled_model(pipeline, arrays_path)
+    with open(args.payload) as f:
+        payload = json.load(f)
+
+    configurations = [
+        ("joblib, no preload", joblib_path, False),
+        ("joblib, preload", joblib_path, True),
+        ("compiled mmap, preload", arrays_path, True),
+    ]
+    print(
+        f"{args.workers} workers, {args.requests} predictions each run (kB per worker)"
+    )
+    print(
+        f"{'configuration':<24} {'RSS':>9} {'PSS':>9} {'private':>9} {'total PSS':>10}"
+    )
+    for label, model_path, preload in configurations:
+        stats = measure(
+            model_path, args.workers, preload, args.port, payload, args.requests
+        )
+        n = max(len(stats), 1)
+        print(
+            f"{label:<24} {sum(s['rss'] for s in stats) // n:>9} "
+            f"{sum(s['pss'] for s in stats) // n:>9} "
+            f"{sum(s['private'] for s in stats) // n:>9} "
+            f"{sum(s['pss'] for s in stats):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
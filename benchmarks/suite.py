@@ -0,0 +1,208 @@
+"""Benchmark suite: ingestion, training, model loading, inference and the Flask routes.
+
+Every case is timed at several dataset or batch sizes (datasets are scaled-up
+copies of data/data.csv) and the best time per call is saved as JSON, so runs
+can be compared across commits. With --compare, the run fails (exit code 1)
+when a case present in both files got slower by more than --threshold.
+
+Usage:
+    python -m benchmarks.suite --output benchmarks/results/main.json
+    python -m benchmarks.suite --compare benchmarks/results/main.json [--threshold 0.2]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+import numpy as np
+
+from benchmarks._common import load_features, make_scaled_dataset, time_call
+from src.model.data_ingestion import load_raw_data
+from src.model.model_inference import invalidate_pipeline_cache, load_pipeline, predict
+from src.model.model_training import train_and_save_pipeline
+from src.schemas import FEATURE_NAMES
+
+# Dataset scale factors (copies of data/data.csv) and request batch sizes
+DATASET_FACTORS = (1, 10, 50)
+TRAINING_FACTORS = (1, 10)
+BATCH_SIZES = (1, 100, 10_000)
+ROUTE_BATCH_SIZES = (1, 100, 1000)
+
+
+def sample_rows(features, n_rows):
+    """n_rows rows drawn (with repetition) from the dataset features."""
+    return features.iloc[np.arange(n_rows) % len(features)].reset_index(drop=True)
+
+
+def quiet(func, *args, **kwargs):
+    """Calls func with its prints (e.g. training progress) suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def build_cases(workdir, data_path, quick=False):
+    """Yields (name, func, number, repeat) for every benchmark case."""
+    factors = DATASET_FACTORS[:2] if quick else DATASET_FACTORS
+    datasets = {
+        factor: make_scaled_dataset(
+            os.path.join(workdir, f"data_x{factor}.csv"), factor, data_path
+        )
+        for factor in factors
+    }
+    model_path = os.path.join(workdir, "model.joblib")
+    quiet(train_and_save_pipeline, data_path=data_path, model_path=model_path)
+
+    for factor, path in datasets.items():
+        yield f"load_raw_data[x{factor}]", lambda path=path: load_raw_data(path), 3, 3
+
+    for factor in TRAINING_FACTORS[:1] if quick else TRAINING_FACTORS:
+        output = os.path.join(workdir, f"train_x{factor}.joblib")
+        yield (
+            f"train_and_save_pipeline[x{factor}]",
+            lambda factor=factor, output=output: quiet(
+                train_and_save_pipeline, data_path=datasets[factor], model_path=output
+            ),
+            1,
+            3,
+        )
+
+    yield "load_pipeline", lambda: load_pipeline(model_path), 5, 5
+
+    features = load_features(data_path)
+    for n_rows in BATCH_SIZES:
+        batch = sample_rows(features, n_rows)
+        number = 20 if n_rows == 1 else 3
+        yield (
+            f"predict[{n_rows} rows]",
+            lambda batch=batch: predict(batch, model_path),
+            number,
+            5,
+        )
+
+    # The app reads its configuration at import time
+    os.environ.update(
+        {"MODEL_PATH": model_path, "LOG_FILE": "", "LOG_SAMPLE_RATE": "0"}
+    )
+    import src.app as app_module
+
+    client = app_module.app.test_client()
+    payload = {
+        name: float(value)
+        for name, value in features.iloc[0].items()
+        if name in FEATURE_NAMES
+    }
+
+    def post(url, body):
+        response = client.post(url, json=body)
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    yield "flask /predict", lambda: post("/predict", payload), 20, 5
+    for n_rows in ROUTE_BATCH_SIZES:
+        records = [payload] * n_rows
+        yield (
+            f"flask /predict/batch[{n_rows} rows]",
+            lambda records=records: post("/predict/batch", records),
+            10 if n_rows <= 100 else 2,
+            5,
+        )
+
+
+def run_suite(data_path="data/data.csv", quick=False, pattern=None):
+    """Runs every case (or those whose name contains pattern) and returns the results dict."""
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, func, number, repeat in build_cases(workdir, data_path, quick):
+            if pattern and pattern not in name:
+                continue
+            func()  # warm-up (imports, page cache, pipeline cache)
+            seconds = time_call(func, repeat=repeat, number=number)
+            results[name] = {"seconds": seconds}
+            print(f"{name:<40} {seconds * 1e3:>12.3f} ms", flush=True)
+        invalidate_pipeline_cache()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Prints the change of every shared case and returns the names that regressed."""
+    regressions = []
+    print(f"\n{'case':<40} {'baseline ms':>12} {'current ms':>12} {'change':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["seconds"], result["seconds"]
+        change = after / before - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        print(
+            f"{name:<40} {before * 1e3:>12.3f} {after * 1e3:>12.3f} "
+            f"{change:>+7.1%}{flag}"
+        )
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-path", default="data/data.csv")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown per case before failing (0.2 = 20%%).",
+    )
+    parser.add_argument("--filter", help="Only run cases whose name contains this.")
+    parser.add_argument(
+        "--quick", action="store_true", help="Skip the largest dataset sizes."
+    )
+    args = parser.parse_args()
+
+    results = run_suite(args.data_path, quick=args.quick, pattern=args.filter)
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(
+                f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}."
+            )
+            sys.exit(1)
+        print(f"\nNo case regressed by more than {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
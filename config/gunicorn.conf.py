@@ -0,0 +1,23 @@
+# Gunicorn settings for the Flask API (src.app:app)
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+
+# Load the app (and the model) once in the master before forking the workers.
+# Workers then share the model's memory pages copy-on-write; with a compiled,
+# memory-mapped model directory (MODEL_PATH=models/model_arrays) the forest
+# arrays stay shared for the lifetime of the workers.
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+
+def post_fork(server, worker):
+    # Several processes rotating one log file lose lines. Children of a
+    # preloaded app get a file of their own from configure_logging; without
+    # preload, every worker configures logging when it loads the app, so point
+    # it at its own file here
+    log_file = os.getenv("LOG_FILE", "api_logs.log")
+    if log_file and not preload_app:
+        from src.serving.logging_config import worker_log_file
+
+        os.environ["LOG_FILE"] = worker_log_file(log_file, worker.pid)
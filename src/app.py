@@ -1,53 +1,262 @@
-from flask import Flask, request, jsonify
-import joblib
-import pandas as pd
+from flask import Flask, Response, g, request, jsonify
+import numpy as np
+import hmac
 import logging
-import sys
+import os
+import time
 from pydantic import ValidationError
-from src.schemas import PredictRequest
-
-
-# Configure logging
-log_file_path = "api_logs.log"
-logging.basicConfig(
-    level=logging.INFO,
-    format="*** FLASK API LOG: %(asctime)s - %(levelname)s - %(message)s ***",
-    handlers=[
-        logging.FileHandler(log_file_path),
-        logging.StreamHandler(
-            sys.stdout
-        ),  # Explicitly use sys.stdout for terminal output
-    ],
+from src.model.model_inference import as_model_input, predict_with_proba
+from src.serving import metrics
+from src.serving.experiments import (
+    PRIMARY,
+    Experiments,
+    parse_models,
+    parse_weighted_models,
+)
+from src.serving.logging_config import REQUEST_LOGGER, configure_logging
+from src.serving.model_state import ModelHolder
+from src.serving.prediction_cache import PredictionCache
+
+
+# Configure logging: JSON records written by a background thread, with a
+# size-rotated api_logs.log and sampled per-request info lines
+log_listener = configure_logging(
+    log_file=os.getenv("LOG_FILE", "api_logs.log"),
+    max_bytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+    backup_count=int(os.getenv("LOG_BACKUP_COUNT", "5")),
+    sample_rate=float(os.getenv("LOG_SAMPLE_RATE", "0.1")),
 )
+request_log = logging.getLogger(REQUEST_LOGGER)
 
 app = Flask(__name__)
 
 # Path to the trained model
-MODEL_PATH = "models/model.joblib"
+MODEL_PATH = os.getenv("MODEL_PATH", "models/model.joblib")
+
+# Seconds between checks of the model file for changes (0 disables hot reload)
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "0"))
+
+# Optional model registry (see src/model/model_registry.py); when set, the
+# model is resolved from it instead of MODEL_PATH. MODEL_VERSION pins a version
+# id, "current" follows the registry's CURRENT pointer
+MODEL_REGISTRY = os.getenv("MODEL_REGISTRY")
+MODEL_VERSION = os.getenv("MODEL_VERSION", "current")
+
+# Shared secret required by the /admin endpoints (X-Admin-Token header); the
+# endpoints are disabled (404) unless it is set
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# Maximum number of records accepted by /predict/batch in a single request
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "10000"))
+
+# Optional cache of /predict results for repeated feature vectors (0 disables it)
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "0"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "300"))
+prediction_cache = (
+    PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL)
+    if PREDICTION_CACHE_SIZE > 0
+    else None
+)
+
+# Optional plausible-range check of request features: rows outside the
+# training min/max widened by this multiple of the range are rejected with 422
+# (bounds come from the model's feature profile; unset disables the check)
+VALIDATION_RANGE_MARGIN = os.getenv("VALIDATION_RANGE_MARGIN")
+RANGE_MARGIN = float(VALIDATION_RANGE_MARGIN) if VALIDATION_RANGE_MARGIN else None
+
+# Holds the active model; request handlers take one snapshot of it per request
+model_holder = ModelHolder(
+    MODEL_PATH,
+    registry_dir=MODEL_REGISTRY,
+    version=MODEL_VERSION,
+    range_margin=RANGE_MARGIN,
+)
 
 try:
-    model = joblib.load(MODEL_PATH)
+    model_holder.load()
     logging.info("Model loaded successfully.")
-except FileNotFoundError:
-    logging.error(f"Model file not found at {MODEL_PATH}. Train the model first.")
-    model = None
+except FileNotFoundError as e:
+    logging.error(f"Model not found: {e}")
 except Exception as e:
     logging.error(f"Error loading model: {e}")
-    model = None
+
+if MODEL_WATCH_INTERVAL > 0:
+    model_holder.start_watcher(MODEL_WATCH_INTERVAL)
+
+# Optional model experiments on /predict traffic. Models are file paths, or
+# version ids when MODEL_REGISTRY is set. CANARY_MODELS ("model=weight,...")
+# serve that share of requests; SHADOW_MODELS ("model,...") score every request
+# in a background thread pool and are only compared with the served result
+CANARY_MODELS = parse_weighted_models(os.getenv("CANARY_MODELS", ""))
+SHADOW_MODELS = parse_models(os.getenv("SHADOW_MODELS", ""))
+
+
+def load_experiment_holder(spec):
+    """A loaded (and, with MODEL_WATCH_INTERVAL, watched) holder for an experiment model."""
+    holder = ModelHolder(
+        spec, registry_dir=MODEL_REGISTRY, version=spec, range_margin=RANGE_MARGIN
+    )
+    try:
+        holder.load()
+    except Exception as e:
+        logging.error(f"Error loading experiment model {spec}: {e}")
+    if MODEL_WATCH_INTERVAL > 0:
+        holder.start_watcher(MODEL_WATCH_INTERVAL)
+    return holder
+
+
+experiments = Experiments(
+    canaries=[
+        (spec, load_experiment_holder(spec), weight) for spec, weight in CANARY_MODELS
+    ],
+    shadows=[(spec, load_experiment_holder(spec)) for spec in SHADOW_MODELS],
+    workers=int(os.getenv("SHADOW_WORKERS", "2")),
+    max_pending=int(os.getenv("SHADOW_MAX_PENDING", "100")),
+    max_records=int(os.getenv("EXPERIMENT_STATS_SIZE", "10000")),
+)
+
+
+def endpoint_label():
+    """Route pattern of the current request, used as a low-cardinality metrics label."""
+    return request.url_rule.rule if request.url_rule else "unmatched"
+
+
+@app.before_request
+def start_request_metrics():
+    g.request_start = time.perf_counter()
+    metrics.IN_FLIGHT.inc(endpoint=endpoint_label())
+
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = endpoint_label()
+    metrics.REQUESTS_TOTAL.inc(
+        endpoint=endpoint, method=request.method, status=response.status_code
+    )
+    metrics.REQUEST_DURATION.observe(
+        time.perf_counter() - g.request_start, endpoint=endpoint
+    )
+    return response
+
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    if "request_start" in g:
+        metrics.IN_FLIGHT.dec(endpoint=endpoint_label())
 
 
 # Endpoints
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    """Request counts, stage latencies and model loads in the Prometheus text format."""
+    return Response(metrics.REGISTRY.render(), mimetype=metrics.CONTENT_TYPE)
+
+
 @app.route("/", methods=["GET"])
 def health_check():
     """Health check endpoint."""
-    logging.info("Health check requested.")
-    return jsonify({"status": "healthy", "model_loaded": model is not None}), 200
+    request_log.info("Health check requested.")
+    loaded = model_holder.current
+    return jsonify(
+        {
+            "status": "healthy",
+            "model_loaded": loaded is not None,
+            "model_version": loaded.version if loaded else None,
+            "model_loaded_at": loaded.loaded_at if loaded else None,
+            "last_reload_error": model_holder.last_error,
+            "prediction_cache": prediction_cache.stats() if prediction_cache else None,
+        }
+    ), 200
+
+
+@app.route("/ready", methods=["GET"])
+def readiness_check():
+    """Readiness endpoint: 200 only once a model is loaded and warmed up.
+
+    Models are warmed up with synthetic requests before they are activated, so
+    a worker that reports ready serves its first real request at full speed.
+    Unlike the liveness route `/`, this returns 503 while there is no model.
+    """
+    loaded = model_holder.current
+    if loaded is None:
+        return jsonify({"status": "not ready", "reason": "model not loaded"}), 503
+    return jsonify({"status": "ready", "model_version": loaded.version}), 200
+
+
+@app.route("/drift", methods=["GET"])
+def drift_report():
+    """Live feature distribution of the served model's requests vs. its training profile.
+
+    Summaries start empty whenever a new model version is loaded and are kept
+    per worker process. "drift" is null for models saved without a profile.
+    """
+    loaded = model_holder.current
+    if loaded is None:
+        return jsonify({"error": "Model not loaded."}), 503
+    return jsonify(
+        {
+            "model_version": loaded.version,
+            "drift": loaded.drift.report() if loaded.drift is not None else None,
+        }
+    ), 200
+
+
+@app.route("/model/card", methods=["GET"])
+def model_card():
+    """Evaluation results of the served model, precomputed at training time.
+
+    "card" is null for models trained without --model-card. The curves are
+    in the .card.npz file next to the model (see src/model/model_card.py).
+    """
+    loaded = model_holder.current
+    if loaded is None:
+        return jsonify({"error": "Model not loaded."}), 503
+    return jsonify({"model_version": loaded.version, "card": loaded.card}), 200
+
+
+def admin_denied():
+    """The error response for an /admin request that may not proceed, or None.
+
+    Admin endpoints fail closed: without ADMIN_TOKEN they are disabled.
+    """
+    if not ADMIN_TOKEN:
+        return jsonify({"error": "Admin endpoints are disabled."}), 404
+    token = request.headers.get("X-Admin-Token", "")
+    if not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        return jsonify({"error": "Unauthorized."}), 401
+    return None
+
+
+@app.route("/admin/reload", methods=["POST"])
+def reload_model():
+    """Reloads the model file in the background and swaps it in once it passes a smoke test.
+
+    Only the worker serving this request reloads; with several gunicorn workers
+    use MODEL_WATCH_INTERVAL so every worker picks up the new file.
+    """
+    denied = admin_denied()
+    if denied:
+        return denied
+    if not model_holder.reload_in_background():
+        return jsonify({"status": "reload already in progress"}), 409
+    logging.info("Model reload started.")
+    return jsonify({"status": "reload started"}), 202
+
+
+@app.route("/admin/experiments", methods=["GET"])
+def experiment_stats():
+    """Traffic split, shadows and per-model latency and disagreement statistics."""
+    denied = admin_denied()
+    if denied:
+        return denied
+    return jsonify(experiments.summary()), 200
 
 
 @app.route("/predict", methods=["POST"])
 def predict():
-    logging.info("Prediction endpoint hit.")
-    if model is None:
+    request_log.info("Prediction endpoint hit.")
+    primary = model_holder.current
+    if primary is None:
         logging.error("Prediction requested but model is not loaded.")
         return jsonify(
             {
@@ -57,48 +266,194 @@ def predict():
 
     # Parse JSON
     try:
-        data = request.get_json(force=True)
+        with metrics.STAGE_DURATION.time(endpoint="/predict", stage="parse"):
+            data = request.get_json(force=True)
     except Exception:
         logging.warning("Invalid JSON body.")
         return jsonify({"error": "Invalid JSON body."}), 400
 
-    # Validation using Pydantic
+    # Canaries serve their share of the traffic; everything else uses the primary
+    served, loaded = PRIMARY, primary
+    if experiments.canaries:
+        served, loaded = experiments.choose(primary)
+    headers = {"X-Model-Version": loaded.version}
+
+    # Validation straight into a float64 row in the model's feature order
+    # (falls back to the Pydantic schema for anything but well-formed input),
+    # so this stage also covers feature alignment; then the numeric checks
+    # the schema does not do (inf, plausible ranges)
     try:
-        payload = PredictRequest.model_validate(data)
+        with metrics.STAGE_DURATION.time(endpoint="/predict", stage="validate"):
+            row = loaded.decoder.decode(data)
+            row_errors = loaded.validator.validate(row).row_errors()
     except ValidationError as e:
         logging.warning(f"Validation error: {e}")
         return jsonify({"error": "Invalid input", "details": e.errors()}), 422
+    if row_errors:
+        logging.warning(f"Validation error: {row_errors[0]}")
+        return jsonify({"error": "Invalid input", "details": row_errors[0]}), 422
 
-    # Build DataFrame using aliases to match training feature names
-    input_df = pd.DataFrame([payload.model_dump(by_alias=True)])
-
-    # Feature alignment
-    if hasattr(model, "feature_names_in_"):
-        expected_features = list(model.feature_names_in_)  # scikit-learn feature names
-        missing_features = set(expected_features) - set(input_df.columns)
-        for feature in missing_features:
-            input_df[feature] = 0
-        input_df = input_df[expected_features]
-    else:
-        logging.warning(
-            "model.feature_names_in_ not found. Relying on input JSON for feature order."
-        )
+    if loaded.drift is not None:
+        loaded.drift.update(row)
+
+    # Identical feature vectors scored by the same model skip pandas and the
+    # forest (only for the primary, so canary traffic does not flush the cache)
+    use_cache = prediction_cache is not None and served == PRIMARY
+    if use_cache:
+        cached = prediction_cache.get(loaded.version, row)
+        if cached is not None:
+            request_log.info("Prediction served from cache.", extra={"result": cached})
+            return jsonify(cached), 200, headers
+
+    with metrics.STAGE_DURATION.time(endpoint="/predict", stage="dataframe"):
+        input_df = as_model_input(loaded.pipeline, row, loaded.feature_names)
 
     # Inference
     try:
-        prediction = model.predict(input_df)
-        prediction_proba = model.predict_proba(input_df)
+        start = time.perf_counter()
+        with metrics.STAGE_DURATION.time(endpoint="/predict", stage="inference"):
+            prediction, prediction_proba = predict_with_proba(loaded.pipeline, input_df)
     except Exception as e:
         logging.error(f"Error during prediction: {e}", exc_info=True)
         return jsonify({"error": f"An internal error occurred: {e}"}), 500
 
+    if experiments.enabled:
+        experiments.stats.record_latency(served, time.perf_counter() - start)
+        experiments.compare_in_background(
+            served, data, prediction, prediction_proba, primary
+        )
+
     result = {
         "prediction": int(prediction[0]),
         "probability_benign": float(prediction_proba[0][0]),  # Class 0 is benign
         "probability_malignant": float(prediction_proba[0][1]),  # Class 1 is malignant
     }
-    logging.info(f"Prediction successful: {result}")
-    return jsonify(result), 200
+    if use_cache:
+        prediction_cache.put(loaded.version, row, result)
+    request_log.info("Prediction successful.", extra={"result": result})
+    return jsonify(result), 200, headers
+
+
+def parse_batch_records(data):
+    """Normalizes a batch payload into a list of records.
+
+    Accepts a JSON array of records, an object with a "records" array, or a
+    columnar object {"columns": {feature: [values, ...]}}. Returns None if the
+    payload has none of these shapes.
+    """
+    if isinstance(data, list):
+        return data
+    if not isinstance(data, dict):
+        return None
+    if isinstance(data.get("records"), list):
+        return data["records"]
+    columns = data.get("columns")
+    if isinstance(columns, dict) and all(isinstance(v, list) for v in columns.values()):
+        if len({len(values) for values in columns.values()}) > 1:
+            return None
+        names = list(columns.keys())
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+    return None
+
+
+@app.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    request_log.info("Batch prediction endpoint hit.")
+    loaded = model_holder.current
+    if loaded is None:
+        logging.error("Batch prediction requested but model is not loaded.")
+        return jsonify(
+            {
+                "error": "Model not loaded. Please ensure the model is trained and available."
+            }
+        ), 500
+
+    # Parse JSON
+    try:
+        with metrics.STAGE_DURATION.time(endpoint="/predict/batch", stage="parse"):
+            data = request.get_json(force=True)
+    except Exception:
+        logging.warning("Invalid JSON body.")
+        return jsonify({"error": "Invalid JSON body."}), 400
+
+    records = parse_batch_records(data)
+    if records is None:
+        logging.warning("Invalid batch payload shape.")
+        return jsonify(
+            {
+                "error": 'Batch payload must be an array of records, {"records": [...]} '
+                'or {"columns": {feature: [values]}} with equal-length columns.'
+            }
+        ), 400
+    if len(records) > MAX_BATCH_SIZE:
+        logging.warning(f"Batch of {len(records)} records exceeds {MAX_BATCH_SIZE}.")
+        return jsonify(
+            {
+                "error": f"Batch size {len(records)} exceeds the maximum of {MAX_BATCH_SIZE}."
+            }
+        ), 413
+
+    # Decoding into one matrix in the model's feature order (Pydantic only for
+    # records that are not plain numbers), then vectorized numeric checks of
+    # all rows at once; errors are reported per row
+    with metrics.STAGE_DURATION.time(endpoint="/predict/batch", stage="validate"):
+        matrix, row_errors = loaded.decoder.decode_many(records)
+        validation = loaded.validator.validate(matrix)
+        for index, errors in validation.row_errors().items():
+            row_errors.setdefault(index, errors)
+    valid = np.ones(len(records), dtype=bool)
+    valid[list(row_errors)] = False
+    valid_indices = np.flatnonzero(valid).tolist()
+
+    results = [None] * len(records)
+    for index, errors in row_errors.items():
+        results[index] = {"index": index, "error": "Invalid input", "details": errors}
+
+    if valid_indices:
+        matrix = matrix[valid_indices]
+        if loaded.drift is not None:
+            loaded.drift.update(matrix)
+        with metrics.STAGE_DURATION.time(endpoint="/predict/batch", stage="dataframe"):
+            input_df = as_model_input(loaded.pipeline, matrix, loaded.feature_names)
+
+        # Inference: a single predict_proba call for every valid row
+        try:
+            with metrics.STAGE_DURATION.time(
+                endpoint="/predict/batch", stage="inference"
+            ):
+                predictions, prediction_proba = predict_with_proba(
+                    loaded.pipeline, input_df
+                )
+        except Exception as e:
+            logging.error(f"Error during batch prediction: {e}", exc_info=True)
+            return jsonify({"error": f"An internal error occurred: {e}"}), 500
+
+        for row, index in enumerate(valid_indices):
+            results[index] = {
+                "index": index,
+                "prediction": int(predictions[row]),
+                "probability_benign": float(prediction_proba[row][0]),
+                "probability_malignant": float(prediction_proba[row][1]),
+            }
+
+    request_log.info(
+        "Batch prediction finished.",
+        extra={"n_scored": len(valid_indices), "n_errors": len(row_errors)},
+    )
+    return jsonify(
+        {
+            "results": results,
+            "n_scored": len(valid_indices),
+            "n_errors": len(row_errors),
+        }
+    ), 200
+
+
+# Warm up the Flask/Werkzeug request path with one internal request (the model
+# itself was warmed up when it was loaded), so in a preloaded gunicorn app
+# every worker starts warm
+if model_holder.current is not None:
+    app.test_client().get("/ready")
 
 
 if __name__ == "__main__":
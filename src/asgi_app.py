@@ -0,0 +1,186 @@
+"""Asynchronous (ASGI) entry point for the prediction API.
+
+Serves the same model, schema and responses as the Flask app in src/app.py, but
+concurrent /predict requests are grouped by a MicroBatcher and scored with one
+vectorized predict_proba call per group. Run it with an ASGI server, e.g.:
+
+    uvicorn src.asgi_app:app --host 0.0.0.0 --port 5000
+"""
+
+import json
+import logging
+import os
+
+from pydantic import ValidationError
+
+from src.serving.micro_batching import MicroBatcher
+from src.serving.model_state import ModelHolder
+
+# Path to the trained model
+MODEL_PATH = os.getenv("MODEL_PATH", "models/model.joblib")
+# Optional model registry and version to serve from it (as in src/app.py)
+MODEL_REGISTRY = os.getenv("MODEL_REGISTRY")
+MODEL_VERSION = os.getenv("MODEL_VERSION", "current")
+# Optional plausible-range check of request features (as in src/app.py)
+VALIDATION_RANGE_MARGIN = os.getenv("VALIDATION_RANGE_MARGIN")
+
+# Collect requests for at most this long, or until this many rows are queued
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "2"))
+MICRO_BATCH_MAX_SIZE = int(os.getenv("MICRO_BATCH_MAX_SIZE", "64"))
+
+model_holder = ModelHolder(
+    MODEL_PATH,
+    registry_dir=MODEL_REGISTRY,
+    version=MODEL_VERSION,
+    range_margin=float(VALIDATION_RANGE_MARGIN) if VALIDATION_RANGE_MARGIN else None,
+)
+batcher = MicroBatcher(MICRO_BATCH_MAX_SIZE, MICRO_BATCH_MAX_WAIT_MS)
+
+
+async def send_json(send, body, status):
+    payload = json.dumps(body, default=str).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": payload})
+
+
+async def read_body(receive):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+async def health_check(send):
+    loaded = model_holder.current
+    await send_json(
+        send,
+        {
+            "status": "healthy",
+            "model_loaded": loaded is not None,
+            "model_version": loaded.version if loaded else None,
+            "model_loaded_at": loaded.loaded_at if loaded else None,
+        },
+        200,
+    )
+
+
+async def drift_report(send):
+    loaded = model_holder.current
+    if loaded is None:
+        await send_json(send, {"error": "Model not loaded."}, 503)
+        return
+    await send_json(
+        send,
+        {
+            "model_version": loaded.version,
+            "drift": loaded.drift.report() if loaded.drift is not None else None,
+        },
+        200,
+    )
+
+
+async def model_card(send):
+    loaded = model_holder.current
+    if loaded is None:
+        await send_json(send, {"error": "Model not loaded."}, 503)
+        return
+    await send_json(send, {"model_version": loaded.version, "card": loaded.card}, 200)
+
+
+async def predict(receive, send):
+    loaded = model_holder.current
+    if loaded is None:
+        await send_json(
+            send,
+            {
+                "error": "Model not loaded. Please ensure the model is trained and available."
+            },
+            500,
+        )
+        return
+
+    # Parse JSON
+    try:
+        data = json.loads(await read_body(receive))
+    except ValueError:
+        await send_json(send, {"error": "Invalid JSON body."}, 400)
+        return
+
+    # Validation straight into a float64 row (same semantics as the Flask app)
+    try:
+        row = loaded.decoder.decode(data)
+    except ValidationError as e:
+        await send_json(send, {"error": "Invalid input", "details": e.errors()}, 422)
+        return
+    row_errors = loaded.validator.validate(row).row_errors()
+    if row_errors:
+        await send_json(send, {"error": "Invalid input", "details": row_errors[0]}, 422)
+        return
+
+    if loaded.drift is not None:
+        loaded.drift.update(row)
+
+    # Inference, batched with concurrent requests
+    try:
+        prediction, proba = await batcher.predict(loaded, row)
+    except Exception as e:
+        logging.error(f"Error during prediction: {e}", exc_info=True)
+        await send_json(send, {"error": f"An internal error occurred: {e}"}, 500)
+        return
+
+    await send_json(
+        send,
+        {
+            "prediction": int(prediction),
+            "probability_benign": float(proba[0]),  # Class 0 is benign
+            "probability_malignant": float(proba[1]),  # Class 1 is malignant
+        },
+        200,
+    )
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                model_holder.load()
+                logging.info("Model loaded successfully.")
+            except Exception as e:
+                logging.error(f"Error loading model: {e}")
+            batcher.start()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await batcher.stop()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI application."""
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+
+    route = (scope["method"], scope["path"])
+    if route == ("GET", "/"):
+        await health_check(send)
+    elif route == ("POST", "/predict"):
+        await predict(receive, send)
+    elif route == ("GET", "/drift"):
+        await drift_report(send)
+    elif route == ("GET", "/model/card"):
+        await model_card(send)
+    else:
+        await send_json(send, {"error": "Not found."}, 404)
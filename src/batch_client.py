@@ -0,0 +1,153 @@
+"""Client side of bulk scoring through the API's /predict/batch endpoint.
+
+score_dataframe sends a DataFrame of patients in chunks of columnar payloads
+over one pooled requests.Session. A few chunks are in flight at a time,
+and progress is reported after each one. Used by the Streamlit upload mode,
+but it has no Streamlit dependency.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Rows per request; well below the API's MAX_BATCH_SIZE (default 10000)
+DEFAULT_CHUNK_ROWS = 1000
+
+# Input columns copied to the output to identify each row (when present)
+ID_COLUMNS = ["id"]
+
+
+def batch_url(predict_url):
+    """The /predict/batch URL next to a /predict URL."""
+    return predict_url.rstrip("/") + "/batch"
+
+
+def make_session(pool_size):
+    """A Session that keeps up to pool_size connections open and retries transient failures.
+
+    Scoring is idempotent, so POSTs are retried on 502/503/504 too.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=None,  # every method, POST included
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def columnar_payload(chunk, feature_names):
+    """{"columns": {...}} for the feature columns of a chunk; missing values become null.
+
+    Absent feature columns are left out, so the API reports them per row.
+    """
+    columns = {}
+    for name in feature_names:
+        if name in chunk.columns:
+            column = chunk[name].astype(object)
+            columns[name] = column.where(column.notna(), None).tolist()
+    return {"columns": columns}
+
+
+def error_message(result):
+    """One line per invalid row: "<feature>: <message>" for each error detail."""
+    details = result.get("details") or []
+    if not details:
+        return result.get("error", "Invalid input")
+    return "; ".join(
+        f"{'.'.join(map(str, detail['loc']))}: {detail['msg']}" for detail in details
+    )
+
+
+def score_dataframe(
+    df,
+    url,
+    feature_names,
+    chunk_rows=DEFAULT_CHUNK_ROWS,
+    workers=4,
+    session=None,
+    timeout=60,
+    on_progress=None,
+):
+    """Scores every row of df with the API at url (a /predict/batch endpoint).
+
+    Up to workers chunks of chunk_rows rows are in flight at a time. Returns a
+    DataFrame with the id column (if any), the prediction, both probabilities
+    and an "error" message for rows the API rejected. A failed chunk (HTTP
+    error) sets the error of all its rows; connection errors are raised.
+    on_progress(rows_done, total_rows) is called in the caller's thread after
+    every chunk.
+    """
+    n_rows = len(df)
+    predictions = np.full(n_rows, np.nan)
+    probabilities = np.full((n_rows, 2), np.nan)
+    errors = np.full(n_rows, "", dtype=object)
+    session = session or make_session(workers)
+    rows_done = 0
+
+    def post(payload):
+        response = session.post(url, json=payload, timeout=timeout)
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        return response.status_code, body
+
+    def collect(future, start, size):
+        nonlocal rows_done
+        status, body = future.result()
+        if status != 200:
+            message = body.get("error", "Unknown error")
+            errors[start : start + size] = f"API error {status}: {message}"
+        else:
+            for result in body["results"]:
+                row = start + result["index"]
+                if "error" in result:
+                    errors[row] = error_message(result)
+                else:
+                    predictions[row] = result["prediction"]
+                    probabilities[row] = (
+                        result["probability_benign"],
+                        result["probability_malignant"],
+                    )
+        rows_done += size
+        if on_progress is not None:
+            on_progress(rows_done, n_rows)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        try:
+            for start in range(0, n_rows, chunk_rows):
+                chunk = df.iloc[start : start + chunk_rows]
+                future = executor.submit(post, columnar_payload(chunk, feature_names))
+                pending[future] = (start, len(chunk))
+                if len(pending) >= workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for finished in done:
+                        collect(finished, *pending.pop(finished))
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for finished in done:
+                    collect(finished, *pending.pop(finished))
+        finally:
+            for future in pending:
+                future.cancel()
+
+    output = df[[column for column in ID_COLUMNS if column in df.columns]].copy()
+    output = output.reset_index(drop=True)
+    output["prediction"] = pd.array(
+        np.where(np.isnan(predictions), None, predictions), dtype="Int64"
+    )
+    output["probability_benign"] = probabilities[:, 0]
+    output["probability_malignant"] = probabilities[:, 1]
+    output["error"] = errors
+    return output
@@ -0,0 +1,329 @@
+"""Offline bulk scoring of large CSV or Parquet files on all cores.
+
+The input is read in chunks and scored by a pool of worker processes that each
+load the pipeline once. Predictions are appended to a CSV in input order, and a
+checkpoint is written after every chunk so an interrupted run can resume.
+
+Usage: python -m src.model.batch_scoring --input history.csv --output predictions.csv
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.validation import MatrixValidator, plausible_ranges
+
+from .data_ingestion import DEFAULT_CHUNKSIZE, feature_dtypes, iter_raw_data
+from .feature_profile import load_feature_profile
+from .model_inference import artifact_signature, get_pipeline, predict_with_proba
+
+# Input columns copied to the output to identify each row (when present)
+ID_COLUMNS = ["id"]
+
+# Pipeline loaded once per worker process by init_worker
+_worker_pipeline = None
+
+
+def init_worker(model_path):
+    """Pool initializer: loads the pipeline once per worker process."""
+    global _worker_pipeline
+    _worker_pipeline = get_pipeline(model_path)
+
+
+def score_features(features):
+    """Scores a float64 feature matrix (columns in feature_names_in_ order) in a worker.
+
+    Returns (predictions, probabilities).
+    """
+    pipeline = _worker_pipeline
+    input_df = pd.DataFrame(features, columns=pipeline.feature_names_in_)
+    return predict_with_proba(pipeline, input_df)
+
+
+def iter_input_chunks(input_path, chunksize=DEFAULT_CHUNKSIZE, skip_rows=0, typed=True):
+    """Yields the input file (CSV or .parquet) as DataFrames of at most chunksize rows.
+
+    With typed=False, CSV features are not parsed as floats up front, so
+    non-numeric cells reach the validator instead of failing the read.
+    """
+    if not str(input_path).endswith(".parquet"):
+        yield from iter_raw_data(
+            input_path,
+            chunksize,
+            dtype=feature_dtypes() if typed else None,
+            skip_rows=skip_rows,
+        )
+        return
+
+    for batch in pq.ParquetFile(input_path).iter_batches(batch_size=chunksize):
+        if skip_rows >= batch.num_rows:
+            skip_rows -= batch.num_rows
+            continue
+        yield batch.slice(skip_rows).to_pandas()
+        skip_rows = 0
+
+
+def count_input_rows(input_path):
+    """Number of rows in a Parquet input (from its metadata), None for CSV."""
+    if str(input_path).endswith(".parquet"):
+        return pq.ParquetFile(input_path).metadata.num_rows
+    return None
+
+
+def features_of(chunk, feature_names):
+    """The chunk's features as a float64 matrix in feature_names order (missing ones are 0)."""
+    return chunk.reindex(columns=feature_names, fill_value=0).to_numpy(dtype=np.float64)
+
+
+def validate_features(chunk, validator):
+    """Validates a chunk; returns its feature matrix and an error message per row.
+
+    Invalid rows are zeroed in the matrix (they are scored, but their results
+    are discarded) and get "<feature>: <message>" errors; valid rows get "".
+    """
+    validation = validator.validate(chunk)
+    features = validation.values
+    features[validation.invalid] = 0
+    errors = np.full(len(chunk), "", dtype=object)
+    for index, details in validation.row_errors().items():
+        errors[index] = "; ".join(f"{e['loc'][0]}: {e['msg']}" for e in details)
+    return features, errors
+
+
+def build_output(chunk, predictions, probabilities, errors=None):
+    """Output rows for one chunk: its id columns plus prediction and probabilities.
+
+    With errors (from validate_features), an "error" column is added and
+    invalid rows have no prediction.
+    """
+    output = chunk[[column for column in ID_COLUMNS if column in chunk.columns]].copy()
+    output["prediction"] = predictions
+    output["probability_benign"] = probabilities[:, 0]  # Class 0 is benign
+    output["probability_malignant"] = probabilities[:, 1]  # Class 1 is malignant
+    if errors is not None:
+        invalid = errors != ""
+        output["prediction"] = output["prediction"].astype("Int64")
+        output.loc[invalid, "prediction"] = pd.NA
+        output.loc[invalid, ["probability_benign", "probability_malignant"]] = np.nan
+        output["error"] = errors
+    return output
+
+
+def checkpoint_path(output_path):
+    return f"{output_path}.checkpoint.json"
+
+
+def run_signature(input_path, model_path):
+    """Identifies the input and model files a checkpoint belongs to."""
+    stat = os.stat(input_path)
+    return {
+        "input_path": os.path.abspath(input_path),
+        "input_signature": [stat.st_mtime_ns, stat.st_size],
+        "model_path": os.path.abspath(model_path),
+        "model_signature": list(artifact_signature(model_path)),
+    }
+
+
+def load_checkpoint(output_path, signature):
+    """Returns the checkpoint of a previous run on the same input and model, or None.
+
+    Raises ValueError if the checkpoint belongs to a different input or model.
+    """
+    path = checkpoint_path(output_path)
+    if not os.path.exists(path) or not os.path.exists(output_path):
+        return None
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if {key: checkpoint.get(key) for key in signature} != signature:
+        raise ValueError(
+            f"Checkpoint {path} was written for a different input or model. "
+            "Remove it or pass --no-resume to start over."
+        )
+    return checkpoint
+
+
+def save_checkpoint(output_path, checkpoint):
+    """Writes the checkpoint atomically (temporary file + rename)."""
+    path = checkpoint_path(output_path)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def score_file(
+    input_path,
+    output_path,
+    model_path="models/model.joblib",
+    workers=None,
+    chunksize=DEFAULT_CHUNKSIZE,
+    resume=True,
+    progress=True,
+    validate=False,
+    range_margin=None,
+):
+    """Scores every row of input_path and writes the results to output_path (CSV).
+
+    Chunks are scored by `workers` processes (default: all cores; 1 scores in
+    this process) with at most two chunks per worker in flight, and written in
+    input order. After each chunk the output is flushed to disk and a
+    checkpoint records how many rows and bytes are done. With resume=True a
+    matching checkpoint makes the run continue where it stopped, discarding any
+    partially written chunk. With validate=True, every chunk is checked with
+    src/validation.py (plus the plausible ranges of the model's training
+    profile if range_margin is set), and invalid rows get an error message
+    instead of a prediction. Returns a summary dict.
+    """
+    workers = workers or os.cpu_count() or 1
+    # Validation changes the output columns, so it is part of the run's identity
+    signature = {
+        **run_signature(input_path, model_path),
+        "validate": validate,
+        "range_margin": range_margin,
+    }
+    checkpoint = load_checkpoint(output_path, signature) if resume else None
+    rows_done = checkpoint["rows_done"] if checkpoint else 0
+    output_bytes = checkpoint["output_bytes"] if checkpoint else 0
+    resumed_from = rows_done
+    if checkpoint:
+        print(f"Resuming {input_path} after {rows_done:,} scored rows.")
+
+    # Loaded here for the feature order; forked workers inherit the cached pipeline
+    feature_names = list(get_pipeline(model_path).feature_names_in_)
+    validator = None
+    if validate:
+        profile = load_feature_profile(model_path)
+        ranges = (
+            plausible_ranges(profile, range_margin)
+            if profile is not None and range_margin is not None
+            else None
+        )
+        validator = MatrixValidator(feature_names, ranges)
+    n_invalid = 0
+    total_rows = count_input_rows(input_path)
+    start = time.perf_counter()
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "r+b" if checkpoint else "wb") as output_file:
+        output_file.truncate(output_bytes)
+        output_file.seek(output_bytes)
+
+        def prepare(chunk):
+            """Feature matrix and (with validation) per-row errors of a chunk."""
+            nonlocal n_invalid
+            if validator is None:
+                return features_of(chunk, feature_names), None
+            features, errors = validate_features(chunk, validator)
+            n_invalid += int((errors != "").sum())
+            return features, errors
+
+        def write(chunk, errors, predictions, probabilities):
+            nonlocal rows_done
+            output = build_output(chunk, predictions, probabilities, errors)
+            output_file.write(
+                output.to_csv(index=False, header=rows_done == 0).encode()
+            )
+            output_file.flush()
+            os.fsync(output_file.fileno())
+            rows_done += len(output)
+            save_checkpoint(
+                output_path,
+                {
+                    **signature,
+                    "rows_done": rows_done,
+                    "output_bytes": output_file.tell(),
+                },
+            )
+            if progress:
+                elapsed = time.perf_counter() - start
+                share = f" ({rows_done / total_rows:.1%})" if total_rows else ""
+                rate = (rows_done - resumed_from) / elapsed if elapsed else 0.0
+                print(
+                    f"Scored {rows_done:,} rows{share}, {rate:,.0f} rows/s",
+                    file=sys.stderr,
+                    flush=True,
+                )
+
+        chunks = iter_input_chunks(
+            input_path, chunksize, skip_rows=rows_done, typed=not validate
+        )
+        if workers == 1:
+            init_worker(model_path)
+            for chunk in chunks:
+                features, errors = prepare(chunk)
+                write(chunk, errors, *score_features(features))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=init_worker, initargs=(model_path,)
+            ) as executor:
+                pending: deque = deque()
+                for chunk in chunks:
+                    features, errors = prepare(chunk)
+                    future = executor.submit(score_features, features)
+                    pending.append((chunk, errors, future))
+                    if len(pending) >= 2 * workers:
+                        chunk, errors, future = pending.popleft()
+                        write(chunk, errors, *future.result())
+                while pending:
+                    chunk, errors, future = pending.popleft()
+                    write(chunk, errors, *future.result())
+
+    os.remove(checkpoint_path(output_path))
+    elapsed = time.perf_counter() - start
+    print(f"Scored {rows_done:,} rows into {output_path} in {elapsed:.1f}s.")
+    return {
+        "rows": rows_done,
+        "resumed_from": resumed_from,
+        "seconds": elapsed,
+        "workers": workers,
+        "invalid_rows": n_invalid,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a CSV or Parquet file in bulk.")
+    parser.add_argument("--input", required=True, help="CSV or .parquet file to score.")
+    parser.add_argument("--output", required=True, help="CSV file to write.")
+    parser.add_argument("--model-path", default="models/model.joblib")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: all cores).",
+    )
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Ignore an existing checkpoint and start over.",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Check rows (NaN/inf, negatives) and report errors instead of scoring them.",
+    )
+    parser.add_argument(
+        "--range-margin",
+        type=float,
+        help="With --validate, also reject values outside the training range "
+        "widened by this multiple of it.",
+    )
+    args = parser.parse_args()
+
+    score_file(
+        input_path=args.input,
+        output_path=args.output,
+        model_path=args.model_path,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        resume=not args.no_resume,
+        validate=args.validate,
+        range_margin=args.range_margin,
+    )
@@ -0,0 +1,181 @@
+"""Lean NumPy inference engine for the trained breast cancer pipeline.
+
+export_compiled_model() flattens the fitted MinMaxScaler constants and every
+tree of the RandomForestClassifier into a handful of contiguous arrays, and
+CompiledForest evaluates them with vectorized traversal. The probabilities are
+bit-identical to pipeline.predict_proba, but serving needs neither pandas nor
+scikit-learn: this module only imports NumPy.
+
+Two layouts are supported: a single .npz file, or a directory with one .npy
+file per array. The directory layout is memory-mapped read-only on load, so
+gunicorn workers (and processes preloaded in the master) share one copy of
+the forest through the page cache instead of each holding a private copy.
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+COMPILED_FORMAT_VERSION = 1
+
+
+def export_compiled_model(pipeline, output_path):
+    """Writes the scaler and forest of a trained pipeline to output_path.
+
+    Paths ending in .npz produce a single uncompressed archive; any other path
+    is created as a directory of .npy files that can be memory-mapped.
+    """
+    scaler = pipeline.named_steps["preprocessor"].named_steps["scaler"]
+    forest = pipeline.named_steps["classifier"]
+    n_classes = len(forest.classes_)
+
+    trees = [estimator.tree_ for estimator in forest.estimators_]
+    node_counts = np.array([tree.node_count for tree in trees])
+    roots = np.concatenate([[0], np.cumsum(node_counts)[:-1]])
+
+    features, thresholds, lefts, rights, missing_left, values = [], [], [], [], [], []
+    for root, tree in zip(roots, trees):
+        nodes = np.arange(tree.node_count) + root
+        is_leaf = tree.children_left == -1
+        # Leaves point at themselves so traversal can run a fixed number of steps
+        lefts.append(np.where(is_leaf, nodes, tree.children_left + root))
+        rights.append(np.where(is_leaf, nodes, tree.children_right + root))
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(tree.threshold)
+        missing_left.append(tree.missing_go_to_left.astype(bool))
+
+        # Same normalization as DecisionTreeClassifier.predict_proba
+        proba = tree.value[:, 0, :n_classes].copy()
+        normalizer = proba.sum(axis=1)[:, np.newaxis]
+        normalizer[normalizer == 0.0] = 1.0
+        proba /= normalizer
+        values.append(proba)
+
+    arrays = dict(
+        format_version=np.array(COMPILED_FORMAT_VERSION),
+        feature_names=np.array(scaler.feature_names_in_, dtype=str),
+        classes=np.asarray(forest.classes_),
+        scale=np.ascontiguousarray(scaler.scale_, dtype=np.float64),
+        min=np.ascontiguousarray(scaler.min_, dtype=np.float64),
+        clip=np.array(scaler.clip),
+        feature_range=np.array(scaler.feature_range, dtype=np.float64),
+        roots=roots.astype(np.intp),
+        max_depth=np.array(max(tree.max_depth for tree in trees)),
+        feature=np.concatenate(features).astype(np.intp),
+        threshold=np.concatenate(thresholds).astype(np.float64),
+        left=np.concatenate(lefts).astype(np.intp),
+        right=np.concatenate(rights).astype(np.intp),
+        missing_go_to_left=np.concatenate(missing_left),
+        value=np.concatenate(values).astype(np.float64),
+    )
+    if str(output_path).endswith(".npz"):
+        np.savez(output_path, **arrays)
+    else:
+        os.makedirs(output_path, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(output_path, f"{name}.npy"), array)
+
+
+class CompiledForest:
+    """Scaler + random forest evaluated with plain NumPy array operations.
+
+    Exposes the subset of the pipeline API the serving code uses:
+    feature_names_in_, classes_, predict_proba() and predict().
+    """
+
+    def __init__(self, arrays):
+        version = int(arrays["format_version"])
+        if version != COMPILED_FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model format version {version}.")
+        self.feature_names_in_ = arrays["feature_names"]
+        self.classes_ = arrays["classes"]
+        self.scale_ = arrays["scale"]
+        self.min_ = arrays["min"]
+        self.clip = bool(arrays["clip"])
+        self.feature_range = tuple(arrays["feature_range"])
+        self.roots = arrays["roots"]
+        self.max_depth = int(arrays["max_depth"])
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.missing_go_to_left = arrays["missing_go_to_left"]
+        self.value = arrays["value"]
+
+    def _as_matrix(self, X):
+        """Returns X as a float64 matrix in feature_names_in_ order."""
+        if hasattr(X, "columns"):  # DataFrame: select by name, extra columns ignored
+            X = X[list(self.feature_names_in_)].to_numpy(dtype=np.float64)
+        return np.asarray(X, dtype=np.float64).reshape(-1, len(self.feature_names_in_))
+
+    def _apply(self, X):
+        """Returns the leaf index reached in every tree, shape (n_trees, n_samples)."""
+        rows = np.arange(X.shape[0])
+        nodes = np.repeat(self.roots[:, np.newaxis], X.shape[0], axis=1)
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[nodes]]
+            # float32 vs float64 comparison, as in the Cython tree traversal
+            go_left = (x <= self.threshold[nodes]) | (
+                np.isnan(x) & self.missing_go_to_left[nodes]
+            )
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X):
+        """Class probabilities, bit-identical to the sklearn pipeline's predict_proba."""
+        # MinMaxScaler.transform, then the forest's float32 input conversion
+        X = self._as_matrix(X) * self.scale_ + self.min_
+        if self.clip:
+            np.clip(X, self.feature_range[0], self.feature_range[1], out=X)
+        X = X.astype(np.float32)
+
+        # Summing along the (non-contiguous) tree axis accumulates the trees in
+        # order, matching the forest's sequential accumulation
+        proba = self.value[self._apply(X)].sum(axis=0)
+        proba /= len(self.roots)
+        return proba
+
+    def predict(self, X):
+        """Class labels, equal to the sklearn pipeline's predict."""
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+
+def load_compiled_model(path, mmap_mode="r"):
+    """Loads a model written by export_compiled_model.
+
+    Directory layouts are memory-mapped with mmap_mode (None reads them into
+    private memory); .npz archives are always read into memory.
+    """
+    if os.path.isdir(path):
+        arrays = {}
+        for filename in os.listdir(path):
+            if filename.endswith(".npy"):
+                array = np.load(
+                    os.path.join(path, filename),
+                    mmap_mode=mmap_mode,
+                    allow_pickle=False,
+                )
+                # Plain ndarray view on the mapping: no memmap subclass overhead
+                arrays[filename[: -len(".npy")]] = array.view(np.ndarray)
+        return CompiledForest(arrays)
+    with np.load(path, allow_pickle=False) as arrays:
+        return CompiledForest({name: arrays[name] for name in arrays.files})
+
+
+if __name__ == "__main__":
+    import joblib
+
+    parser = argparse.ArgumentParser(
+        description="Export a trained pipeline to the compiled NumPy format."
+    )
+    parser.add_argument("--model-path", default="models/model.joblib")
+    parser.add_argument(
+        "--output",
+        default="models/model.npz",
+        help="A .npz file, or a directory for the memory-mappable layout.",
+    )
+    args = parser.parse_args()
+
+    export_compiled_model(joblib.load(args.model_path), args.output)
+    print(f"Compiled model saved to {args.output}")
@@ -0,0 +1,150 @@
+"""Columnar cache of the preprocessed dataset.
+
+The first load of a CSV streams it through stream_preprocessed_data and writes
+the typed, preprocessed columns to an Arrow IPC file named after a content hash
+of the source. Later loads read that file straight into pandas columns and
+skip CSV parsing and preprocessing entirely; editing the CSV changes the hash
+and rebuilds the cache. The hash is kept in a sidecar with the CSV's size and
+mtime, so an unchanged CSV is not read at all.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+
+import pandas as pd
+import pyarrow as pa
+
+from .data_ingestion import DEFAULT_CHUNKSIZE, stream_preprocessed_data
+
+DEFAULT_CACHE_DIR = "data/.cache"
+
+
+def source_fingerprint(data_path):
+    """Returns a short sha256 of the source file contents."""
+    digest = hashlib.sha256()
+    with open(data_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def fingerprint_path(data_path, cache_dir=DEFAULT_CACHE_DIR):
+    stem = os.path.splitext(os.path.basename(data_path))[0]
+    return os.path.join(cache_dir, f"{stem}.fingerprint.json")
+
+
+def cached_fingerprint(data_path, cache_dir=DEFAULT_CACHE_DIR):
+    """source_fingerprint of data_path, only recomputed when its size or mtime changed.
+
+    The last fingerprint is saved in cache_dir together with the file's
+    absolute path, size and mtime_ns.
+    """
+    stat = os.stat(data_path)
+    key = {
+        "path": os.path.abspath(data_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+    path = fingerprint_path(data_path, cache_dir)
+    try:
+        with open(path) as f:
+            saved = json.load(f)
+        if {name: saved.get(name) for name in key} == key:
+            return saved["fingerprint"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    fingerprint = source_fingerprint(data_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump({**key, "fingerprint": fingerprint}, f)
+    os.replace(f"{path}.tmp", path)
+    return fingerprint
+
+
+def cache_path(data_path, cache_dir=DEFAULT_CACHE_DIR):
+    """Path of the cache file for the current contents of data_path."""
+    stem = os.path.splitext(os.path.basename(data_path))[0]
+    fingerprint = cached_fingerprint(data_path, cache_dir)
+    return os.path.join(cache_dir, f"{stem}-{fingerprint}.arrow")
+
+
+def warm_cache(
+    data_path="data/data.csv", cache_dir=DEFAULT_CACHE_DIR, chunksize=DEFAULT_CHUNKSIZE
+):
+    """Builds the cache for data_path if needed and returns its path (None for empty data).
+
+    The CSV is converted chunk by chunk, so memory stays bounded. Caches of
+    older versions of the same file are removed.
+    """
+    path = cache_path(data_path, cache_dir)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    writer = None
+    try:
+        for chunk in stream_preprocessed_data(data_path, chunksize):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pa.ipc.new_file(tmp_path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        return None
+
+    os.replace(tmp_path, path)
+    stem = os.path.basename(path).rsplit("-", 1)[0]
+    for name in os.listdir(cache_dir):
+        stale = os.path.join(cache_dir, name)
+        if stale != path and re.fullmatch(
+            rf"{re.escape(stem)}-[0-9a-f]{{16}}\.arrow", name
+        ):
+            os.remove(stale)
+    return path
+
+
+def load_preprocessed_data(data_path="data/data.csv", cache_dir=DEFAULT_CACHE_DIR):
+    """Returns the preprocessed dataset, from the Arrow cache when it is current.
+
+    The columns are copied into pandas (writable, independent of the file).
+    """
+    path = warm_cache(data_path, cache_dir)
+    if path is None:
+        return pd.DataFrame()
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+def clear_cache(cache_dir=DEFAULT_CACHE_DIR):
+    """Removes every cache file in cache_dir and returns how many were deleted.
+
+    Saved fingerprints are removed too but not counted.
+    """
+    for path in glob.glob(os.path.join(cache_dir, "*.fingerprint.json")):
+        os.remove(path)
+    paths = glob.glob(os.path.join(cache_dir, "*.arrow"))
+    for path in paths:
+        os.remove(path)
+    return len(paths)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the preprocessed data cache.")
+    parser.add_argument("action", choices=["warm", "clear"])
+    parser.add_argument("--data-path", default="data/data.csv")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args()
+
+    if args.action == "warm":
+        print(f"Cache ready at {warm_cache(args.data_path, args.cache_dir)}")
+    else:
+        removed = clear_cache(args.cache_dir)
+        print(f"Removed {removed} cache file(s) from {args.cache_dir}")
@@ -1,10 +1,56 @@
 import pandas as pd
 
+from .data_preprocessing import (
+    FEATURE_COLUMNS,
+    drop_unnecessary_columns,
+    map_diagnosis_to_numerical,
+)
 
-def load_raw_data(data_path="data/data.csv"):
-    """Loads the raw dataset from the specified path."""
+# Rows per chunk when streaming the dataset
+DEFAULT_CHUNKSIZE = 50_000
+
+
+def feature_dtypes(float_dtype="float64"):
+    """Explicit read_csv dtypes: float features and a categorical 'diagnosis'."""
+    dtypes = {column: float_dtype for column in FEATURE_COLUMNS}
+    dtypes["diagnosis"] = pd.CategoricalDtype(["B", "M"])
+    return dtypes
+
+
+def iter_raw_data(
+    data_path="data/data.csv", chunksize=DEFAULT_CHUNKSIZE, dtype=None, skip_rows=0
+):
+    """Yields the raw dataset as DataFrames of at most chunksize rows.
+
+    Only one chunk is held in memory at a time. The first skip_rows data rows
+    (after the header) are skipped. An empty file yields nothing.
+    """
+    skiprows = range(1, skip_rows + 1) if skip_rows else None
     try:
-        df = pd.read_csv(data_path)
+        with pd.read_csv(
+            data_path, chunksize=chunksize, dtype=dtype, skiprows=skiprows
+        ) as reader:
+            yield from reader
     except pd.errors.EmptyDataError:
+        return
+
+
+def stream_preprocessed_data(
+    data_path="data/data.csv", chunksize=DEFAULT_CHUNKSIZE, float_dtype="float64"
+):
+    """Yields typed, preprocessed chunks of the dataset with bounded memory use.
+
+    The 30 features are parsed directly as float_dtype ("float32" halves their
+    memory) and 'diagnosis' as a categorical. drop_unnecessary_columns and
+    map_diagnosis_to_numerical are applied to every chunk.
+    """
+    for chunk in iter_raw_data(data_path, chunksize, dtype=feature_dtypes(float_dtype)):
+        yield map_diagnosis_to_numerical(drop_unnecessary_columns(chunk))
+
+
+def load_raw_data(data_path="data/data.csv"):
+    """Loads the raw dataset from the specified path (all chunks of iter_raw_data at once)."""
+    chunks = list(iter_raw_data(data_path))
+    if not chunks:
         return pd.DataFrame()
-    return df
+    return chunks[0] if len(chunks) == 1 else pd.concat(chunks)
@@ -1,5 +1,23 @@
 import pandas as pd
 
+# The 30 numeric feature columns of the dataset, in file order
+FEATURE_COLUMNS = [
+    f"{measure}_{statistic}"
+    for statistic in ("mean", "se", "worst")
+    for measure in (
+        "radius",
+        "texture",
+        "perimeter",
+        "area",
+        "smoothness",
+        "compactness",
+        "concavity",
+        "concave points",
+        "symmetry",
+        "fractal_dimension",
+    )
+]
+
 
 def drop_unnecessary_columns(df):
     """Drops the 'id' and 'Unnamed: 32' columns from the DataFrame."""
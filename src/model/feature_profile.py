@@ -0,0 +1,70 @@
+"""Reference profile of the training features, saved next to the model.
+
+For every feature the scaler was fitted on, the profile stores the mean and
+standard deviation, a few quantiles, the scaler's fitted data_min_/data_max_
+and the edges and proportions of equal-frequency histogram bins. The serving
+side (src/serving/drift.py) summarizes live requests with the same bins and
+compares them against this profile.
+"""
+
+import json
+import os
+
+import numpy as np
+
+# Number of equal-frequency histogram bins per feature
+PROFILE_BINS = 20
+
+# Quantiles reported for the reference and the live data
+PROFILE_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+def profile_path(model_path):
+    return os.path.splitext(model_path)[0] + ".profile.json"
+
+
+def build_feature_profile(pipeline, X, bins=PROFILE_BINS):
+    """Profiles the training features X as seen by the pipeline's MinMaxScaler."""
+    preprocessor = pipeline.named_steps["preprocessor"]
+    scaler = preprocessor.named_steps["scaler"]
+    features = preprocessor.named_steps["drop_cols"].transform(X)
+    values = features.to_numpy(dtype=np.float64)
+
+    bin_edges, bin_proportions = [], []
+    for column in values.T:
+        # Inner edges at the reference quantiles; ties collapse into one edge
+        edges = np.unique(np.quantile(column, np.linspace(0, 1, bins + 1)[1:-1]))
+        counts = np.bincount(np.searchsorted(edges, column), minlength=len(edges) + 1)
+        bin_edges.append(edges.tolist())
+        bin_proportions.append((counts / len(column)).tolist())
+
+    return {
+        "features": list(features.columns),
+        "n_rows": len(values),
+        "mean": values.mean(axis=0).tolist(),
+        "std": values.std(axis=0).tolist(),
+        "quantile_levels": list(PROFILE_QUANTILES),
+        "quantiles": np.quantile(values, PROFILE_QUANTILES, axis=0).T.tolist(),
+        "data_min": scaler.data_min_.tolist(),
+        "data_max": scaler.data_max_.tolist(),
+        "bin_edges": bin_edges,
+        "bin_proportions": bin_proportions,
+    }
+
+
+def save_feature_profile(pipeline, X, model_path):
+    """Writes the profile of the training features X next to the model."""
+    path = profile_path(model_path)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(build_feature_profile(pipeline, X), f)
+    os.replace(f"{path}.tmp", path)
+    return path
+
+
+def load_feature_profile(model_path):
+    """The profile saved with the model at model_path, or None."""
+    try:
+        with open(profile_path(model_path)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,343 @@
+"""Model card: evaluation results computed once at training time, saved next to the model.
+
+<model>.card.json holds the hold-out metrics with bootstrap confidence
+intervals, the confusion matrix and the permutation importance of every
+feature. <model>.card.npz holds the ROC, precision-recall and calibration
+curves and the raw permutation scores. Serving code and dashboards read these
+files instead of re-evaluating the model.
+
+Permutation importance (one task per feature) and the bootstrap resamples
+(in chunks of BOOTSTRAP_CHUNK) run on a process pool, while the main process computes
+the curves.
+
+pandas, SciPy and scikit-learn are imported only when a card is built, so
+serving can read cards (load_model_card) without loading them.
+
+Usage: python -m src.model.model_card --model-path models/model.joblib
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .model_inference import get_pipeline
+from .model_registry import content_version
+
+CLASS_NAMES = ["benign", "malignant"]  # Classes 0 and 1
+
+DEFAULT_BOOTSTRAP_RESAMPLES = 1000
+DEFAULT_PERMUTATION_REPEATS = 10
+CALIBRATION_BINS = 10
+
+# Bootstrap resamples per pool task; fixed so results do not depend on workers
+BOOTSTRAP_CHUNK = 100
+
+# (pipeline, X, y, metrics) of the hold-out rows, set per worker process by init_worker
+_worker_state = None
+
+
+def card_path(model_path):
+    return os.path.splitext(model_path)[0] + ".card.json"
+
+
+def curves_path(model_path):
+    return os.path.splitext(model_path)[0] + ".card.npz"
+
+
+def init_worker(model_path, X, y):
+    """Pool initializer: loads the pipeline and the hold-out rows once per worker process."""
+    global _worker_state
+    pipeline = get_pipeline(model_path)
+    metrics = classification_metrics(y, pipeline.predict_proba(X)[:, 1])
+    _worker_state = (pipeline, X, y, metrics)
+
+
+def classification_metrics(y, proba):
+    """Accuracy, precision, recall, F1, ROC-AUC and Brier score at a 0.5 threshold.
+
+    y and proba may be 2-D, one resample per row; ROC-AUC is NaN for
+    resamples with a single class.
+    """
+    from scipy.stats import rankdata
+
+    y = np.atleast_2d(y)
+    proba = np.atleast_2d(proba)
+    predicted = proba > 0.5
+    true_positives = (predicted & (y == 1)).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = true_positives / predicted.sum(axis=1)
+        recall = true_positives / (y == 1).sum(axis=1)
+        f1 = 2 * precision * recall / (precision + recall)
+    # ROC-AUC as the Mann-Whitney statistic of the ranks (ties get average ranks)
+    positives = (y == 1).sum(axis=1)
+    negatives = y.shape[1] - positives
+    ranks = rankdata(proba, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roc_auc = ((ranks * (y == 1)).sum(axis=1) - positives * (positives + 1) / 2) / (
+            positives * negatives
+        )
+    return {
+        "accuracy": (predicted == y).mean(axis=1),
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "roc_auc": roc_auc,
+        "brier": ((proba - y) ** 2).mean(axis=1),
+    }
+
+
+def permutation_scores(feature, repeats, seed):
+    """ROC-AUC and accuracy drops when one feature of the hold-out rows is shuffled.
+
+    All repeats are scored with a single predict_proba call. Runs in a worker
+    (see init_worker).
+    """
+    import pandas as pd
+
+    pipeline, X, y, baseline = _worker_state
+    rng = np.random.default_rng(seed)
+    shuffled = pd.concat([X] * repeats, ignore_index=True)
+    shuffled[feature] = np.concatenate(
+        [rng.permutation(X[feature].to_numpy()) for _ in range(repeats)]
+    )
+    proba = pipeline.predict_proba(shuffled)[:, 1].reshape(repeats, len(X))
+    shuffled_metrics = classification_metrics(np.tile(y, (repeats, 1)), proba)
+    return (
+        baseline["roc_auc"][0] - shuffled_metrics["roc_auc"],
+        baseline["accuracy"][0] - shuffled_metrics["accuracy"],
+    )
+
+
+def bootstrap_metrics(y, proba, resamples, seed):
+    """classification_metrics of `resamples` bootstrap resamples of the hold-out rows."""
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(len(y), size=(resamples, len(y)))
+    return classification_metrics(y[rows], proba[rows])
+
+
+def model_features(pipeline, X):
+    """The raw columns the pipeline's preprocessor keeps (the permuted features)."""
+    return list(
+        pipeline.named_steps["preprocessor"]
+        .named_steps["drop_cols"]
+        .transform(X.head(0))
+        .columns
+    )
+
+
+def build_model_card(
+    model_path,
+    X_test,
+    y_test,
+    workers=None,
+    bootstrap_resamples=DEFAULT_BOOTSTRAP_RESAMPLES,
+    permutation_repeats=DEFAULT_PERMUTATION_REPEATS,
+    confidence=0.95,
+    random_state=42,
+):
+    """Evaluates the saved pipeline at model_path on the hold-out rows.
+
+    Returns (card, curves): the JSON-serializable card and a dict of NumPy
+    arrays. workers is the size of the process pool (default: all cores, at
+    most one per task); with workers=1 everything runs in this process.
+    """
+    from sklearn.calibration import calibration_curve
+    from sklearn.metrics import (
+        average_precision_score,
+        confusion_matrix,
+        precision_recall_curve,
+        roc_curve,
+    )
+
+    start = time.perf_counter()
+    y = np.asarray(y_test)
+    pipeline = get_pipeline(model_path)
+    proba = pipeline.predict_proba(X_test)[:, 1]
+    features = model_features(pipeline, X_test)
+
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(features)))
+    chunks = [
+        min(BOOTSTRAP_CHUNK, bootstrap_resamples - first)
+        for first in range(0, bootstrap_resamples, BOOTSTRAP_CHUNK)
+    ]
+    seeds = np.random.SeedSequence(random_state).spawn(len(features) + len(chunks))
+    feature_seeds, bootstrap_seeds = seeds[: len(features)], seeds[len(features) :]
+
+    def evaluate_curves():
+        fpr, tpr, roc_thresholds = roc_curve(y, proba)
+        precision, recall, pr_thresholds = precision_recall_curve(y, proba)
+        prob_true, prob_pred = calibration_curve(
+            y, proba, n_bins=CALIBRATION_BINS, strategy="quantile"
+        )
+        return {
+            "roc_fpr": fpr,
+            "roc_tpr": tpr,
+            "roc_thresholds": roc_thresholds,
+            "pr_precision": precision,
+            "pr_recall": recall,
+            "pr_thresholds": pr_thresholds,
+            "calibration_prob_true": prob_true,
+            "calibration_prob_pred": prob_pred,
+        }
+
+    if workers == 1:
+        init_worker(model_path, X_test, y)
+        permutations = [
+            permutation_scores(feature, permutation_repeats, seed)
+            for feature, seed in zip(features, feature_seeds)
+        ]
+        resampled = [
+            bootstrap_metrics(y, proba, chunk, seed)
+            for chunk, seed in zip(chunks, bootstrap_seeds)
+        ]
+        curves = evaluate_curves()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(model_path, X_test, y),
+        ) as executor:
+            permutation_futures = [
+                executor.submit(permutation_scores, feature, permutation_repeats, seed)
+                for feature, seed in zip(features, feature_seeds)
+            ]
+            bootstrap_futures = [
+                executor.submit(bootstrap_metrics, y, proba, chunk, seed)
+                for chunk, seed in zip(chunks, bootstrap_seeds)
+            ]
+            curves = evaluate_curves()
+            permutations = [future.result() for future in permutation_futures]
+            resampled = [future.result() for future in bootstrap_futures]
+
+    roc_auc_drops = np.array([drops for drops, _ in permutations])
+    accuracy_drops = np.array([drops for _, drops in permutations])
+    curves["permutation_roc_auc_drops"] = roc_auc_drops
+    curves["permutation_features"] = np.array(features)
+
+    metrics = {
+        name: float(values[0])
+        for name, values in classification_metrics(y, proba).items()
+    }
+    metrics["average_precision"] = float(average_precision_score(y, proba))
+    tail = (1 - confidence) / 2 * 100
+    intervals = {}
+    for name in resampled[0]:
+        values = np.concatenate([chunk[name] for chunk in resampled])
+        low, high = np.nanpercentile(values, [tail, 100 - tail])
+        intervals[name] = {"low": float(low), "high": float(high)}
+
+    importance = sorted(
+        (
+            {
+                "feature": feature,
+                "roc_auc_drop_mean": float(roc_auc_drops[i].mean()),
+                "roc_auc_drop_std": float(roc_auc_drops[i].std()),
+                "accuracy_drop_mean": float(accuracy_drops[i].mean()),
+            }
+            for i, feature in enumerate(features)
+        ),
+        key=lambda entry: entry["roc_auc_drop_mean"],
+        reverse=True,
+    )
+
+    card = {
+        "model_version": content_version(model_path),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "test_rows": len(y),
+        "class_counts": dict(zip(CLASS_NAMES, np.bincount(y, minlength=2).tolist())),
+        "threshold": 0.5,
+        "metrics": metrics,
+        "confidence_intervals": intervals,
+        "bootstrap": {"resamples": bootstrap_resamples, "confidence": confidence},
+        "confusion_matrix": {
+            "labels": CLASS_NAMES,  # rows: true class, columns: predicted class
+            "matrix": confusion_matrix(
+                y, (proba > 0.5).astype(int), labels=[0, 1]
+            ).tolist(),
+        },
+        "permutation_importance": {
+            "repeats": permutation_repeats,
+            "features": importance,
+        },
+        "curves": os.path.basename(curves_path(model_path)),
+        "workers": workers,
+        "evaluation_seconds": round(time.perf_counter() - start, 3),
+    }
+    return card, curves
+
+
+def save_model_card(model_path, X_test, y_test, **kwargs):
+    """Builds the model card of the saved pipeline at model_path and writes it next to it.
+
+    Keyword arguments are passed to build_model_card. Returns the card.
+    """
+    card, curves = build_model_card(model_path, X_test, y_test, **kwargs)
+    path = curves_path(model_path)
+    with open(f"{path}.tmp", "wb") as f:
+        np.savez_compressed(f, **curves)
+    os.replace(f"{path}.tmp", path)
+    path = card_path(model_path)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(card, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+    print(
+        f"Model card saved to {path} (ROC-AUC {card['metrics']['roc_auc']:.4f}, "
+        f"{card['evaluation_seconds']:.1f}s on {card['workers']} workers)"
+    )
+    return card
+
+
+def remove_model_card(model_path):
+    """Deletes the card files saved with model_path, if any (e.g. after retraining without a card)."""
+    for path in (card_path(model_path), curves_path(model_path)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def load_model_card(model_path):
+    """The card saved with the model at model_path, or None."""
+    try:
+        with open(card_path(model_path)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def load_model_curves(model_path):
+    """The curve arrays saved with the model at model_path, as a dict, or None."""
+    try:
+        with np.load(curves_path(model_path), allow_pickle=False) as arrays:
+            return {name: arrays[name] for name in arrays.files}
+    except FileNotFoundError:
+        return None
+
+
+if __name__ == "__main__":
+    from .model_training import holdout_split, load_features_and_target
+
+    parser = argparse.ArgumentParser(
+        description="Evaluate a trained pipeline and save its model card."
+    )
+    parser.add_argument("--data-path", default="data/data.csv")
+    parser.add_argument("--model-path", default="models/model.joblib")
+    parser.add_argument("--workers", type=int, help="Default: all cores.")
+    parser.add_argument("--bootstrap", type=int, default=DEFAULT_BOOTSTRAP_RESAMPLES)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_PERMUTATION_REPEATS)
+    args = parser.parse_args()
+
+    X, y = load_features_and_target(args.data_path)
+    _, X_test, _, y_test = holdout_split(args.model_path, X, y)
+    save_model_card(
+        args.model_path,
+        X_test,
+        y_test,
+        workers=args.workers,
+        bootstrap_resamples=args.bootstrap,
+        permutation_repeats=args.repeats,
+    )
@@ -0,0 +1,450 @@
+"""Compression of a trained pipeline into cheaper variants.
+
+Candidates are built from a reference forest with the saved pipeline's
+hyperparameters, refitted on the training rows minus a validation split:
+
+    top_k_trees         the k trees picked by greedy forward ensemble selection
+    depth_<d>           the same forest with trees capped at depth d
+    distilled_tree      one shallow tree fitted to the forest's probabilities
+    distilled_logistic  a logistic regression fitted to the same soft labels
+
+Every candidate keeps the saved pipeline's fitted preprocessor, so it is a
+drop-in replacement for the app. The tree-based ones are stored as a
+RandomForestClassifier (the distilled tree as a one-tree forest), so they
+can still be exported with compiled_model.py. A candidate qualifies if its
+validation accuracy and ROC-AUC stay within the given drops from the
+reference forest; the fastest one is saved, with a JSON report of accuracy
+and ROC-AUC (on the held-out test rows) against latency and artifact size.
+
+The greedy selection scores every tree on its out-of-bag rows of the fitting
+split, so the validation split is only used to choose k and to compare the
+candidates.
+"""
+
+import argparse
+import copy
+import io
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.tree import DecisionTreeClassifier
+
+from .feature_profile import save_feature_profile
+from .model_card import remove_model_card
+from .model_registry import register_model
+from .model_training import (
+    holdout_split,
+    load_features_and_target,
+    model_attachments,
+    save_pipeline,
+    training_metadata,
+)
+from .training_state import state_path
+
+DEFAULT_DEPTHS = (4, 6, 8)
+
+# Synthetic rows per training row labelled by the teacher for distillation
+DISTILLATION_AUGMENT = 4
+
+
+def forest_with_trees(forest, trees):
+    """A copy of a fitted forest made of the given fitted trees."""
+    pruned = copy.copy(forest)
+    pruned.estimators_ = list(trees)
+    pruned.n_estimators = len(pruned.estimators_)
+    return pruned
+
+
+def out_of_bag_mask(forest, n_samples):
+    """(n_trees, n_samples) mask of the training rows each tree did not see.
+
+    The complement of the forest's in-bag rows (estimators_samples_), the
+    rows scikit-learn uses for oob_score. None for forests trained without
+    bootstrap.
+    """
+    if not forest.bootstrap:
+        return None
+    mask = np.ones((len(forest.estimators_), n_samples), dtype=bool)
+    for i, in_bag in enumerate(forest.estimators_samples_):
+        mask[i, in_bag] = False
+    return mask
+
+
+def greedy_tree_selection(forest, Z, y, mask=None):
+    """Orders the forest's trees by greedy forward ensemble selection.
+
+    At each step the tree whose addition gives the lowest Brier score of the
+    averaged probabilities on rows (Z, y) is added, without replacement. mask
+    restricts every tree to the rows it may be scored on (its out-of-bag rows,
+    see out_of_bag_mask); a row no selected tree may score counts as 0.5.
+    Returns the tree order and the ROC-AUC and accuracy after each step.
+    """
+    n_trees = len(forest.estimators_)
+    if mask is None:
+        mask = np.ones((n_trees, len(y)), dtype=bool)
+    tree_proba = np.array([tree.predict_proba(Z)[:, 1] for tree in forest.estimators_])
+    tree_proba *= mask
+    remaining = list(range(n_trees))
+    total = np.zeros(len(y))
+    counts = np.zeros(len(y))
+    order, curve = [], []
+    for k in range(1, n_trees + 1):
+        candidate_counts = counts + mask[remaining]
+        candidates = np.where(
+            candidate_counts > 0,
+            (total + tree_proba[remaining]) / np.maximum(candidate_counts, 1),
+            0.5,
+        )
+        brier = ((candidates - y) ** 2).mean(axis=1)
+        best = remaining.pop(int(np.argmin(brier)))
+        order.append(best)
+        total += tree_proba[best]
+        counts += mask[best]
+        scored = counts > 0
+        proba = total[scored] / counts[scored]
+        curve.append(
+            {
+                "trees": k,
+                "roc_auc": float(roc_auc_score(y[scored], proba)),
+                "accuracy": float(accuracy_score(y[scored], proba > 0.5)),
+            }
+        )
+    return order, curve
+
+
+def distillation_set(teacher, Z_fit, augment=DISTILLATION_AUGMENT, random_state=42):
+    """Transfer rows (the training rows plus mixup interpolations) and the teacher's P(malignant)."""
+    rng = np.random.default_rng(random_state)
+    n_synthetic = augment * len(Z_fit)
+    first = rng.integers(len(Z_fit), size=n_synthetic)
+    second = rng.integers(len(Z_fit), size=n_synthetic)
+    weight = rng.random((n_synthetic, 1))
+    synthetic = weight * Z_fit[first] + (1 - weight) * Z_fit[second]
+    Z = np.vstack([Z_fit, synthetic])
+    return Z, teacher.predict_proba(Z)[:, 1]
+
+
+def fit_soft_labels(student, Z, soft_labels):
+    """Fits a classifier to soft labels: every row appears once per class, weighted by its probability."""
+    student.fit(
+        np.vstack([Z, Z]),
+        np.concatenate([np.ones(len(Z)), np.zeros(len(Z))]).astype(int),
+        sample_weight=np.concatenate([soft_labels, 1 - soft_labels]),
+    )
+    return student
+
+
+def with_classifier(pipeline, classifier):
+    """The pipeline with its fitted preprocessor and a different fitted classifier."""
+    return Pipeline(
+        [
+            ("preprocessor", pipeline.named_steps["preprocessor"]),
+            ("classifier", classifier),
+        ]
+    )
+
+
+def artifact_bytes(pipeline):
+    """Size of the pipeline serialized with joblib."""
+    buffer = io.BytesIO()
+    joblib.dump(pipeline, buffer)
+    return buffer.tell()
+
+
+def best_seconds(function, repeats):
+    """Best wall time of function over repeats calls, after one warm-up call."""
+    function()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def describe(pipeline, X_test, y_test, latency_repeats=50):
+    """Test metrics, latency (1 row and the whole test set) and size of a pipeline."""
+    classifier = pipeline.named_steps["classifier"]
+    proba = pipeline.predict_proba(X_test)[:, 1]
+    entry = {
+        "test_accuracy": float(accuracy_score(y_test, proba > 0.5)),
+        "test_roc_auc": float(roc_auc_score(y_test, proba)),
+        "latency_1_row_ms": 1000
+        * best_seconds(
+            lambda: pipeline.predict_proba(X_test.iloc[:1]), latency_repeats
+        ),
+        "latency_batch_ms": 1000
+        * best_seconds(lambda: pipeline.predict_proba(X_test), 5),
+        "batch_rows": len(X_test),
+        "artifact_bytes": artifact_bytes(pipeline),
+    }
+    if isinstance(classifier, RandomForestClassifier):
+        entry["trees"] = len(classifier.estimators_)
+        entry["nodes"] = int(sum(t.tree_.node_count for t in classifier.estimators_))
+        entry["max_depth"] = int(max(t.tree_.max_depth for t in classifier.estimators_))
+    return entry
+
+
+def compress_and_save_pipeline(
+    data_path="data/data.csv",
+    model_path="models/model.joblib",
+    output_path="models/model.compressed.joblib",
+    trees=None,
+    depths=DEFAULT_DEPTHS,
+    distill_depth=6,
+    max_accuracy_drop=0.01,
+    max_roc_auc_drop=0.005,
+    variant=None,
+    validation_size=0.2,
+    random_state=42,
+    latency_repeats=50,
+    report_path=None,
+    compiled_model_path=None,
+    use_data_cache=False,
+    registry_dir=None,
+):
+    """Builds compressed variants of the pipeline at model_path and saves the chosen one.
+
+    trees fixes the number of trees kept by the greedy selection (default: the
+    fewest whose validation scores stay within the allowed drops). The fastest
+    of the original and the qualifying candidates is saved, so the original
+    is kept if no candidate beats it; variant saves the named candidate
+    instead. The report is written
+    to report_path (default: next to the output, *.compression.json) and
+    returned.
+    """
+    start = time.perf_counter()
+    X, y = load_features_and_target(data_path, use_data_cache)
+    X_train, X_test, y_train, y_test = holdout_split(model_path, X, y, random_state)
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train,
+        y_train,
+        test_size=validation_size,
+        stratify=y_train,
+        random_state=random_state,
+    )
+    y_fit, y_val = y_fit.to_numpy(), y_val.to_numpy()
+
+    original = joblib.load(model_path)
+    preprocessor = original.named_steps["preprocessor"]
+    Z_fit, Z_val = preprocessor.transform(X_fit), preprocessor.transform(X_val)
+    reference = clone(original.named_steps["classifier"]).fit(Z_fit, y_fit)
+
+    # Trees are ordered on their out-of-bag rows; the greedy scores on those
+    # rows are optimistic, so k is chosen on the unseen validation split
+    mask = out_of_bag_mask(reference, len(Z_fit))
+    if mask is not None:
+        order, curve = greedy_tree_selection(reference, Z_fit, y_fit, mask)
+    else:
+        order, curve = greedy_tree_selection(reference, Z_val, y_val)
+    tree_proba = np.array(
+        [reference.estimators_[i].predict_proba(Z_val)[:, 1] for i in order]
+    )
+    prefix_proba = tree_proba.cumsum(axis=0) / np.arange(1, len(order) + 1)[:, None]
+    for point, proba in zip(curve, prefix_proba):
+        point["val_roc_auc"] = float(roc_auc_score(y_val, proba))
+        point["val_accuracy"] = float(accuracy_score(y_val, proba > 0.5))
+    if trees is None:
+        full = curve[-1]
+        trees = next(
+            point["trees"]
+            for point in curve
+            if point["val_accuracy"] >= full["val_accuracy"] - max_accuracy_drop
+            and point["val_roc_auc"] >= full["val_roc_auc"] - max_roc_auc_drop
+        )
+    trees = min(trees, len(order))
+
+    classifiers = {
+        "reference": reference,
+        "top_k_trees": forest_with_trees(
+            reference, [reference.estimators_[i] for i in order[:trees]]
+        ),
+    }
+    for depth in depths:
+        classifiers[f"depth_{depth}"] = clone(reference).set_params(max_depth=depth)
+        classifiers[f"depth_{depth}"].fit(Z_fit, y_fit)
+    Z_transfer, soft_labels = distillation_set(
+        reference, Z_fit, random_state=random_state
+    )
+    student = fit_soft_labels(
+        DecisionTreeClassifier(
+            max_depth=distill_depth, min_samples_leaf=5, random_state=random_state
+        ),
+        Z_transfer,
+        soft_labels,
+    )
+    classifiers["distilled_tree"] = forest_with_trees(reference, [student])
+    classifiers["distilled_logistic"] = fit_soft_labels(
+        LogisticRegression(C=100.0, max_iter=5000), Z_transfer, soft_labels
+    )
+
+    if variant is not None and variant not in {"original", *classifiers}:
+        raise ValueError(
+            f"Unknown variant '{variant}'. "
+            f"Choose one of {sorted({'original', *classifiers})}."
+        )
+
+    candidates = {
+        "original": {
+            "name": "original",
+            **describe(original, X_test, y_test, latency_repeats),
+        }
+    }
+    pipelines = {"original": original}
+    for name, classifier in classifiers.items():
+        pipeline = with_classifier(original, classifier)
+        val_proba = classifier.predict_proba(Z_val)[:, 1]
+        entry = {
+            "name": name,
+            "val_accuracy": float(accuracy_score(y_val, val_proba > 0.5)),
+            "val_roc_auc": float(roc_auc_score(y_val, val_proba)),
+            **describe(pipeline, X_test, y_test, latency_repeats),
+        }
+        candidates[name] = entry
+        pipelines[name] = pipeline
+    reference_entry = candidates["reference"]
+    for name in classifiers:
+        entry = candidates[name]
+        entry["qualifies"] = name != "reference" and (
+            entry["val_accuracy"] >= reference_entry["val_accuracy"] - max_accuracy_drop
+            and entry["val_roc_auc"]
+            >= reference_entry["val_roc_auc"] - max_roc_auc_drop
+        )
+
+    if variant is not None:
+        chosen = variant
+    else:
+        qualifying = [
+            entry
+            for entry in candidates.values()
+            if entry.get("qualifies") or entry["name"] == "original"
+        ]
+        chosen = min(qualifying, key=lambda entry: entry["latency_1_row_ms"])["name"]
+
+    print(
+        f"{'variant':<20}{'val acc':>9}{'val auc':>9}{'test acc':>10}{'test auc':>10}"
+        f"{'1 row ms':>10}{'batch ms':>10}{'KiB':>9}"
+    )
+    for entry in candidates.values():
+        print(
+            f"{entry['name']:<20}{entry.get('val_accuracy', float('nan')):>9.4f}"
+            f"{entry.get('val_roc_auc', float('nan')):>9.4f}"
+            f"{entry['test_accuracy']:>10.4f}{entry['test_roc_auc']:>10.4f}"
+            f"{entry['latency_1_row_ms']:>10.2f}{entry['latency_batch_ms']:>10.2f}"
+            f"{entry['artifact_bytes'] / 1024:>9.0f}"
+            + ("  <- saved" if entry["name"] == chosen else "")
+        )
+
+    pipeline = pipelines[chosen]
+    if not isinstance(pipeline.named_steps["classifier"], RandomForestClassifier):
+        compiled_model_path = None  # Only forests can be compiled
+    save_pipeline(pipeline, output_path, compiled_model_path)
+    save_feature_profile(pipeline, X_train, output_path)
+    if os.path.exists(state_path(output_path)):
+        # A compressed model cannot be updated incrementally
+        os.remove(state_path(output_path))
+    # Any card at output_path describes another model
+    remove_model_card(output_path)
+    seconds = time.perf_counter() - start
+
+    report = {
+        "model_path": model_path,
+        "output_path": output_path,
+        "chosen": chosen,
+        "fit_rows": len(X_fit),
+        "validation_rows": len(X_val),
+        "test_rows": len(X_test),
+        "max_accuracy_drop": max_accuracy_drop,
+        "max_roc_auc_drop": max_roc_auc_drop,
+        "top_k_trees": trees,
+        "selection_rows": "out_of_bag" if mask is not None else "validation",
+        "selection_curve": curve,
+        "candidates": list(candidates.values()),
+        "compression_seconds": round(seconds, 3),
+    }
+    report_path = report_path or os.path.splitext(output_path)[0] + ".compression.json"
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Compression report saved to {report_path}")
+
+    if registry_dir:
+        metrics = {
+            "accuracy": candidates[chosen]["test_accuracy"],
+            "roc_auc": candidates[chosen]["test_roc_auc"],
+        }
+        metadata = training_metadata(pipeline, data_path, metrics, seconds)
+        register_model(
+            pipeline,
+            registry_dir,
+            {**metadata, "compression": {"variant": chosen, "report": report_path}},
+            attachments=model_attachments(output_path),
+        )
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compress a trained pipeline into a smaller, faster variant."
+    )
+    parser.add_argument("--data-path", default="data/data.csv")
+    parser.add_argument("--model-path", default="models/model.joblib")
+    parser.add_argument("--output", default="models/model.compressed.joblib")
+    parser.add_argument(
+        "--trees",
+        type=int,
+        help="Trees kept by the greedy selection (default: fewest within the drops).",
+    )
+    parser.add_argument(
+        "--depths",
+        type=int,
+        nargs="*",
+        default=list(DEFAULT_DEPTHS),
+        help="Depth caps of the depth-limited forests.",
+    )
+    parser.add_argument("--distill-depth", type=int, default=6)
+    parser.add_argument("--max-accuracy-drop", type=float, default=0.01)
+    parser.add_argument("--max-roc-auc-drop", type=float, default=0.005)
+    parser.add_argument(
+        "--variant",
+        help="Save this candidate (e.g. distilled_tree) instead of the fastest qualifying one.",
+    )
+    parser.add_argument("--random-state", type=int, default=42)
+    parser.add_argument(
+        "--compiled-output",
+        help="Also export the saved variant to the compiled NumPy format (forests only).",
+    )
+    parser.add_argument(
+        "--use-data-cache",
+        action="store_true",
+        help="Read the preprocessed data from the Arrow cache (see data_cache.py).",
+    )
+    parser.add_argument(
+        "--registry-dir",
+        help="Also register the saved variant as the current version of this registry.",
+    )
+    args = parser.parse_args()
+
+    compress_and_save_pipeline(
+        data_path=args.data_path,
+        model_path=args.model_path,
+        output_path=args.output,
+        trees=args.trees,
+        depths=args.depths,
+        distill_depth=args.distill_depth,
+        max_accuracy_drop=args.max_accuracy_drop,
+        max_roc_auc_drop=args.max_roc_auc_drop,
+        variant=args.variant,
+        random_state=args.random_state,
+        compiled_model_path=args.compiled_output,
+        use_data_cache=args.use_data_cache,
+        registry_dir=args.registry_dir,
+    )
@@ -1,25 +1,137 @@
-import joblib
-import pandas as pd
+import numpy as np
 import os
+import threading
+from collections import OrderedDict
+
+from .compiled_model import CompiledForest, load_compiled_model
+
+# Maximum number of distinct pipelines (paths/versions) kept in memory at once
+MAX_CACHED_PIPELINES = int(os.getenv("MAX_CACHED_PIPELINES", "4"))
+
+# Process-wide cache: absolute path -> (file signature, pipeline), in LRU order
+_pipeline_cache: OrderedDict[str, tuple] = OrderedDict()
+_pipeline_cache_lock = threading.Lock()
 
 
 def load_pipeline(model_path="models/model.joblib"):
-    """Loads the trained scikit-learn pipeline."""
+    """Loads the trained scikit-learn pipeline.
+
+    Compiled models (a .npz file, or a directory that is memory-mapped) are
+    loaded with load_compiled_model instead.
+    """
     if not os.path.exists(model_path):
         raise FileNotFoundError(
             f"Model pipeline not found at {model_path}. Please train the model first."
         )
+    if str(model_path).endswith(".npz") or os.path.isdir(model_path):
+        return load_compiled_model(model_path)
+    # Imported here so that serving a compiled model never loads joblib/scikit-learn
+    import joblib
+
     return joblib.load(model_path)
 
 
-def predict(raw_data, model_path="models/model.joblib"):
-    """Loads the pipeline and makes a prediction on new raw data."""
+def artifact_files(model_path):
+    """Lists the files making up a model artifact (one file, or a compiled directory)."""
+    if os.path.isdir(model_path):
+        return sorted(
+            os.path.join(model_path, name)
+            for name in os.listdir(model_path)
+            if name.endswith(".npy")
+        )
+    return [model_path]
+
+
+def artifact_signature(model_path):
+    """Returns (mtime_ns, size) identifying the current contents of model_path.
+
+    For directory artifacts this is the newest mtime and the total size of the
+    array files.
+    """
+    stats = [os.stat(path) for path in artifact_files(model_path)]
+    if not stats:
+        raise FileNotFoundError(f"No model arrays found in {model_path}.")
+    return max(st.st_mtime_ns for st in stats), sum(st.st_size for st in stats)
+
+
+def get_pipeline(model_path="models/model.joblib", validate=None):
+    """Returns the pipeline at model_path, loading it from disk only when needed.
+
+    Pipelines are cached per absolute path and reused as long as the file's
+    mtime and size are unchanged; a rewritten file is reloaded transparently.
+    At most MAX_CACHED_PIPELINES pipelines are kept, evicting the least
+    recently used one. validate(pipeline) is called on freshly loaded
+    pipelines before they are cached; if it raises, nothing is cached (or
+    evicted).
+    """
+    try:
+        key = os.path.abspath(model_path)
+        signature = artifact_signature(model_path)
+    except OSError:
+        # Let load_pipeline raise its usual error for a missing file
+        return load_pipeline(model_path)
+
+    with _pipeline_cache_lock:
+        cached = _pipeline_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            _pipeline_cache.move_to_end(key)
+            return cached[1]
+
     pipeline = load_pipeline(model_path)
-    prediction = pipeline.predict(raw_data)
+    if validate is not None:
+        validate(pipeline)
+    with _pipeline_cache_lock:
+        _pipeline_cache[key] = (signature, pipeline)
+        _pipeline_cache.move_to_end(key)
+        while len(_pipeline_cache) > MAX_CACHED_PIPELINES:
+            _pipeline_cache.popitem(last=False)
+    return pipeline
+
+
+def invalidate_pipeline_cache(model_path=None):
+    """Drops model_path from the pipeline cache, or every entry if no path is given."""
+    with _pipeline_cache_lock:
+        if model_path is None:
+            _pipeline_cache.clear()
+        else:
+            _pipeline_cache.pop(os.path.abspath(model_path), None)
+
+
+def as_model_input(pipeline, features, feature_names):
+    """Wraps a float64 feature matrix (columns in feature_names order) for pipeline.
+
+    Compiled models take the array as is; scikit-learn pipelines select columns
+    by name and need a DataFrame, so pandas is only imported for them.
+    """
+    if isinstance(pipeline, CompiledForest):
+        return features
+    import pandas as pd
+
+    return pd.DataFrame(features, columns=feature_names)
+
+
+def predict_with_proba(pipeline, raw_data):
+    """Returns (labels, probabilities) from a single predict_proba call.
+
+    The labels are the argmax of the probabilities mapped through classes_,
+    which is exactly what the classifier's predict() computes, so the forest
+    is only evaluated once.
+    """
+    proba = pipeline.predict_proba(raw_data)
+    labels = pipeline.classes_.take(np.argmax(proba, axis=1), axis=0)
+    return labels, proba
+
+
+def predict(raw_data, model_path="models/model.joblib"):
+    """Makes a prediction on new raw data with the (cached) pipeline at model_path."""
+    pipeline = get_pipeline(model_path)
+    prediction, _ = predict_with_proba(pipeline, raw_data)
     return prediction
 
 
 if __name__ == "__main__":
+    import pandas as pd
+
     print(
         "This module is for inference. Please run model_training.py to train the model."
     )
@@ -0,0 +1,228 @@
+"""Local, file-based registry of trained pipelines.
+
+Layout of a registry directory:
+
+    versions/<version>/model.joblib    the pipeline; <version> is a short sha256 of it
+    versions/<version>/metadata.json   data fingerprint, metrics, hyperparameters, timings
+    CURRENT                            id of the version to serve
+    HISTORY                            every version activated so far, one per line
+
+Registered versions are immutable and CURRENT is replaced atomically, so
+activating a version or rolling back is a pointer flip that a serving process
+can follow at any time (see ModelHolder).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+
+DEFAULT_REGISTRY_DIR = "models/registry"
+
+# File name of the pipeline inside each version directory
+ARTIFACT_NAME = "model.joblib"
+
+
+def content_version(path):
+    """Returns the version id of an artifact: a short sha256 of its contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def version_dir(version, registry_dir=DEFAULT_REGISTRY_DIR):
+    return os.path.join(registry_dir, "versions", version)
+
+
+def write_atomic(path, text):
+    """Replaces path with text in one step (temporary file + rename)."""
+    with open(f"{path}.tmp", "w") as f:
+        f.write(text)
+    os.replace(f"{path}.tmp", path)
+
+
+def register_model(
+    pipeline,
+    registry_dir=DEFAULT_REGISTRY_DIR,
+    metadata=None,
+    activate=True,
+    attachments=None,
+):
+    """Stores pipeline under its content hash with metadata and returns the version id.
+
+    attachments maps file names to paths of files stored with the version
+    (e.g. the feature profile). Registering identical content again returns
+    the existing version. With activate=True the version also becomes CURRENT.
+    """
+    import joblib
+
+    versions_dir = os.path.join(registry_dir, "versions")
+    os.makedirs(versions_dir, exist_ok=True)
+
+    # Written to a temporary directory first, then renamed into place whole
+    staging_dir = tempfile.mkdtemp(prefix=".staging-", dir=versions_dir)
+    try:
+        artifact_path = os.path.join(staging_dir, ARTIFACT_NAME)
+        joblib.dump(pipeline, artifact_path)
+        version = content_version(artifact_path)
+        target_dir = version_dir(version, registry_dir)
+        if not os.path.exists(target_dir):
+            with open(os.path.join(staging_dir, "metadata.json"), "w") as f:
+                json.dump(
+                    {
+                        "version": version,
+                        "registered_at": datetime.now(timezone.utc).isoformat(),
+                        **(metadata or {}),
+                    },
+                    f,
+                    indent=2,
+                    default=str,
+                )
+            for name, source in (attachments or {}).items():
+                shutil.copyfile(source, os.path.join(staging_dir, name))
+            os.replace(staging_dir, target_dir)
+            print(f"Registered model version {version} in {registry_dir}")
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    if activate:
+        activate_version(version, registry_dir)
+    return version
+
+
+def read_metadata(version, registry_dir=DEFAULT_REGISTRY_DIR):
+    with open(os.path.join(version_dir(version, registry_dir), "metadata.json")) as f:
+        return json.load(f)
+
+
+def list_versions(registry_dir=DEFAULT_REGISTRY_DIR):
+    """Metadata of every registered version, oldest first."""
+    versions_dir = os.path.join(registry_dir, "versions")
+    if not os.path.isdir(versions_dir):
+        return []
+    entries = [
+        read_metadata(name, registry_dir)
+        for name in os.listdir(versions_dir)
+        if not name.startswith(".")
+    ]
+    return sorted(entries, key=lambda entry: entry["registered_at"])
+
+
+def current_version(registry_dir=DEFAULT_REGISTRY_DIR):
+    """The version CURRENT points to, or None if nothing was activated yet."""
+    try:
+        with open(os.path.join(registry_dir, "CURRENT")) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def resolve_version(registry_dir=DEFAULT_REGISTRY_DIR, version="current"):
+    """Returns the artifact path of a version id, or of CURRENT for "current"."""
+    if version == "current":
+        version = current_version(registry_dir)
+        if version is None:
+            raise FileNotFoundError(
+                f"No current model version in registry {registry_dir}."
+            )
+    path = os.path.join(version_dir(version, registry_dir), ARTIFACT_NAME)
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"Model version {version} not found in registry {registry_dir}."
+        )
+    return path
+
+
+def read_history(registry_dir=DEFAULT_REGISTRY_DIR):
+    try:
+        with open(os.path.join(registry_dir, "HISTORY")) as f:
+            return [line.strip() for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def activate_version(version, registry_dir=DEFAULT_REGISTRY_DIR):
+    """Points CURRENT at version (atomically) and records it in HISTORY."""
+    resolve_version(registry_dir, version)  # fails for unknown versions
+    write_atomic(os.path.join(registry_dir, "CURRENT"), version + "\n")
+    with open(os.path.join(registry_dir, "HISTORY"), "a") as f:
+        f.write(version + "\n")
+    print(f"Model version {version} is now current")
+
+
+def rollback(registry_dir=DEFAULT_REGISTRY_DIR, version=None):
+    """Re-activates version, or by default the one that was current before this one.
+
+    Returns the version that is current afterwards.
+    """
+    if version is None:
+        current = current_version(registry_dir)
+        previous = [entry for entry in read_history(registry_dir) if entry != current]
+        available = [
+            entry
+            for entry in previous
+            if os.path.isdir(version_dir(entry, registry_dir))
+        ]
+        if not available:
+            raise ValueError(
+                f"No earlier model version to roll back to in {registry_dir}."
+            )
+        version = available[-1]
+    activate_version(version, registry_dir)
+    return version
+
+
+def garbage_collect(registry_dir=DEFAULT_REGISTRY_DIR, keep=5):
+    """Deletes all but the `keep` most recently registered versions and returns their ids.
+
+    The current version is never deleted.
+    """
+    current = current_version(registry_dir)
+    entries = list_versions(registry_dir)
+    retained = {entry["version"] for entry in entries[-keep:]} if keep > 0 else set()
+    removed = []
+    for entry in entries:
+        version = entry["version"]
+        if version in retained or version == current:
+            continue
+        shutil.rmtree(version_dir(version, registry_dir))
+        removed.append(version)
+    return removed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the local model registry.")
+    parser.add_argument("--registry-dir", default=DEFAULT_REGISTRY_DIR)
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    subparsers.add_parser("list", help="List registered versions.")
+    activate_parser = subparsers.add_parser("activate", help="Make a version current.")
+    activate_parser.add_argument("version")
+    rollback_parser = subparsers.add_parser(
+        "rollback", help="Re-activate the previous (or the given) version."
+    )
+    rollback_parser.add_argument("version", nargs="?")
+    gc_parser = subparsers.add_parser("gc", help="Delete old versions.")
+    gc_parser.add_argument("--keep", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.action == "list":
+        current = current_version(args.registry_dir)
+        for entry in list_versions(args.registry_dir):
+            marker = "*" if entry["version"] == current else " "
+            accuracy = entry.get("metrics", {}).get("accuracy")
+            accuracy_text = f"accuracy={accuracy:.4f}" if accuracy is not None else ""
+            print(
+                f"{marker} {entry['version']}  {entry['registered_at']}  {accuracy_text}"
+            )
+    elif args.action == "activate":
+        activate_version(args.version, args.registry_dir)
+    elif args.action == "rollback":
+        rollback(args.registry_dir, args.version)
+    else:
+        removed = garbage_collect(args.registry_dir, args.keep)
+        print(f"Removed {len(removed)} version(s) from {args.registry_dir}")
@@ -1,49 +1,523 @@
+from sklearn.base import clone
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
+import argparse
 import joblib
+import json
+import math
 import os
+import time
+from datetime import datetime, timezone
 
+import numpy as np
+import pandas as pd
+
+from .compiled_model import export_compiled_model
+from .data_cache import load_preprocessed_data, source_fingerprint
 from .data_ingestion import load_raw_data
 from .data_preprocessing import map_diagnosis_to_numerical, prepare_features_and_target
-from .pipeline_utils import create_breast_cancer_pipeline
+from .feature_profile import profile_path, save_feature_profile
+from .model_card import card_path, curves_path, remove_model_card, save_model_card
+from .model_registry import ARTIFACT_NAME, register_model
+from .pipeline_utils import (
+    create_breast_cancer_pipeline,
+    create_hyperparameter_search,
+)
+from .training_state import (
+    appended_rows_start,
+    load_training_state,
+    save_training_state,
+)
 
+# Appended batches smaller than this go entirely into the training split
+MIN_ROWS_TO_SPLIT = 5
 
-def train_and_save_pipeline(
-    data_path="data/data.csv", model_path="models/model.joblib"
-):
-    """Orchestrates the training process: loads data, preprocesses, trains, and saves the pipeline."""
-    # Load the raw dataset
-    df_raw = load_raw_data(data_path)
 
-    # Apply diagnosis mapping before splitting features and target
-    df_mapped = map_diagnosis_to_numerical(
-        df_raw.copy()
-    )  # Use a copy to avoid modifying original df_raw if it's used elsewhere
+def load_features_and_target(data_path="data/data.csv", use_data_cache=False):
+    """Loads the dataset and returns its features (X) and target (y) in file order.
+
+    With use_data_cache, the already preprocessed columns are read from the
+    Arrow cache (see data_cache.py) instead of parsing the CSV.
+    """
+    if use_data_cache:
+        df_mapped = load_preprocessed_data(data_path)
+    else:
+        # Load the raw dataset
+        df_raw = load_raw_data(data_path)
+
+        # Apply diagnosis mapping before splitting features and target
+        df_mapped = map_diagnosis_to_numerical(
+            df_raw.copy()
+        )  # Use a copy to avoid modifying original df_raw if it's used elsewhere
 
     # Prepare features (X) and target (y)
-    X, y = prepare_features_and_target(df_mapped)
+    return prepare_features_and_target(df_mapped)
+
+
+def load_train_test_split(
+    data_path="data/data.csv", random_state=42, use_data_cache=False
+):
+    """Loads the dataset and returns the 80/20 (X_train, X_test, y_train, y_test) split."""
+    X, y = load_features_and_target(data_path, use_data_cache)
 
     # Split data into train/test sets
+    return train_test_split(X, y, test_size=0.2, random_state=random_state)
+
+
+def holdout_split(model_path, X, y, random_state=42):
+    """The (X_train, X_test, y_train, y_test) split the saved model was evaluated on.
+
+    Uses the test rows recorded in the model's training state when it was
+    trained on exactly this data, otherwise the default 80/20 split.
+    """
+    state = load_training_state(model_path)
+    if state and appended_rows_start(state, X, y) == len(X):
+        test = np.zeros(len(X), dtype=bool)
+        test[state["test_rows"]] = True
+        return X[~test], X[test], y[~test], y[test]
+    return train_test_split(X, y, test_size=0.2, random_state=random_state)
+
+
+def save_pipeline(pipeline, model_path, compiled_model_path=None):
+    """Saves the pipeline with joblib (and optionally in the compiled NumPy format)."""
+    # Ensure the models directory exists
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+
+    # Save the trained pipeline using joblib
+    joblib.dump(pipeline, model_path)
+    print(f"Trained pipeline saved to {model_path}")
+
+    if compiled_model_path:
+        export_compiled_model(pipeline, compiled_model_path)
+        print(f"Compiled model saved to {compiled_model_path}")
+
+
+def model_attachments(model_path):
+    """Files saved with model_path (feature profile, model card) as register_model attachments."""
+    attachments = {
+        path(ARTIFACT_NAME): path(model_path)
+        for path in (profile_path, card_path, curves_path)
+    }
+    return {
+        name: source for name, source in attachments.items() if os.path.exists(source)
+    }
+
+
+def training_metadata(pipeline, data_path, metrics, training_seconds):
+    """Metadata recorded with a registered model version."""
+    return {
+        "data_path": data_path,
+        "data_fingerprint": source_fingerprint(data_path),
+        "metrics": metrics,
+        "hyperparameters": pipeline.named_steps["classifier"].get_params(),
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+        "training_seconds": round(training_seconds, 3),
+    }
+
+
+def train_and_save_pipeline(
+    data_path="data/data.csv",
+    model_path="models/model.joblib",
+    compiled_model_path=None,
+    use_data_cache=False,
+    registry_dir=None,
+    model_card=False,
+    classifier=None,
+):
+    """Orchestrates the training process: loads data, preprocesses, trains, and saves the pipeline.
+
+    If compiled_model_path is given, the trained pipeline is also exported to the
+    compiled NumPy format (see compiled_model.py). If registry_dir is given, it
+    is also registered (and activated) as a new version in that model registry.
+    Fingerprints of the dataset are saved next to the model, so a later
+    incremental_train_and_save_pipeline only has to learn from appended rows.
+    With model_card, the evaluation artifacts of model_card.py are saved too.
+    classifier replaces the default forest (see create_breast_cancer_pipeline).
+    """
+    X, y = load_features_and_target(data_path, use_data_cache)
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=0.2, random_state=42
     )
 
     # Create and train the pipeline
-    pipeline = create_breast_cancer_pipeline()
+    pipeline = create_breast_cancer_pipeline(classifier)
+    start = time.perf_counter()
     pipeline.fit(X_train, y_train)
+    training_seconds = time.perf_counter() - start
 
     # Evaluate the pipeline
     y_pred = pipeline.predict(X_test)
     accuracy = accuracy_score(y_test, y_pred)
     print(f"Pipeline Accuracy: {accuracy:.4f}")
 
-    # Ensure the models directory exists
-    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    save_pipeline(pipeline, model_path, compiled_model_path)
+    save_training_state(model_path, X, y, X.index.get_indexer(X_test.index))
+    save_feature_profile(pipeline, X_train, model_path)
+    if model_card:
+        save_model_card(model_path, X_test, y_test)
+    else:
+        # A card of the model this one replaces would describe the wrong model
+        remove_model_card(model_path)
+    if registry_dir:
+        register_model(
+            pipeline,
+            registry_dir,
+            training_metadata(
+                pipeline, data_path, {"accuracy": float(accuracy)}, training_seconds
+            ),
+            attachments=model_attachments(model_path),
+        )
 
-    # Save the trained pipeline using joblib
-    joblib.dump(pipeline, model_path)
-    print(f"Trained pipeline saved to {model_path}")
+
+def split_rows(X, y, random_state=42):
+    """80/20 split of (X, y); batches too small to split all go into training."""
+    if len(X) < MIN_ROWS_TO_SPLIT:
+        return X, X.iloc[:0], y, y.iloc[:0]
+    return train_test_split(X, y, test_size=0.2, random_state=random_state)
+
+
+def remap_thresholds(forest, old_scale, old_min, new_scale, new_min):
+    """Rewrites every split threshold of a fitted forest for new MinMaxScaler bounds.
+
+    Min-max scaling is linear and increasing per feature, so mapping each
+    threshold from the old scaled space to the new one leaves every tree's
+    decisions on the raw features unchanged.
+    """
+    for tree in forest.estimators_:
+        state = tree.tree_.__getstate__()
+        nodes = state["nodes"]
+        split = nodes["feature"] >= 0  # leaves have no feature
+        feature = nodes["feature"][split]
+        raw = (nodes["threshold"][split] - old_min[feature]) / old_scale[feature]
+        nodes["threshold"][split] = raw * new_scale[feature] + new_min[feature]
+        tree.tree_.__setstate__(state)
+
+
+def extend_scaler_ranges(pipeline, X):
+    """Widens the pipeline's MinMaxScaler bounds to cover X, if they do not already.
+
+    The existing trees are remapped to the new bounds (see remap_thresholds).
+    Returns True if the bounds changed.
+    """
+    preprocessor = pipeline.named_steps["preprocessor"]
+    scaler = preprocessor.named_steps["scaler"]
+    features = preprocessor.named_steps["drop_cols"].transform(X)
+    if (features.min().to_numpy() >= scaler.data_min_).all() and (
+        features.max().to_numpy() <= scaler.data_max_
+    ).all():
+        return False
+
+    old_scale, old_min = scaler.scale_.copy(), scaler.min_.copy()
+    scaler.partial_fit(features)  # running min/max over the old and new rows
+    remap_thresholds(
+        pipeline.named_steps["classifier"],
+        old_scale,
+        old_min,
+        scaler.scale_,
+        scaler.min_,
+    )
+    return True
+
+
+def incremental_train_and_save_pipeline(
+    data_path="data/data.csv",
+    model_path="models/model.joblib",
+    compiled_model_path=None,
+    use_data_cache=False,
+    registry_dir=None,
+    new_trees=None,
+    compare_full=True,
+    random_state=42,
+    model_card=False,
+):
+    """Updates the saved pipeline with the rows appended to the dataset since it was trained.
+
+    The row-block fingerprints saved with the model (see training_state.py)
+    show whether the dataset only grew. If so, the appended rows get their own
+    80/20 split, the MinMaxScaler bounds are widened only if the new rows fall
+    outside them, and `new_trees` trees (default: proportional to the share of
+    new training rows) are added to the forest with warm_start, fitted on the
+    combined training rows. Otherwise (no state, edited rows) this falls back
+    to train_and_save_pipeline, with the saved forest's hyperparameters
+    (e.g. those selected by search_and_save_pipeline) if there is a model.
+
+    With compare_full, a forest is also trained from scratch on the same split
+    and the report includes the accuracy difference, to tell when a full
+    rebuild is due. Returns the report dict.
+    """
+    X, y = load_features_and_target(data_path, use_data_cache)
+    state = load_training_state(model_path) if os.path.exists(model_path) else None
+    n_old = appended_rows_start(state, X, y) if state else None
+    if n_old is None:
+        print("Dataset is not an extension of the saved model's data; full retrain.")
+        classifier = None
+        if os.path.exists(model_path):
+            classifier = clone(joblib.load(model_path).named_steps["classifier"])
+        train_and_save_pipeline(
+            data_path,
+            model_path,
+            compiled_model_path,
+            use_data_cache,
+            registry_dir,
+            model_card,
+            classifier,
+        )
+        return {"mode": "full", "rows": len(X)}
+    if n_old == len(X):
+        print(f"No rows appended since the model was trained on {n_old} rows.")
+        return {"mode": "unchanged", "rows": n_old}
+
+    # Old rows keep their split; the appended rows are split on their own
+    old_test = np.zeros(n_old, dtype=bool)
+    old_test[state["test_rows"]] = True
+    X_new_train, X_new_test, y_new_train, y_new_test = split_rows(
+        X.iloc[n_old:], y.iloc[n_old:], random_state
+    )
+    X_train = pd.concat([X.iloc[:n_old][~old_test], X_new_train])
+    y_train = pd.concat([y.iloc[:n_old][~old_test], y_new_train])
+    X_test = pd.concat([X.iloc[:n_old][old_test], X_new_test])
+    y_test = pd.concat([y.iloc[:n_old][old_test], y_new_test])
+
+    # Loaded directly: the cached pipeline of get_pipeline must not be modified
+    pipeline = joblib.load(model_path)
+    forest = pipeline.named_steps["classifier"]
+    old_trees = len(forest.estimators_)
+    n_new_trees = new_trees or max(
+        1, math.ceil(old_trees * len(X_new_train) / len(X_train))
+    )
+
+    start = time.perf_counter()
+    scaler_refit = extend_scaler_ranges(pipeline, X_train)
+    forest.set_params(warm_start=True, n_estimators=old_trees + n_new_trees)
+    forest.fit(pipeline.named_steps["preprocessor"].transform(X_train), y_train)
+    forest.set_params(warm_start=False)
+    training_seconds = time.perf_counter() - start
+
+    accuracy = accuracy_score(y_test, pipeline.predict(X_test))
+    print(
+        f"Added {n_new_trees} trees for {len(X) - n_old} new rows "
+        f"in {training_seconds:.2f}s. Pipeline Accuracy: {accuracy:.4f}"
+    )
+    report = {
+        "mode": "incremental",
+        "rows": len(X),
+        "new_rows": len(X) - n_old,
+        "trees": old_trees + n_new_trees,
+        "new_trees": n_new_trees,
+        "scaler_refit": scaler_refit,
+        "training_seconds": round(training_seconds, 3),
+        "accuracy": float(accuracy),
+    }
+
+    if compare_full:
+        full_pipeline = create_breast_cancer_pipeline(clone(forest))
+        start = time.perf_counter()
+        full_pipeline.fit(X_train, y_train)
+        full_seconds = time.perf_counter() - start
+        full_accuracy = accuracy_score(y_test, full_pipeline.predict(X_test))
+        report["full_retrain_accuracy"] = float(full_accuracy)
+        report["full_retrain_seconds"] = round(full_seconds, 3)
+        report["accuracy_difference"] = float(accuracy - full_accuracy)
+        print(
+            f"Full retrain: accuracy {full_accuracy:.4f} in {full_seconds:.2f}s "
+            f"(incremental - full = {accuracy - full_accuracy:+.4f})"
+        )
+
+    save_pipeline(pipeline, model_path, compiled_model_path)
+    save_training_state(model_path, X, y, X.index.get_indexer(X_test.index))
+    save_feature_profile(pipeline, X_train, model_path)
+    if model_card:
+        save_model_card(model_path, X_test, y_test)
+    else:
+        remove_model_card(model_path)
+    if registry_dir:
+        metadata = training_metadata(
+            pipeline, data_path, {"accuracy": float(accuracy)}, training_seconds
+        )
+        register_model(
+            pipeline,
+            registry_dir,
+            {**metadata, "incremental": report},
+            attachments=model_attachments(model_path),
+        )
+    return report
+
+
+def search_and_save_pipeline(
+    data_path="data/data.csv",
+    model_path="models/model.joblib",
+    strategy="random",
+    n_iter=30,
+    cv=5,
+    n_jobs=-1,
+    scoring="roc_auc",
+    random_state=42,
+    report_path=None,
+    compiled_model_path=None,
+    use_data_cache=False,
+    registry_dir=None,
+    model_card=False,
+):
+    """Selects forest hyperparameters with stratified k-fold CV, then saves the best pipeline.
+
+    The search runs in parallel on n_jobs cores (-1 uses all of them) and is
+    reproducible for a fixed random_state. A JSON report with the best
+    parameters, CV scores of the top candidates and the hold-out accuracy is
+    written to report_path (default: next to the model, *.search.json). The
+    training state is saved as in train_and_save_pipeline, so a later
+    incremental run extends the tuned forest. With registry_dir, the best
+    pipeline is also registered as a new version.
+    """
+    X, y = load_features_and_target(data_path, use_data_cache)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
+
+    search = create_hyperparameter_search(
+        strategy=strategy,
+        n_iter=n_iter,
+        cv=cv,
+        n_jobs=n_jobs,
+        scoring=scoring,
+        random_state=random_state,
+    )
+    start = time.perf_counter()
+    search.fit(X_train, y_train)
+    search_seconds = time.perf_counter() - start
+
+    # The search refits the best candidate on the whole training split
+    pipeline = search.best_estimator_
+    accuracy = accuracy_score(y_test, pipeline.predict(X_test))
+    print(f"Best CV {scoring}: {search.best_score_:.4f} with {search.best_params_}")
+    print(f"Pipeline Accuracy: {accuracy:.4f}")
+
+    save_pipeline(pipeline, model_path, compiled_model_path)
+    save_training_state(model_path, X, y, X.index.get_indexer(X_test.index))
+    save_feature_profile(pipeline, X_train, model_path)
+    if model_card:
+        save_model_card(model_path, X_test, y_test)
+    else:
+        remove_model_card(model_path)
+
+    results = search.cv_results_
+    ranked = sorted(
+        range(len(results["params"])), key=lambda i: results["rank_test_score"][i]
+    )
+    report = {
+        "strategy": strategy,
+        "scoring": scoring,
+        "cv_folds": cv,
+        "n_candidates": len(results["params"]),
+        "n_jobs": n_jobs,
+        "random_state": random_state,
+        "search_seconds": round(search_seconds, 3),
+        "best_params": search.best_params_,
+        "best_cv_score": float(search.best_score_),
+        "holdout_accuracy": float(accuracy),
+        "top_candidates": [
+            {
+                "rank": int(results["rank_test_score"][i]),
+                "mean_cv_score": float(results["mean_test_score"][i]),
+                "std_cv_score": float(results["std_test_score"][i]),
+                "params": results["params"][i],
+            }
+            for i in ranked[:10]
+        ],
+    }
+    report_path = report_path or os.path.splitext(model_path)[0] + ".search.json"
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"Search report saved to {report_path}")
+
+    if registry_dir:
+        metrics = {
+            "accuracy": float(accuracy),
+            f"cv_{scoring}": float(search.best_score_),
+        }
+        register_model(
+            pipeline,
+            registry_dir,
+            training_metadata(pipeline, data_path, metrics, search_seconds),
+            attachments=model_attachments(model_path),
+        )
+    return report
 
 
 if __name__ == "__main__":
-    train_and_save_pipeline()
+    parser = argparse.ArgumentParser(description="Train the breast cancer pipeline.")
+    parser.add_argument("--data-path", default="data/data.csv")
+    parser.add_argument("--model-path", default="models/model.joblib")
+    parser.add_argument(
+        "--search",
+        choices=["random", "halving"],
+        help="Select hyperparameters with a randomized or successive-halving search.",
+    )
+    parser.add_argument("--n-iter", type=int, default=30)
+    parser.add_argument("--cv", type=int, default=5)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--scoring", default="roc_auc")
+    parser.add_argument("--random-state", type=int, default=42)
+    parser.add_argument(
+        "--use-data-cache",
+        action="store_true",
+        help="Read the preprocessed data from the Arrow cache (see data_cache.py).",
+    )
+    parser.add_argument(
+        "--registry-dir",
+        help="Also register the trained pipeline as the current version of this registry.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only learn from rows appended since the saved model was trained.",
+    )
+    parser.add_argument(
+        "--new-trees",
+        type=int,
+        help="Trees added in incremental mode (default: proportional to the new rows).",
+    )
+    parser.add_argument(
+        "--no-compare",
+        action="store_true",
+        help="In incremental mode, skip the full retrain used for comparison.",
+    )
+    parser.add_argument(
+        "--model-card",
+        action="store_true",
+        help="Also save the model card (metrics, curves, importances) next to the model.",
+    )
+    args = parser.parse_args()
+
+    if args.incremental:
+        report = incremental_train_and_save_pipeline(
+            data_path=args.data_path,
+            model_path=args.model_path,
+            use_data_cache=args.use_data_cache,
+            registry_dir=args.registry_dir,
+            new_trees=args.new_trees,
+            compare_full=not args.no_compare,
+            model_card=args.model_card,
+        )
+        print(json.dumps(report, indent=2))
+    elif args.search:
+        search_and_save_pipeline(
+            data_path=args.data_path,
+            model_path=args.model_path,
+            strategy=args.search,
+            n_iter=args.n_iter,
+            cv=args.cv,
+            n_jobs=args.n_jobs,
+            scoring=args.scoring,
+            random_state=args.random_state,
+            use_data_cache=args.use_data_cache,
+            registry_dir=args.registry_dir,
+            model_card=args.model_card,
+        )
+    else:
+        train_and_save_pipeline(
+            data_path=args.data_path,
+            model_path=args.model_path,
+            use_data_cache=args.use_data_cache,
+            registry_dir=args.registry_dir,
+            model_card=args.model_card,
+        )
@@ -2,12 +2,22 @@ from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import FunctionTransformer
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import (
+    HalvingRandomSearchCV,
+    RandomizedSearchCV,
+    StratifiedKFold,
+)
 
 from .data_preprocessing import drop_unnecessary_columns
 
 
-def create_breast_cancer_pipeline():
-    """Creates and returns a scikit-learn pipeline for breast cancer prediction."""
+def create_breast_cancer_pipeline(classifier=None):
+    """Creates and returns a scikit-learn pipeline for breast cancer prediction.
+
+    classifier is an unfitted estimator to use instead of the default forest
+    (e.g. a clone of a tuned model's forest).
+    """
 
     # Define preprocessing steps
     preprocessing_pipeline = Pipeline(
@@ -20,11 +30,55 @@ def create_breast_cancer_pipeline():
         ]
     )
 
+    if classifier is None:
+        classifier = RandomForestClassifier(random_state=42)
+
     # Combine preprocessing and model into a full pipeline
     full_pipeline = Pipeline(
         [
             ("preprocessor", preprocessing_pipeline),
-            ("classifier", RandomForestClassifier(random_state=42)),
+            ("classifier", classifier),
         ]
     )
     return full_pipeline
+
+
+# Search space for the forest, keyed by pipeline parameter names
+FOREST_PARAM_DISTRIBUTIONS = {
+    "classifier__n_estimators": [100, 200, 300, 500],
+    "classifier__max_depth": [None, 4, 6, 8, 12, 16],
+    "classifier__min_samples_split": [2, 4, 8],
+    "classifier__min_samples_leaf": [1, 2, 4],
+    "classifier__max_features": ["sqrt", "log2", 0.5],
+    "classifier__bootstrap": [True, False],
+    "classifier__class_weight": [None, "balanced"],
+}
+
+
+def create_hyperparameter_search(
+    strategy="random", n_iter=30, cv=5, n_jobs=-1, scoring="roc_auc", random_state=42
+):
+    """Creates a randomized or successive-halving search over the forest hyperparameters.
+
+    Candidates are scored with shuffled stratified k-fold CV and evaluated in
+    parallel on n_jobs cores. Fixing random_state makes the sampled candidates,
+    the folds and the forests reproducible.
+    """
+    folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state)
+    common = dict(
+        estimator=create_breast_cancer_pipeline(),
+        param_distributions=FOREST_PARAM_DISTRIBUTIONS,
+        cv=folds,
+        scoring=scoring,
+        n_jobs=n_jobs,
+        random_state=random_state,
+        refit=True,
+    )
+    if strategy == "random":
+        return RandomizedSearchCV(n_iter=n_iter, **common)
+    if strategy == "halving":
+        # Starts all n_iter candidates on a subset of rows and keeps the best third
+        return HalvingRandomSearchCV(n_candidates=n_iter, factor=3, **common)
+    raise ValueError(
+        f"Unknown search strategy '{strategy}'. Use 'random' or 'halving'."
+    )
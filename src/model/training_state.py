@@ -0,0 +1,74 @@
+"""Fingerprints of the dataset a saved pipeline was trained on.
+
+The ingested rows (features and target, in file order) are hashed in blocks
+of block_rows rows and stored next to the model as <model>.state.json. When
+the dataset is loaded again, re-hashing the same number of rows tells whether
+the old rows are unchanged, i.e. whether new rows were only appended, which
+is what incremental retraining needs (see model_training.py). The positions
+of the held-out test rows are stored too.
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+DEFAULT_BLOCK_ROWS = 256
+
+
+def block_fingerprints(X, y, block_rows=DEFAULT_BLOCK_ROWS):
+    """Returns a short sha256 of every block of block_rows rows of (X, y)."""
+    row_hashes = pd.util.hash_pandas_object(
+        pd.concat([X, y], axis=1), index=False
+    ).to_numpy()
+    return [
+        hashlib.sha256(row_hashes[start : start + block_rows].tobytes()).hexdigest()[
+            :16
+        ]
+        for start in range(0, len(row_hashes), block_rows)
+    ]
+
+
+def state_path(model_path):
+    return os.path.splitext(model_path)[0] + ".state.json"
+
+
+def save_training_state(model_path, X, y, test_rows, block_rows=DEFAULT_BLOCK_ROWS):
+    """Records the row count, columns and block fingerprints of the training dataset.
+
+    test_rows are the positions of the rows held out for evaluation, so later
+    runs keep evaluating on rows the model never saw.
+    """
+    state = {
+        "n_rows": len(X),
+        "columns": list(X.columns),
+        "test_rows": sorted(int(row) for row in test_rows),
+        "block_rows": block_rows,
+        "blocks": block_fingerprints(X, y, block_rows),
+    }
+    with open(f"{state_path(model_path)}.tmp", "w") as f:
+        json.dump(state, f)
+    os.replace(f"{state_path(model_path)}.tmp", state_path(model_path))
+
+
+def load_training_state(model_path):
+    """The state saved with the model at model_path, or None."""
+    try:
+        with open(state_path(model_path)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def appended_rows_start(state, X, y):
+    """Returns how many leading rows of (X, y) are the unchanged training rows of state.
+
+    Returns None if any of those rows (or the columns) changed, in which case
+    the dataset was not just appended to.
+    """
+    n_rows = state["n_rows"]
+    if len(X) < n_rows or list(X.columns) != state["columns"]:
+        return None
+    blocks = block_fingerprints(X.iloc[:n_rows], y.iloc[:n_rows], state["block_rows"])
+    return n_rows if blocks == state["blocks"] else None
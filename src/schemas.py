@@ -39,3 +39,9 @@ class PredictRequest(BaseModel):
         "extra": "forbid",  # reject unknown fields
         "populate_by_name": True,  # allow passing pythonic names, but we’ll output aliases
     }
+
+
+# Feature names in schema order, as the trained pipeline sees them (aliases where set)
+FEATURE_NAMES = [
+    field.alias or name for name, field in PredictRequest.model_fields.items()
+]
@@ -0,0 +1,108 @@
+import numpy as np
+from pydantic import TypeAdapter, ValidationError
+
+from src.schemas import FEATURE_NAMES, PredictRequest
+
+# Validates a whole list of records in one pydantic call
+batch_adapter = TypeAdapter(list[PredictRequest])
+
+# Larger ints take the schema path: a float cannot hold them exactly (or at
+# all, past ~1.8e308), and the schema rejects those it cannot convert
+MAX_FAST_INT = 2**53
+
+
+class FeatureDecoder:
+    """Decodes a /predict JSON object straight into a float64 feature row.
+
+    The column order is fixed when the decoder is built (once per model load).
+    Well-formed payloads, i.e. exactly the 30 aliased fields as non-negative
+    int/float values (ints up to MAX_FAST_INT), are copied directly into a preallocated row without
+    constructing a pydantic model. Anything else (pythonic field names,
+    strings, booleans, NaN, negatives, missing or extra fields) falls back to
+    PredictRequest.model_validate, so coercion and 422 error details are
+    exactly those of src/schemas.py.
+    """
+
+    def __init__(self, feature_names):
+        self.feature_names = list(feature_names)
+        self._expected_keys = frozenset(FEATURE_NAMES)
+        # (alias, column) pairs; features outside the schema (e.g. 'id') stay 0
+        self._positions = [
+            (name, column)
+            for column, name in enumerate(self.feature_names)
+            if name in self._expected_keys
+        ]
+
+    def decode(self, data):
+        """Returns a (1, n_features) float64 row; raises pydantic.ValidationError if invalid."""
+        row = np.zeros((1, len(self.feature_names)), dtype=np.float64)
+        values = row[0]
+
+        if isinstance(data, dict) and data.keys() == self._expected_keys:
+            for name, column in self._positions:
+                value = data[name]
+                # type() rather than isinstance() so bools take the slow path
+                if (
+                    type(value) is float
+                    or (type(value) is int and value <= MAX_FAST_INT)
+                ) and value >= 0:
+                    values[column] = value
+                else:
+                    break
+            else:
+                return row
+
+        payload = PredictRequest.model_validate(data).model_dump(by_alias=True)
+        for name, column in self._positions:
+            values[column] = payload[name]
+        return row
+
+    def decode_many(self, records):
+        """Decodes a list of /predict objects into an (n_records, n_features) float64 matrix.
+
+        Returns (matrix, row_errors). Records in the fast-path shape (floats
+        of any sign or magnitude, ints within +-MAX_FAST_INT) are copied
+        without pydantic; their numeric checks are left to src/validation.py.
+        All other records go through the schema in one call; the rows of those
+        it rejects stay 0 and their errors (with the row index stripped from
+        "loc") are in row_errors.
+        """
+        matrix = np.zeros((len(records), len(self.feature_names)), dtype=np.float64)
+        names = [name for name, _ in self._positions]
+        columns = [column for _, column in self._positions]
+
+        fast_indices, fast_values, slow_indices = [], [], []
+        for index, record in enumerate(records):
+            if isinstance(record, dict) and record.keys() == self._expected_keys:
+                values = [record[name] for name in names]
+                # type() rather than isinstance() so bools take the slow path
+                if all(
+                    type(value) is float
+                    or (type(value) is int and -MAX_FAST_INT <= value <= MAX_FAST_INT)
+                    for value in values
+                ):
+                    fast_indices.append(index)
+                    fast_values.append(values)
+                    continue
+            slow_indices.append(index)
+        if fast_indices:
+            matrix[np.ix_(fast_indices, columns)] = fast_values
+
+        row_errors = {}
+        if slow_indices:
+            slow_records = [records[i] for i in slow_indices]
+            try:
+                payloads = batch_adapter.validate_python(slow_records)
+                valid = slow_indices
+            except ValidationError as e:
+                for error in e.errors():
+                    position, *loc = error["loc"]
+                    row_errors.setdefault(slow_indices[position], []).append(
+                        {**error, "loc": tuple(loc)}
+                    )
+                valid = [i for i in slow_indices if i not in row_errors]
+                payloads = batch_adapter.validate_python([records[i] for i in valid])
+            for index, payload in zip(valid, payloads):
+                dumped = payload.model_dump(by_alias=True)
+                matrix[index, columns] = [dumped[name] for name in names]
+        return matrix, row_errors
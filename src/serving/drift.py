@@ -0,0 +1,143 @@
+import threading
+
+import numpy as np
+
+# Proportion used in place of empty bins, so the PSI stays finite
+PSI_EPSILON = 1e-4
+
+# PSI above which a feature is reported as drifted (a common rule of thumb)
+PSI_DRIFT_THRESHOLD = 0.2
+
+
+class DriftMonitor:
+    """Constant-memory summaries of live feature values, compared with a training profile.
+
+    For every profiled feature it keeps a histogram over the reference bins
+    (a fixed-size quantile sketch), a running mean and variance (Welford /
+    Chan updates) and the number of values below the scaler's data_min_ or
+    above its data_max_. An update touches only these fixed-size arrays, so it
+    costs the same however many requests were seen. See
+    src/model/feature_profile.py for the reference profile.
+    """
+
+    def __init__(self, profile, feature_names, min_samples=100):
+        self.profile = profile
+        self.min_samples = min_samples
+        self.features = profile["features"]
+        # Columns of the request rows (in feature_names order) that were profiled
+        self.columns = np.array([feature_names.index(f) for f in self.features])
+
+        # Ragged per-feature bin edges, padded with +inf to one (features, edges) array
+        width = max(len(edges) for edges in profile["bin_edges"])
+        self.edges = np.full((len(self.features), width), np.inf)
+        for i, edges in enumerate(profile["bin_edges"]):
+            self.edges[i, : len(edges)] = edges
+        self.reference = np.zeros((len(self.features), width + 1))
+        for i, proportions in enumerate(profile["bin_proportions"]):
+            self.reference[i, : len(proportions)] = proportions
+        self.data_min = np.array(profile["data_min"])
+        self.data_max = np.array(profile["data_max"])
+
+        self.n = 0
+        self.mean = np.zeros(len(self.features))
+        self.m2 = np.zeros(len(self.features))
+        self.counts = np.zeros_like(self.reference, dtype=np.int64)
+        self._offsets = np.arange(len(self.features)) * self.counts.shape[1]
+        self.below = np.zeros(len(self.features), dtype=np.int64)
+        self.above = np.zeros(len(self.features), dtype=np.int64)
+        self._lock = threading.Lock()
+
+    def update(self, rows):
+        """Adds a (n_rows, n_features) float64 matrix of request rows."""
+        values = rows[:, self.columns]
+        n_new = len(values)
+        if n_new == 0:
+            return
+        # Bin index per value, flattened to one counter per (feature, bin)
+        bins = (values[:, :, None] > self.edges[None]).sum(axis=2) + self._offsets
+        bin_counts = np.bincount(bins.ravel(), minlength=self.counts.size)
+        batch_mean = values.sum(axis=0) / n_new
+        # A single row (the /predict case) has no spread of its own
+        batch_m2 = ((values - batch_mean) ** 2).sum(axis=0) if n_new > 1 else 0.0
+        below = (values < self.data_min).sum(axis=0)
+        above = (values > self.data_max).sum(axis=0)
+
+        with self._lock:
+            # Chan et al.: merge the batch's mean and M2 into the running ones
+            total = self.n + n_new
+            delta = batch_mean - self.mean
+            self.mean += delta * n_new / total
+            self.m2 += batch_m2 + delta**2 * self.n * n_new / total
+            self.n = total
+            self.counts += bin_counts.reshape(self.counts.shape)
+            self.below += below
+            self.above += above
+
+    def report(self):
+        """Per-feature live summaries next to the reference, with PSI drift scores."""
+        with self._lock:
+            n = self.n
+            mean, m2 = self.mean.copy(), self.m2.copy()
+            counts = self.counts.copy()
+            below, above = self.below.copy(), self.above.copy()
+
+        features = {}
+        drifted = []
+        levels = self.profile["quantile_levels"]
+        for i, name in enumerate(self.features):
+            entry = {
+                "reference_mean": self.profile["mean"][i],
+                "reference_std": self.profile["std"][i],
+                "out_of_range_low": int(below[i]),
+                "out_of_range_high": int(above[i]),
+            }
+            if n:
+                std = float(np.sqrt(m2[i] / n))
+                live = counts[i] / n
+                expected = np.maximum(self.reference[i], PSI_EPSILON)
+                observed = np.maximum(live, PSI_EPSILON)
+                psi = float(((observed - expected) * np.log(observed / expected)).sum())
+                entry.update(
+                    {
+                        "mean": float(mean[i]),
+                        "std": std,
+                        "out_of_range_rate": float((below[i] + above[i]) / n),
+                        "psi": psi,
+                        "quantiles": dict(
+                            zip(map(str, levels), self._live_quantiles(i, counts[i]))
+                        ),
+                        "reference_quantiles": dict(
+                            zip(map(str, levels), self.profile["quantiles"][i])
+                        ),
+                    }
+                )
+                if n >= self.min_samples and psi > PSI_DRIFT_THRESHOLD:
+                    drifted.append(name)
+            features[name] = entry
+
+        return {
+            "n_samples": n,
+            "reference_rows": self.profile["n_rows"],
+            "min_samples": self.min_samples,
+            "psi_threshold": PSI_DRIFT_THRESHOLD,
+            "drifted_features": drifted,
+            "features": features,
+        }
+
+    def _live_quantiles(self, i, counts):
+        """Approximate quantiles of feature i from its live histogram.
+
+        Values are interpolated linearly within a bin; the open-ended outer
+        bins are bounded by the scaler's data_min_/data_max_ (or the nearest
+        edge, if that lies beyond them).
+        """
+        edges = self.edges[i][np.isfinite(self.edges[i])]
+        lower = min(self.data_min[i], edges[0]) if len(edges) else self.data_min[i]
+        upper = max(self.data_max[i], edges[-1]) if len(edges) else self.data_max[i]
+        bounds = np.concatenate([[lower], edges, [upper]])
+        used = counts[: len(edges) + 1]
+        cumulative = np.concatenate([[0.0], np.cumsum(used) / used.sum()])
+        return [
+            float(np.interp(level, cumulative, bounds))
+            for level in self.profile["quantile_levels"]
+        ]
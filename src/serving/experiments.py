@@ -0,0 +1,199 @@
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.model.model_inference import as_model_input, predict_with_proba
+
+# Name under which the primary model is reported
+PRIMARY = "primary"
+
+
+class ExperimentStats:
+    """Bounded, per-model record of latencies and disagreements with the served model.
+
+    Only the last max_records observations per model are kept, so memory stays
+    constant however long the experiment runs.
+    """
+
+    def __init__(self, max_records=10_000):
+        self.max_records = max_records
+        self._latencies = {}
+        self._comparisons = {}
+        self._lock = threading.Lock()
+
+    def _buffer(self, buffers, name):
+        buffer = buffers.get(name)
+        if buffer is None:
+            buffer = buffers[name] = deque(maxlen=self.max_records)
+        return buffer
+
+    def record_latency(self, name, seconds):
+        with self._lock:
+            self._buffer(self._latencies, name).append(seconds)
+
+    def record_comparison(self, name, disagrees, proba_diff):
+        with self._lock:
+            self._buffer(self._comparisons, name).append((disagrees, proba_diff))
+
+    def summary(self):
+        """Per model: latency percentiles and, for compared models, disagreement rate."""
+        with self._lock:
+            latencies = {name: list(values) for name, values in self._latencies.items()}
+            comparisons = {
+                name: list(values) for name, values in self._comparisons.items()
+            }
+
+        summary = {}
+        for name in sorted(latencies.keys() | comparisons.keys()):
+            entry = {}
+            if latencies.get(name):
+                seconds = np.array(latencies[name])
+                entry["latency_ms"] = {
+                    "n": len(seconds),
+                    "mean": float(seconds.mean() * 1e3),
+                    "p50": float(np.percentile(seconds, 50) * 1e3),
+                    "p99": float(np.percentile(seconds, 99) * 1e3),
+                }
+            if comparisons.get(name):
+                disagrees, proba_diff = np.array(comparisons[name]).T
+                entry["compared"] = len(disagrees)
+                entry["disagreement_rate"] = float(disagrees.mean())
+                entry["mean_abs_probability_diff"] = float(proba_diff.mean())
+            summary[name] = entry
+        return summary
+
+
+class Experiments:
+    """Routes /predict traffic between a primary and canary models and runs shadows.
+
+    Each request is served by a canary with probability equal to its weight,
+    otherwise by the primary. Shadow models score the same request in a
+    background thread pool and are compared with the served result; requests
+    served by a canary are also re-scored by the primary in the background, so
+    canaries get a disagreement rate too. Background work is dropped (and
+    counted) when more than max_pending jobs are queued, so shadows can never
+    slow down or back up the request path.
+    """
+
+    def __init__(
+        self,
+        canaries=(),
+        shadows=(),
+        workers=2,
+        max_pending=100,
+        max_records=10_000,
+    ):
+        self.canaries = list(canaries)  # (name, holder, weight)
+        self.shadows = list(shadows)  # (name, holder)
+        self.workers = workers
+        self.max_pending = max_pending
+        self.stats = ExperimentStats(max_records)
+        self.dropped = 0
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._executor = None
+        if sum(weight for _, _, weight in self.canaries) > 1:
+            raise ValueError("Canary weights must add up to at most 1.")
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    @property
+    def enabled(self):
+        return bool(self.canaries or self.shadows)
+
+    def _reset_after_fork(self):
+        # Worker threads do not survive fork; the pool is recreated on first use
+        self._executor = None
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+    def choose(self, primary):
+        """Returns (name, loaded snapshot) of the model that serves this request.
+
+        primary is the primary model's snapshot; canaries without a loaded
+        model fall back to it.
+        """
+        draw = random.random()
+        for name, holder, weight in self.canaries:
+            draw -= weight
+            if draw < 0:
+                if holder.current is not None:
+                    return name, holder.current
+                break
+        return PRIMARY, primary
+
+    def compare_in_background(self, served_name, data, labels, proba, primary):
+        """Queues the shadow (and, for canary traffic, primary) comparisons of a request.
+
+        data is the request payload, which every model decodes with its own
+        feature order; labels and proba are the served model's outputs.
+        """
+        # (name, snapshot, whether its latency is recorded)
+        others = [(name, holder.current, True) for name, holder in self.shadows]
+        if served_name != PRIMARY:
+            # Reported under the canary's name: how often the canary differs
+            others.append((served_name, primary, False))
+        others = [entry for entry in others if entry[1] is not None]
+        if not others:
+            return
+        with self._pending_lock:
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                return
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="shadow"
+                )
+        self._executor.submit(self._compare, others, data, labels, proba)
+
+    def _compare(self, others, data, labels, proba):
+        try:
+            for name, loaded, timed in others:
+                start = time.perf_counter()
+                row = loaded.decoder.decode(data)
+                other_labels, other_proba = predict_with_proba(
+                    loaded.pipeline,
+                    as_model_input(loaded.pipeline, row, loaded.feature_names),
+                )
+                if timed:
+                    self.stats.record_latency(name, time.perf_counter() - start)
+                self.stats.record_comparison(
+                    name,
+                    bool(other_labels[0] != labels[0]),
+                    float(np.abs(other_proba[0] - proba[0]).max()),
+                )
+        except Exception as e:
+            logging.warning(f"Shadow comparison failed: {e}")
+        finally:
+            with self._pending_lock:
+                self._pending -= 1
+
+    def summary(self):
+        return {
+            "canaries": {name: weight for name, _, weight in self.canaries},
+            "shadows": [name for name, _ in self.shadows],
+            "dropped_comparisons": self.dropped,
+            "models": self.stats.summary(),
+        }
+
+
+def parse_models(spec):
+    """Parses a comma-separated list of model paths (or registry versions)."""
+    return [entry.strip() for entry in (spec or "").split(",") if entry.strip()]
+
+
+def parse_weighted_models(spec):
+    """Parses "a=0.1,b=0.05" into [("a", 0.1), ("b", 0.05)]."""
+    weighted = []
+    for entry in parse_models(spec):
+        name, _, weight = entry.rpartition("=")
+        if not name:
+            raise ValueError(f"Expected <model>=<weight>, got {entry!r}.")
+        weighted.append((name, float(weight)))
+    return weighted
@@ -0,0 +1,184 @@
+"""Non-blocking JSON logging for the API.
+
+Request handlers only put log records on an in-memory queue (QueueHandler); a
+background QueueListener thread formats them and writes them to stdout and a
+size-rotated log file. Per-request info lines go through REQUEST_LOGGER and
+are sampled, while warnings and errors are always kept.
+
+Rotation is only safe with one writer per file, so processes forked after
+configure_logging() (gunicorn workers of a preloaded app) write to a file of
+their own, with their pid before the extension (see worker_log_file).
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+
+# Logger for the per-request info lines (hits, successful predictions) that are sampled
+REQUEST_LOGGER = "api.requests"
+
+# Listener started by the last configure_logging() call
+_listener = None
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, including any `extra=` fields."""
+
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that queues records unformatted, so JsonFormatter sees their fields.
+
+    The default prepare() replaces the message with the formatted line
+    (traceback included) and drops exc_info. Here only the message arguments
+    are merged, and the traceback is rendered to exc_text, since exc_info
+    holds live frames that should not cross to the listener thread.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or self.formatter.formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        return record
+
+
+class RequestSampler(logging.Filter):
+    """Keeps a `rate` fraction of the INFO-and-below records from REQUEST_LOGGER.
+
+    Records from other loggers and warnings or errors always pass.
+    """
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.name != REQUEST_LOGGER or record.levelno > logging.INFO:
+            return True
+        return self.rate >= 1 or random.random() < self.rate
+
+
+def worker_log_file(log_file, pid):
+    """The log file of process pid: api_logs.log becomes api_logs.<pid>.log."""
+    root, ext = os.path.splitext(log_file)
+    return f"{root}.{pid}{ext}"
+
+
+def build_handlers(log_file, max_bytes, backup_count):
+    """JSON stdout handler, plus a rotating file handler unless log_file is empty."""
+    formatter = JsonFormatter()
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.append(
+            logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=max_bytes, backupCount=backup_count, delay=True
+            )
+        )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def configure_logging(
+    log_file="api_logs.log",
+    max_bytes=10 * 1024 * 1024,
+    backup_count=5,
+    sample_rate=1.0,
+    level=logging.INFO,
+):
+    """Routes the root logger through a queue to JSON stdout and rotating file handlers.
+
+    Replaces any handlers already on the root logger (stopping a listener from a
+    previous call) and returns the started QueueListener. An empty log_file
+    disables the file handler. The listener thread does not survive fork, so
+    forked children (gunicorn workers of a preloaded app) start a new one,
+    writing to worker_log_file(log_file, pid) instead of the parent's file.
+    Queued records are flushed at interpreter exit.
+    """
+    global _listener
+    queue_handler = StructuredQueueHandler(queue.SimpleQueue())
+    queue_handler.setFormatter(JsonFormatter())
+    # Sample in the request thread, before the record is queued
+    queue_handler.addFilter(RequestSampler(sample_rate))
+    listener = logging.handlers.QueueListener(
+        queue_handler.queue,
+        *build_handlers(log_file, max_bytes, backup_count),
+        respect_handler_level=True,
+    )
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    stop_logging()
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener.start()
+    _listener = listener
+
+    def restart_in_child():
+        global _listener
+        if queue_handler not in logging.getLogger().handlers:
+            return  # Replaced by a later configure_logging() call
+        child_file = worker_log_file(log_file, os.getpid()) if log_file else ""
+        _listener = logging.handlers.QueueListener(
+            queue.SimpleQueue(),
+            *build_handlers(child_file, max_bytes, backup_count),
+            respect_handler_level=True,
+        )
+        queue_handler.queue = _listener.queue
+        _listener.start()
+
+    os.register_at_fork(after_in_child=restart_in_child)
+    return listener
+
+
+def stop_logging():
+    """Flushes queued records and stops the listener started by configure_logging()."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,217 @@
+"""In-process request metrics rendered in the Prometheus text exposition format.
+
+Metrics live in the memory of the process that records them, so with several
+gunicorn workers each scrape of /metrics reports the worker that answered it.
+"""
+
+import bisect
+import threading
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+
+
+def format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base class: a named family of samples keyed by label values."""
+
+    type = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """Yields (suffix, label values, extra labels, value) tuples."""
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield "", key, (), value
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for suffix, key, extra, value in self.samples():
+            labels = format_labels(self.labelnames, key, extra)
+            lines.append(f"{self.name}{suffix}{labels} {format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    type = "gauge"
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Timer:
+    """Context manager that observes its elapsed wall time into a histogram."""
+
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+class Histogram(Metric):
+    """Distribution of observations in fixed cumulative buckets, plus sum and count."""
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, the last one is +Inf; then sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def time(self, **labels):
+        """Returns a context manager that observes the duration of its block."""
+        return Timer(self, labels)
+
+    def get_count(self, **labels):
+        state = self._values.get(self._key(labels))
+        return sum(state[0]) if state else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted(
+                (key, (list(counts), total))
+                for key, (counts, total) in self._values.items()
+            )
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield "_bucket", key, (("le", format_value(float(bound))),), cumulative
+            yield "_sum", key, (), total
+            yield "_count", key, (), cumulative
+
+
+class Registry:
+    """Collection of metrics exposed together."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Returns every metric in the Prometheus text exposition format (0.0.4)."""
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+# Content type of the text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REQUESTS_TOTAL = REGISTRY.register(
+    Counter(
+        "api_requests_total",
+        "HTTP requests handled, by endpoint, method and status code.",
+        ("endpoint", "method", "status"),
+    )
+)
+REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        "api_request_duration_seconds",
+        "End-to-end request latency, by endpoint.",
+        ("endpoint",),
+    )
+)
+STAGE_DURATION = REGISTRY.register(
+    Histogram(
+        "api_stage_duration_seconds",
+        "Latency of the individual request handling stages, by endpoint and stage.",
+        ("endpoint", "stage"),
+    )
+)
+IN_FLIGHT = REGISTRY.register(
+    Gauge(
+        "api_requests_in_flight",
+        "Requests currently being handled, by endpoint.",
+        ("endpoint",),
+    )
+)
+MODEL_LOAD_DURATION = REGISTRY.register(
+    Histogram(
+        "model_load_duration_seconds",
+        "Time to load, smoke-test and activate a model.",
+        buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+    )
+)
+MODEL_LOADS_TOTAL = REGISTRY.register(
+    Counter(
+        "model_loads_total",
+        "Model load attempts, by result (success or failure).",
+        ("result",),
+    )
+)
@@ -0,0 +1,90 @@
+import asyncio
+
+import numpy as np
+
+from src.model.model_inference import as_model_input, predict_with_proba
+
+
+class MicroBatcher:
+    """Groups concurrent single-row predictions into one vectorized predict_proba call.
+
+    Callers await predict() with a decoded feature row. A background task
+    collects the rows that arrive within max_wait_ms of the first one (or until
+    max_batch_size rows are queued), runs the forest once for the whole group
+    in a worker thread, and resolves every caller's future with its own row.
+    While a batch is being scored, new rows queue up for the next one.
+    """
+
+    def __init__(self, max_batch_size=64, max_wait_ms=2.0):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        """Starts the batching task on the running event loop."""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancels the batching task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def predict(self, loaded, row):
+        """Returns (label, probabilities) for one (1, n_features) row of `loaded`'s model."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((loaded, row, future))
+        return await future
+
+    async def _collect(self):
+        """Waits for one request, then gathers more until the window or batch is full."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Rows decoded for different model snapshots (around a hot reload)
+            # are scored separately, each with the model it was decoded for
+            groups = {}
+            for item in batch:
+                groups.setdefault(id(item[0]), []).append(item)
+            for items in groups.values():
+                loaded = items[0][0]
+                input_df = as_model_input(
+                    loaded.pipeline,
+                    np.vstack([row for _, row, _ in items]),
+                    loaded.feature_names,
+                )
+                try:
+                    labels, proba = await loop.run_in_executor(
+                        None, predict_with_proba, loaded.pipeline, input_df
+                    )
+                except Exception as e:
+                    for _, _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for i, (_, _, future) in enumerate(items):
+                    if not future.done():
+                        future.set_result((labels[i], proba[i]))
@@ -0,0 +1,251 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+
+from src.model.feature_profile import load_feature_profile
+from src.model.model_card import load_model_card
+from src.model.model_inference import (
+    artifact_files,
+    artifact_signature,
+    as_model_input,
+    get_pipeline,
+    predict_with_proba,
+)
+from src.model.model_registry import resolve_version
+from src.schemas import FEATURE_NAMES
+from src.serving.decoding import FeatureDecoder
+from src.serving.drift import DriftMonitor
+from src.validation import MatrixValidator, plausible_ranges
+from src.serving.metrics import MODEL_LOAD_DURATION, MODEL_LOADS_TOTAL
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """Immutable snapshot of the model being served."""
+
+    pipeline: Any
+    path: str
+    version: str  # short sha256 of the artifact contents
+    loaded_at: str  # ISO 8601, UTC
+    signature: tuple  # (mtime_ns, size) of the artifact when it was loaded
+    feature_names: list
+    decoder: FeatureDecoder  # request decoder bound to feature_names
+    validator: MatrixValidator  # numeric checks of decoded rows
+    drift: DriftMonitor | None = None  # None when the model has no feature profile
+    card: dict | None = None  # model card saved at training time, if any
+
+
+def file_version(model_path):
+    """Returns a short content hash of the model artifact, used as the model version."""
+    digest = hashlib.sha256()
+    for path in artifact_files(model_path):
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def model_feature_names(pipeline):
+    """The feature columns a pipeline expects (the request schema's if it does not say)."""
+    if hasattr(pipeline, "feature_names_in_"):
+        return list(pipeline.feature_names_in_)
+    return FEATURE_NAMES
+
+
+def smoke_test(pipeline, feature_names):
+    """Runs a synthetic one-row prediction and fails if the output is unusable."""
+    sample = as_model_input(pipeline, np.zeros((1, len(feature_names))), feature_names)
+    _, proba = predict_with_proba(pipeline, sample)
+    if proba.shape != (1, len(pipeline.classes_)) or not np.all(np.isfinite(proba)):
+        raise ValueError(f"Smoke prediction returned unexpected output: {proba!r}")
+
+
+def build_drift_monitor(path, profile, feature_names):
+    """A DriftMonitor for the model's feature profile, or None without one."""
+    if profile is None:
+        return None
+    try:
+        return DriftMonitor(profile, feature_names)
+    except ValueError as e:
+        logging.warning(f"Feature profile of {path} does not match the model: {e}")
+        return None
+
+
+def warm_up(loaded, rounds=3):
+    """Sends synthetic requests through request decoding and inference.
+
+    Pays the first-call costs (lazy imports, caches and allocations in NumPy,
+    pandas, scikit-learn and pydantic) before the model takes real traffic.
+    """
+    payload = {name: 1.0 for name in FEATURE_NAMES}
+    pipeline, feature_names = loaded.pipeline, loaded.feature_names
+    for _ in range(rounds):
+        row = loaded.decoder.decode(payload)
+        predict_with_proba(pipeline, as_model_input(pipeline, row, feature_names))
+    # Pydantic fallback path of the decoder, and a multi-row batch
+    loaded.decoder.decode({**payload, FEATURE_NAMES[0]: "1.0"})
+    batch = np.repeat(row, 8, axis=0)
+    predict_with_proba(pipeline, as_model_input(pipeline, batch, feature_names))
+
+
+class ModelHolder:
+    """Holds the active model and swaps in new versions without blocking requests.
+
+    Request handlers read `holder.current` once and use that snapshot until they
+    finish, so a reload never changes the model under an in-flight request. New
+    versions are loaded, smoke-tested and warmed up first and only then swapped
+    in with a single reference assignment.
+
+    With a registry_dir, the model is resolved through the model registry
+    instead of model_path: `version` ("current" follows the CURRENT pointer, so
+    activating or rolling back a version is picked up like a changed file).
+
+    range_margin enables the plausible-range check of request rows, with
+    bounds from the model's training profile (see src/validation.py).
+    """
+
+    def __init__(
+        self, model_path, registry_dir=None, version="current", range_margin=None
+    ):
+        self.model_path = model_path
+        self.registry_dir = registry_dir
+        self.version = version
+        self.range_margin = range_margin
+        self.current = None
+        self.last_error = None
+        # (path, signature) of the artifact whose last load failed; the
+        # watcher skips it until the file changes again
+        self._failed = None
+        self._reload_lock = threading.Lock()
+
+    def artifact_path(self):
+        """Path of the model to serve: model_path, or the resolved registry version."""
+        if self.registry_dir is None:
+            return self.model_path
+        return resolve_version(self.registry_dir, self.version)
+
+    def load(self):
+        """Loads, smoke-tests and activates the model at artifact_path() (blocking)."""
+        with self._reload_lock:
+            return self._load()
+
+    def _load(self):
+        start = time.perf_counter()
+        attempt = None
+        try:
+            path = self.artifact_path()
+            attempt = (path, artifact_signature(path))
+            loaded = self._build(*attempt)
+        except Exception:
+            MODEL_LOADS_TOTAL.inc(result="failure")
+            self._failed = attempt
+            raise
+        MODEL_LOAD_DURATION.observe(time.perf_counter() - start)
+        MODEL_LOADS_TOTAL.inc(result="success")
+        self.current = loaded
+        self.last_error = None
+        self._failed = None
+        logging.info(f"Model version {loaded.version} activated from {loaded.path}.")
+        return loaded
+
+    def _build(self, path, signature):
+        # Previously served versions are still in get_pipeline's cache, so
+        # rolling back to one does not unpickle it again. Pipelines are only
+        # cached once they pass the smoke test, so a broken artifact cannot
+        # evict them.
+        pipeline = get_pipeline(
+            path, validate=lambda p: smoke_test(p, model_feature_names(p))
+        )
+        feature_names = model_feature_names(pipeline)
+        profile = load_feature_profile(path)
+        version = file_version(path)
+        card = load_model_card(path)
+        if card is not None and card.get("model_version") != version:
+            logging.warning(
+                f"Ignoring model card of version {card.get('model_version')} "
+                f"next to model version {version}."
+            )
+            card = None
+
+        loaded = LoadedModel(
+            pipeline=pipeline,
+            path=path,
+            version=version,
+            loaded_at=datetime.now(timezone.utc).isoformat(),
+            signature=signature,
+            feature_names=feature_names,
+            decoder=FeatureDecoder(feature_names),
+            validator=MatrixValidator(
+                feature_names,
+                plausible_ranges(profile, self.range_margin)
+                if profile is not None and self.range_margin is not None
+                else None,
+            ),
+            drift=build_drift_monitor(path, profile, feature_names),
+            card=card,
+        )
+        warm_up(loaded)
+        return loaded
+
+    def reload_in_background(self):
+        """Starts a background reload. Returns False if one is already running."""
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        threading.Thread(target=self._background_reload, daemon=True).start()
+        return True
+
+    def _background_reload(self):
+        try:
+            self._load()
+        except Exception as e:
+            self.last_error = str(e)
+            logging.error(f"Model reload failed, keeping the active model: {e}")
+        finally:
+            self._reload_lock.release()
+
+    def has_changed(self):
+        """True if the model file (or registry pointer) differs from the active model.
+
+        An artifact that already failed to load counts as unchanged until it
+        is rewritten.
+        """
+        try:
+            path = self.artifact_path()
+            signature = artifact_signature(path)
+        except OSError:
+            return False
+        if (path, signature) == self._failed:
+            return False
+        if self.current is None:
+            return True
+        return path != self.current.path or signature != self.current.signature
+
+    def start_watcher(self, interval):
+        """Polls the model file every `interval` seconds and reloads it on change.
+
+        The watcher is restarted in forked children (e.g. the workers of a
+        gunicorn app preloaded in the master), since threads do not survive fork.
+        """
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                if self.has_changed():
+                    self.reload_in_background()
+
+        def start():
+            threading.Thread(target=watch, name="model-watcher", daemon=True).start()
+
+        def restart_in_child():
+            self._reload_lock = threading.Lock()
+            start()
+
+        start()
+        os.register_at_fork(after_in_child=restart_in_child)
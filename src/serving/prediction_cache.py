@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """Bounded LRU cache of /predict results with a time-to-live per entry.
+
+    Entries are keyed by the exact bytes of the validated float64 feature row,
+    so only identical inputs hit. The cache belongs to one model version: a
+    lookup or store for a different version clears it first, so results of a
+    previous model are never served after a swap.
+    """
+
+    def __init__(self, max_size=1024, ttl=300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(row):
+        # Adding 0.0 turns -0.0 into 0.0, so both spellings share an entry
+        return (row + 0.0).tobytes()
+
+    def _switch_version(self, version):
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
+
+    def get(self, version, row):
+        """Returns the cached result for row under model `version`, or None."""
+        key = self.key(row)
+        with self._lock:
+            self._switch_version(version)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, version, row, result):
+        """Stores result for row under model `version`, evicting the least recently used."""
+        key = self.key(row)
+        with self._lock:
+            self._switch_version(version)
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters and current size, for the health endpoint."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+        }
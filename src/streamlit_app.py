@@ -1,16 +1,23 @@
 import streamlit as st
 import requests
+import io
 import os
+import sys
+
+import pandas as pd
+
+# `streamlit run src/streamlit_app.py` only puts src/ on sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.batch_client import batch_url, make_session, score_dataframe  # noqa: E402
 
 st.set_page_config(layout="wide")
 st.title("Breast Cancer Prediction")
 
 # Allow the Streamlit container to connect to the Flask API container
 API_URL = os.getenv("API_URL", "http://localhost:5000/predict")
-
-st.write(
-    "Please enter the patient's characteristics to get a breast cancer prediction."
-)
+BATCH_API_URL = os.getenv("BATCH_API_URL", batch_url(API_URL))
+BATCH_CHUNK_ROWS = int(os.getenv("BATCH_CHUNK_ROWS", "1000"))
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "4"))
 
 feature_info = {
     "radius_mean": {
@@ -129,60 +136,150 @@ feature_info = {
     },
 }
 
-input_data = {}
 
-# Create columns for better layout
-num_columns = 4
+@st.cache_data(show_spinner="Reading file...")
+def read_upload(data):
+    """Parses an uploaded CSV once; reruns reuse the parsed DataFrame."""
+    return pd.read_csv(io.BytesIO(data))
 
-with st.form("prediction_form"):
-    cols = st.columns(num_columns)
 
-    for i, feature in enumerate(feature_info.keys()):
-        with cols[i % num_columns]:
-            input_data[feature] = st.number_input(
-                feature_info[feature]["label"],
-                value=0.0,
-                format="%.4f",
-                help=feature_info[feature]["description"],
-                key=f"input_{feature}",
-            )
+@st.cache_resource
+def get_session():
+    """One pooled HTTP session for all batch runs of this Streamlit server."""
+    return make_session(BATCH_WORKERS)
+
+
+single_tab, upload_tab = st.tabs(["Single patient", "Upload CSV"])
+
+with single_tab:
+    st.write(
+        "Please enter the patient's characteristics to get a breast cancer prediction."
+    )
+
+    input_data = {}
+
+    # Create columns for better layout
+    num_columns = 4
+
+    with st.form("prediction_form"):
+        cols = st.columns(num_columns)
+
+        for i, feature in enumerate(feature_info.keys()):
+            with cols[i % num_columns]:
+                input_data[feature] = st.number_input(
+                    feature_info[feature]["label"],
+                    value=0.0,
+                    format="%.4f",
+                    help=feature_info[feature]["description"],
+                    key=f"input_{feature}",
+                )
+
+        submitted = st.form_submit_button("Get Prediction")
+        reset_button = st.form_submit_button("Reset")
 
-    submitted = st.form_submit_button("Get Prediction")
-    reset_button = st.form_submit_button("Reset")
+    if submitted:
+        try:
+            response = requests.post(API_URL, json=input_data)
+            if response.status_code == 200:
+                result = response.json()
+                st.subheader("Prediction Result:")
 
-if submitted:
-    try:
-        response = requests.post(API_URL, json=input_data)
-        if response.status_code == 200:
-            result = response.json()
-            st.subheader("Prediction Result:")
+                if result["prediction"] == 1:
+                    st.error("**Diagnosis: Malignant**")
+                else:
+                    st.success("**Diagnosis: Benign**")
+
+                st.write("---")  # Separator
+                st.write("**Probabilities:**")
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric(
+                        label="Benign Probability",
+                        value=f"{result['probability_benign']:.4f}",
+                    )
+                with col2:
+                    st.metric(
+                        label="Malignant Probability",
+                        value=f"{result['probability_malignant']:.4f}",
+                    )
 
-            if result["prediction"] == 1:
-                st.error("**Diagnosis: Malignant**")
             else:
-                st.success("**Diagnosis: Benign**")
-
-            st.write("---")  # Separator
-            st.write("**Probabilities:**")
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric(
-                    label="Benign Probability",
-                    value=f"{result['probability_benign']:.4f}",
+                st.error(
+                    f"Error from API: {response.status_code} - {response.json().get('error', 'Unknown error')}"
                 )
-            with col2:
-                st.metric(
-                    label="Malignant Probability",
-                    value=f"{result['probability_malignant']:.4f}",
+        except requests.exceptions.ConnectionError:
+            st.error(
+                "Could not connect to the Flask API. Please ensure it is running at http://localhost:5000."
+            )
+        except Exception as e:
+            st.error(f"An unexpected error occurred: {e}")
+
+with upload_tab:
+    st.write(
+        "Upload a CSV file with one patient per row and the 30 feature columns "
+        "(as in data/data.csv). An `id` column is copied to the results."
+    )
+    uploaded = st.file_uploader("Patients CSV", type="csv")
+    if uploaded is not None:
+        try:
+            patients = read_upload(uploaded.getvalue())
+        except Exception as e:
+            st.error(f"Could not read the CSV file: {e}")
+            st.stop()
+
+        missing = [
+            feature for feature in feature_info if feature not in patients.columns
+        ]
+        st.write(f"**{len(patients):,} rows** in {uploaded.name}")
+        if missing:
+            st.warning(
+                f"Missing feature columns: {', '.join(missing)}. "
+                "Rows will be reported as invalid."
+            )
+        st.dataframe(patients.head(100), use_container_width=True)
+
+        if st.button("Score all rows", type="primary"):
+            progress = st.progress(0.0, text="Scoring...")
+
+            def show_progress(done, total):
+                progress.progress(
+                    done / total, text=f"Scored {done:,} of {total:,} rows"
                 )
 
-        else:
-            st.error(
-                f"Error from API: {response.status_code} - {response.json().get('error', 'Unknown error')}"
+            try:
+                results = score_dataframe(
+                    patients,
+                    BATCH_API_URL,
+                    list(feature_info),
+                    chunk_rows=BATCH_CHUNK_ROWS,
+                    workers=BATCH_WORKERS,
+                    session=get_session(),
+                    on_progress=show_progress,
+                )
+                # Kept across reruns (e.g. the download click) so nothing is rescored
+                st.session_state["batch_results"] = (
+                    uploaded.file_id,
+                    results,
+                    results.to_csv(index=False).encode(),
+                )
+            except requests.exceptions.ConnectionError:
+                st.error(
+                    f"Could not connect to the Flask API at {BATCH_API_URL}. "
+                    "Please ensure it is running."
+                )
+
+        stored = st.session_state.get("batch_results")
+        if stored is not None and stored[0] == uploaded.file_id:
+            _, results, results_csv = stored
+            invalid = results["error"] != ""
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Malignant", int((results["prediction"] == 1).sum()))
+            col2.metric("Benign", int((results["prediction"] == 0).sum()))
+            col3.metric("Invalid rows", int(invalid.sum()))
+            st.dataframe(results, use_container_width=True)
+            st.download_button(
+                "Download results (CSV)",
+                data=results_csv,
+                file_name=f"{os.path.splitext(uploaded.name)[0]}_predictions.csv",
+                mime="text/csv",
             )
-    except requests.exceptions.ConnectionError:
-        st.error(
-            "Could not connect to the Flask API. Please ensure it is running at http://localhost:5000."
-        )
-    except Exception as e:
-        st.error(f"An unexpected error occurred: {e}")
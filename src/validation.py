@@ -0,0 +1,203 @@
+"""Vectorized validation of whole feature matrices (batch and offline scoring).
+
+Where src/schemas.py validates one object at a time, MatrixValidator checks
+a NumPy matrix or DataFrame of any number of rows with a few array
+operations per feature: missing and non-numeric values, NaN/inf, negatives
+and, optionally, values outside a plausible range derived from the training
+data. Error details are only built for the failing cells and have the same
+shape as pydantic's (what /predict returns with a 422).
+
+pandas is only imported when a DataFrame is validated, so serving (which
+validates NumPy matrices) does not load it.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from pydantic import ValidationError
+from pydantic_core import PydanticCustomError
+
+from src.schemas import FEATURE_NAMES
+
+# Error codes of the cells of a validated matrix, in order of precedence
+OK, MISSING, NOT_A_NUMBER, NOT_FINITE, NEGATIVE, OUT_OF_RANGE = range(6)
+
+# Pydantic error types of the codes (the range error is a custom type)
+ERROR_TYPES = {
+    MISSING: "missing",
+    NOT_A_NUMBER: "float_parsing",
+    NOT_FINITE: "finite_number",
+    NEGATIVE: "greater_than_equal",
+}
+
+
+def plausible_ranges(profile, margin=0.5):
+    """Per-feature (low, high) bounds: the training min/max widened by margin x range.
+
+    profile is the feature profile saved at training time (see
+    src/model/feature_profile.py). Bounds never go below 0.
+    """
+    low = np.array(profile["data_min"], dtype=np.float64)
+    high = np.array(profile["data_max"], dtype=np.float64)
+    span = high - low
+    ranges = {}
+    for i, name in enumerate(profile["features"]):
+        ranges[name] = (
+            max(0.0, float(low[i] - margin * span[i])),
+            float(high[i] + margin * span[i]),
+        )
+    return ranges
+
+
+@dataclass(frozen=True)
+class MatrixValidation:
+    """Result of MatrixValidator.validate."""
+
+    codes: np.ndarray  # (n_rows, n_checked) error code per cell, OK if valid
+    values: np.ndarray  # (n_rows, n_features) float64 matrix, in feature_names order
+    validator: "MatrixValidator"
+    frame: Any = None  # validated DataFrame, for the original inputs
+
+    def _input(self, row, column, code):
+        """The value a failing cell held in the validated data."""
+        if code == MISSING:
+            return {}
+        name = self.validator.checked[column]
+        if self.frame is not None:
+            value = self.frame[name].iloc[row]
+        else:
+            value = self.values[row, self.validator.columns[column]]
+        return value.item() if isinstance(value, np.generic) else value
+
+    @property
+    def invalid(self):
+        """Per-row error mask."""
+        return (self.codes != OK).any(axis=1)
+
+    def row_errors(self):
+        """Maps the index of every invalid row to its pydantic-style error details.
+
+        "loc" is the feature name alone, as in a /predict 422 response.
+        """
+        rows, columns = np.nonzero(self.codes)
+        if not len(rows):
+            return {}
+        line_errors = []
+        for row, column, code in zip(
+            rows.tolist(), columns.tolist(), self.codes[rows, columns].tolist()
+        ):
+            error = {
+                "loc": (row, self.validator.checked[column]),
+                "input": self._input(row, column, code),
+            }
+            if code == NEGATIVE:
+                error["ctx"] = {"ge": 0.0}
+            if code == OUT_OF_RANGE:
+                low = float(self.validator.lows[column])
+                high = float(self.validator.highs[column])
+                error["type"] = PydanticCustomError(
+                    "plausible_range",
+                    "Input should be between {min} and {max}, the range seen in training",
+                    {"min": low, "max": high},
+                )
+            else:
+                error["type"] = ERROR_TYPES[code]
+            line_errors.append(error)
+
+        row_errors = {}
+        details = ValidationError.from_exception_data("PredictRequest", line_errors)
+        for error in details.errors():
+            index, *loc = error["loc"]
+            row_errors.setdefault(index, []).append({**error, "loc": tuple(loc)})
+        return row_errors
+
+
+class MatrixValidator:
+    """Validates feature matrices whose columns are feature_names.
+
+    Only the columns of the request schema are checked (model features such
+    as 'id' are passed through). ranges maps feature names to (low, high)
+    plausibility bounds (see plausible_ranges); None disables that check.
+    """
+
+    def __init__(self, feature_names=FEATURE_NAMES, ranges=None):
+        self.feature_names = list(feature_names)
+        self.checked = [name for name in self.feature_names if name in FEATURE_NAMES]
+        self.columns = np.array(
+            [self.feature_names.index(name) for name in self.checked], dtype=np.intp
+        )
+        ranges = ranges or {}
+        self.lows = np.array(
+            [ranges.get(n, (-np.inf, np.inf))[0] for n in self.checked]
+        )
+        self.highs = np.array(
+            [ranges.get(n, (-np.inf, np.inf))[1] for n in self.checked]
+        )
+        # Bounds over all feature_names columns: [max(0, low), high] clipped to
+        # finite values for checked ones, anything for the others
+        largest = np.finfo(np.float64).max
+        self._floors = np.full(len(self.feature_names), -np.inf)
+        self._floors[self.columns] = np.maximum(self.lows, 0.0)
+        self._ceilings = np.full(len(self.feature_names), np.inf)
+        self._ceilings[self.columns] = np.minimum(self.highs, largest)
+        self._unchecked = np.ones(len(self.feature_names), dtype=bool)
+        self._unchecked[self.columns] = False
+        # Position in self.checked of every feature_names column
+        self._checked_index = np.zeros(len(self.feature_names), dtype=np.intp)
+        self._checked_index[self.columns] = np.arange(len(self.checked))
+
+    def validate(self, data):
+        """Validates an (n_rows, n_features) array or a DataFrame with the feature columns.
+
+        DataFrame columns are matched by name: absent columns are "missing"
+        and non-numeric cells "float_parsing" errors. Returns a MatrixValidation.
+        """
+        frame = data if hasattr(data, "columns") else None
+        if frame is not None:
+            values, codes = self._from_frame(frame)
+        else:
+            values = np.asarray(data, dtype=np.float64).reshape(
+                -1, len(self.feature_names)
+            )
+            codes = np.zeros((len(values), len(self.checked)), dtype=np.uint8)
+
+        # Two comparisons over the whole matrix (no column gather): NaN fails
+        # both, +-inf fails the finite bounds of the checked columns
+        passed = values >= self._floors
+        passed &= values <= self._ceilings
+        passed |= self._unchecked
+        if not passed.all():
+            # Codes only for the failing cells, the first failed check wins
+            rows, positions = np.nonzero(~passed)
+            columns = self._checked_index[positions]
+            cells = values[rows, positions]
+            failed_codes = np.select(
+                [~np.isfinite(cells), cells < 0],
+                [NOT_FINITE, NEGATIVE],
+                default=OUT_OF_RANGE,
+            )
+            unset = codes[rows, columns] == OK
+            codes[rows[unset], columns[unset]] = failed_codes[unset]
+        return MatrixValidation(codes=codes, values=values, validator=self, frame=frame)
+
+    def _from_frame(self, frame):
+        import pandas as pd
+
+        n_rows = len(frame)
+        values = np.zeros((n_rows, len(self.feature_names)), dtype=np.float64)
+        codes = np.zeros((n_rows, len(self.checked)), dtype=np.uint8)
+        for position, name in enumerate(self.feature_names):
+            if name not in frame.columns:
+                continue
+            values[:, position] = pd.to_numeric(frame[name], errors="coerce")
+        for column, name in enumerate(self.checked):
+            if name not in frame.columns:
+                codes[:, column] = MISSING
+                continue
+            # Null cells stay NaN (reported as non-finite); anything else that
+            # did not parse is a non-numeric value
+            parsed = values[:, self.columns[column]]
+            unparsed = np.isnan(parsed) & frame[name].notna().to_numpy()
+            codes[unparsed, column] = NOT_A_NUMBER
+        return values, codes
@@ -1,6 +1,15 @@
+import json
+import os
+
 import pandas as pd
 import pytest
 
+# The app configures logging on import; keep test runs from writing api_logs.log
+os.environ.setdefault("LOG_FILE", "")
+
+from src.model.model_training import train_and_save_pipeline
+from src.serving.model_state import ModelHolder
+
 
 @pytest.fixture
 def sample_data_1():
@@ -95,3 +104,29 @@ def dummy_data_path(tmp_path):
     dummy_file = tmp_path / "dummy_data.csv"
     df.to_csv(dummy_file, index=False)
     return str(dummy_file)
+
+
+@pytest.fixture
+def sample_payload():
+    """Loads the sample prediction payload used by the API and integration tests."""
+    with open("tests/fixtures/sample_payload.json") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def trained_model_path(dummy_data_path, tmp_path):
+    """Trains a small pipeline on the dummy dataset and returns the saved model path."""
+    model_path = tmp_path / "models" / "model.joblib"
+    train_and_save_pipeline(data_path=dummy_data_path, model_path=str(model_path))
+    return str(model_path)
+
+
+@pytest.fixture
+def client(trained_model_path, monkeypatch):
+    """Flask test client serving the pipeline from trained_model_path."""
+    import src.app as app_module
+
+    holder = ModelHolder(trained_model_path)
+    holder.load()
+    monkeypatch.setattr(app_module, "model_holder", holder)
+    return app_module.app.test_client()
@@ -0,0 +1,72 @@
+import asyncio
+import json
+
+import pytest
+
+from src import asgi_app
+from src.serving.micro_batching import MicroBatcher
+from src.serving.model_state import ModelHolder
+
+
+async def call(method, path, body=None):
+    """Sends one HTTP request through the ASGI app; returns (status, JSON body)."""
+    request_body = json.dumps(body).encode() if body is not None else b""
+    messages = [{"type": "http.request", "body": request_body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path}
+    await asgi_app.app(scope, receive, send)
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+@pytest.fixture
+def asgi_model(trained_model_path, monkeypatch):
+    holder = ModelHolder(trained_model_path)
+    holder.load()
+    monkeypatch.setattr(asgi_app, "model_holder", holder)
+    monkeypatch.setattr(asgi_app, "batcher", MicroBatcher(max_wait_ms=20))
+    return holder
+
+
+def run_with_batcher(*requests):
+    async def run():
+        asgi_app.batcher.start()
+        try:
+            return await asyncio.gather(*(call(*r) for r in requests))
+        finally:
+            await asgi_app.batcher.stop()
+
+    return asyncio.run(run())
+
+
+def test_asgi_predict_matches_flask(asgi_model, client, sample_payload):
+    """Concurrent ASGI predictions return exactly what the Flask app returns."""
+    expected = client.post("/predict", json=sample_payload).get_json()
+    results = run_with_batcher(*[("POST", "/predict", sample_payload)] * 5)
+    for status, body in results:
+        assert status == 200
+        assert body == expected
+
+
+def test_asgi_validation_error(asgi_model, client, sample_payload):
+    """Invalid input gets the same 422 details as the Flask app."""
+    invalid = {**sample_payload, "radius_mean": -1}
+    expected = client.post("/predict", json=invalid).get_json()
+    [(status, body)] = run_with_batcher(("POST", "/predict", invalid))
+    assert status == 422
+    assert body == expected
+
+
+def test_asgi_health_and_not_found(asgi_model):
+    [(status, body), (missing_status, _)] = run_with_batcher(
+        ("GET", "/"), ("GET", "/missing")
+    )
+    assert status == 200
+    assert body["model_version"] == asgi_model.current.version
+    assert missing_status == 404
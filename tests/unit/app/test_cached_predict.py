@@ -0,0 +1,20 @@
+import src.app as app_module
+from src.serving.prediction_cache import PredictionCache
+
+
+def test_repeated_prediction_is_served_from_cache(
+    client, sample_payload, monkeypatch, mocker
+):
+    """A repeated feature vector returns the same result without running the model."""
+    monkeypatch.setattr(app_module, "prediction_cache", PredictionCache(max_size=8))
+    first = client.post("/predict", json=sample_payload)
+
+    predict = mocker.patch.object(app_module, "predict_with_proba")
+    second = client.post("/predict", json=sample_payload)
+
+    assert second.status_code == 200
+    assert second.get_json() == first.get_json()
+    predict.assert_not_called()
+    stats = client.get("/").get_json()["prediction_cache"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
@@ -0,0 +1,21 @@
+import src.app as app_module
+from src.serving.model_state import ModelHolder
+
+
+def test_drift_summarizes_predicted_rows(client, sample_payload):
+    """Rows sent to /predict and /predict/batch are counted against the training profile."""
+    assert client.post("/predict", json=sample_payload).status_code == 200
+    assert client.post("/predict/batch", json=[sample_payload] * 3).status_code == 200
+
+    response = client.get("/drift")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["drift"]["n_samples"] == 4
+    radius = body["drift"]["features"]["radius_mean"]
+    assert radius["mean"] == sample_payload["radius_mean"]
+    assert "psi" in radius
+
+
+def test_drift_without_model(client, monkeypatch):
+    monkeypatch.setattr(app_module, "model_holder", ModelHolder("missing.joblib"))
+    assert client.get("/drift").status_code == 503
@@ -0,0 +1,41 @@
+import time
+
+import src.app as app_module
+from src.serving.experiments import Experiments
+from src.serving.model_state import ModelHolder
+
+
+def test_canary_serves_its_share_and_is_compared(
+    client, trained_model_path, sample_payload, monkeypatch
+):
+    """With weight 1 the canary serves every request and the primary re-scores it."""
+    canary = ModelHolder(trained_model_path)
+    canary.load()
+    experiments = Experiments(canaries=[("canary", canary, 1.0)])
+    monkeypatch.setattr(app_module, "experiments", experiments)
+    monkeypatch.setattr(app_module, "ADMIN_TOKEN", "secret")
+
+    response = client.post("/predict", json=sample_payload)
+    assert response.status_code == 200
+    assert response.headers["X-Model-Version"] == canary.current.version
+
+    deadline = time.monotonic() + 10
+    while experiments._pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stats = client.get(
+        "/admin/experiments", headers={"X-Admin-Token": "secret"}
+    ).get_json()
+    assert stats["canaries"] == {"canary": 1.0}
+    assert stats["models"]["canary"]["latency_ms"]["n"] == 1
+    assert stats["models"]["canary"]["compared"] == 1
+    assert stats["models"]["canary"]["disagreement_rate"] == 0.0
+
+
+def test_experiment_stats_require_admin_token(client, monkeypatch):
+    monkeypatch.setattr(app_module, "ADMIN_TOKEN", None)
+    assert client.get("/admin/experiments").status_code == 404
+    monkeypatch.setattr(app_module, "ADMIN_TOKEN", "secret")
+    assert client.get("/admin/experiments").status_code == 401
+    response = client.get("/admin/experiments", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert response.get_json()["models"] == {}
@@ -0,0 +1,49 @@
+import src.app as app_module
+
+
+def test_health_reports_model_version(client):
+    """The health endpoint reports the active model version and load time."""
+    body = client.get("/").get_json()
+    loaded = app_module.model_holder.current
+    assert body["model_loaded"] is True
+    assert body["model_version"] == loaded.version
+    assert body["model_loaded_at"] == loaded.loaded_at
+
+
+def test_admin_reload_starts_background_reload(client, mocker, monkeypatch):
+    """POST /admin/reload triggers a background reload and returns 202."""
+    monkeypatch.setattr(app_module, "ADMIN_TOKEN", "secret")
+    reload = mocker.patch.object(
+        app_module.model_holder, "reload_in_background", return_value=True
+    )
+    response = client.post("/admin/reload", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 202
+    reload.assert_called_once_with()
+
+
+def test_admin_reload_requires_token(client, monkeypatch):
+    """Reloads are disabled without ADMIN_TOKEN and need the matching header with it."""
+    monkeypatch.setattr(app_module, "ADMIN_TOKEN", None)
+    assert client.post("/admin/reload").status_code == 404
+    monkeypatch.setattr(app_module, "ADMIN_TOKEN", "secret")
+    assert client.post("/admin/reload").status_code == 401
+    wrong = client.post("/admin/reload", headers={"X-Admin-Token": "guess"})
+    assert wrong.status_code == 401
+    response = client.post("/admin/reload", headers={"X-Admin-Token": "secret"})
+    assert response.status_code in (202, 409)
+
+
+def test_ready_once_model_is_loaded(client):
+    """/ready reports 200 and the model version when a warmed-up model is active."""
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert (
+        response.get_json()["model_version"] == app_module.model_holder.current.version
+    )
+
+
+def test_not_ready_without_model(client, monkeypatch):
+    """/ready reports 503 while no model is loaded, while / stays alive."""
+    monkeypatch.setattr(app_module.model_holder, "current", None)
+    assert client.get("/ready").status_code == 503
+    assert client.get("/").status_code == 200
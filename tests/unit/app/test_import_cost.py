@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+
+
+def test_importing_app_does_not_load_pandas(tmp_path):
+    """Without a pickled pipeline to serve, `import src.app` loads neither pandas nor pyarrow."""
+    code = (
+        "import sys, src.app; "
+        "print([m for m in ('pandas', 'pyarrow') if m in sys.modules], file=sys.stderr)"
+    )
+    env = {
+        **os.environ,
+        "MODEL_PATH": str(tmp_path / "missing.npz"),
+        "LOG_FILE": "",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Log lines go to stdout; the loaded modules are printed last on stderr
+    assert result.stderr.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,33 @@
+from src.serving import metrics
+
+
+def test_metrics_endpoint_exposes_request_and_stage_metrics(client, sample_payload):
+    """After a prediction, /metrics reports its status code and stage latencies."""
+    before = metrics.REQUESTS_TOTAL.get(endpoint="/predict", method="POST", status=200)
+    assert client.post("/predict", json=sample_payload).status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    text = response.get_data(as_text=True)
+    assert (
+        metrics.REQUESTS_TOTAL.get(endpoint="/predict", method="POST", status=200)
+        == before + 1
+    )
+    for stage in ("parse", "validate", "dataframe", "inference"):
+        assert (
+            f'api_stage_duration_seconds_count{{endpoint="/predict",stage="{stage}"}}'
+            in text
+        )
+    assert "model_load_duration_seconds_count" in text
+    assert 'api_requests_in_flight{endpoint="/predict"} 0' in text
+
+
+def test_metrics_count_validation_errors(client):
+    """Rejected requests are counted under their status code."""
+    before = metrics.REQUESTS_TOTAL.get(endpoint="/predict", method="POST", status=422)
+    assert client.post("/predict", json={"radius_mean": "x"}).status_code == 422
+    assert (
+        metrics.REQUESTS_TOTAL.get(endpoint="/predict", method="POST", status=422)
+        == before + 1
+    )
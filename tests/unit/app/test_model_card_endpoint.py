@@ -0,0 +1,56 @@
+import json
+
+import src.app as app_module
+from src.model.model_card import card_path
+from src.model.model_training import train_and_save_pipeline
+from src.serving.model_state import ModelHolder, file_version
+
+
+def test_model_card_is_null_without_card(client):
+    response = client.get("/model/card")
+    assert response.status_code == 200
+    assert response.get_json()["card"] is None
+
+
+def test_model_card_serves_the_saved_card(client, trained_model_path, monkeypatch):
+    card = {
+        "model_version": file_version(trained_model_path),
+        "metrics": {"accuracy": 0.95},
+        "test_rows": 2,
+    }
+    with open(card_path(trained_model_path), "w") as f:
+        json.dump(card, f)
+    holder = ModelHolder(trained_model_path)
+    holder.load()
+    monkeypatch.setattr(app_module, "model_holder", holder)
+
+    body = client.get("/model/card").get_json()
+    assert body["card"] == card
+    assert body["model_version"] == holder.current.version
+
+
+def test_model_card_of_another_version_is_ignored(client, trained_model_path):
+    with open(card_path(trained_model_path), "w") as f:
+        json.dump({"model_version": "0123456789ab", "metrics": {}}, f)
+    holder = ModelHolder(trained_model_path)
+    holder.load()
+    assert holder.current.card is None
+
+
+def test_retraining_without_card_removes_the_old_card(
+    client, dummy_data_path, trained_model_path, monkeypatch
+):
+    train_and_save_pipeline(
+        data_path=dummy_data_path, model_path=trained_model_path, model_card=True
+    )
+    train_and_save_pipeline(data_path=dummy_data_path, model_path=trained_model_path)
+    holder = ModelHolder(trained_model_path)
+    holder.load()
+    monkeypatch.setattr(app_module, "model_holder", holder)
+
+    assert client.get("/model/card").get_json()["card"] is None
+
+
+def test_model_card_without_model(client, monkeypatch):
+    monkeypatch.setattr(app_module, "model_holder", ModelHolder("missing.joblib"))
+    assert client.get("/model/card").status_code == 503
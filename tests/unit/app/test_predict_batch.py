@@ -0,0 +1,94 @@
+import src.app as app_module
+
+
+def test_predict_batch_records(client, sample_payload):
+    """A list of records is scored in one call and returned in input order."""
+    response = client.post("/predict/batch", json=[sample_payload] * 3)
+    assert response.status_code == 200
+
+    body = response.get_json()
+    assert body["n_scored"] == 3
+    assert body["n_errors"] == 0
+    assert [r["index"] for r in body["results"]] == [0, 1, 2]
+    for result in body["results"]:
+        assert result["prediction"] in (0, 1)
+        assert (
+            abs(result["probability_benign"] + result["probability_malignant"] - 1)
+            < 1e-9
+        )
+
+
+def test_predict_batch_matches_single_predict(client, sample_payload):
+    """Batch results are identical to the single-row /predict results."""
+    single = client.post("/predict", json=sample_payload).get_json()
+    batch = client.post("/predict/batch", json={"records": [sample_payload]}).get_json()
+    result = batch["results"][0]
+    assert result["prediction"] == single["prediction"]
+    assert result["probability_benign"] == single["probability_benign"]
+    assert result["probability_malignant"] == single["probability_malignant"]
+
+
+def test_predict_batch_columnar(client, sample_payload):
+    """A columnar payload is converted to records before scoring."""
+    columns = {name: [value, value] for name, value in sample_payload.items()}
+    response = client.post("/predict/batch", json={"columns": columns})
+    assert response.status_code == 200
+    assert response.get_json()["n_scored"] == 2
+
+
+def test_predict_batch_per_row_errors(client, sample_payload):
+    """Invalid rows get their own errors without failing the valid ones."""
+    invalid = {**sample_payload, "radius_mean": -1}
+    response = client.post("/predict/batch", json=[sample_payload, invalid])
+    assert response.status_code == 200
+
+    body = response.get_json()
+    assert body["n_scored"] == 1
+    assert body["n_errors"] == 1
+    assert "prediction" in body["results"][0]
+    error = body["results"][1]
+    assert error["index"] == 1
+    assert error["error"] == "Invalid input"
+    assert error["details"][0]["loc"] == ["radius_mean"]
+    assert error["details"][0]["type"] == "greater_than_equal"
+
+
+def test_predict_batch_too_large(client, sample_payload, monkeypatch):
+    """Batches above MAX_BATCH_SIZE are rejected with 413."""
+    monkeypatch.setattr(app_module, "MAX_BATCH_SIZE", 2)
+    response = client.post("/predict/batch", json=[sample_payload] * 3)
+    assert response.status_code == 413
+
+
+def test_predict_batch_invalid_shape(client):
+    """Payloads that are neither records nor columns are rejected with 400."""
+    response = client.post("/predict/batch", json={"foo": 1})
+    assert response.status_code == 400
+
+
+def test_predict_batch_rejects_non_finite_rows(client, sample_payload):
+    """NaN/inf values fail their own row with the schema's error shape."""
+    records = [
+        {**sample_payload, "area_mean": float("inf")},
+        sample_payload,
+        {**sample_payload, "texture_mean": float("nan")},
+    ]
+    body = client.post("/predict/batch", json=records).get_json()
+
+    assert body["n_scored"] == 1
+    assert [r["index"] for r in body["results"]] == [0, 1, 2]
+    assert body["results"][0]["details"][0]["type"] == "finite_number"
+    assert body["results"][0]["details"][0]["loc"] == ["area_mean"]
+    assert body["results"][2]["details"][0]["loc"] == ["texture_mean"]
+
+
+def test_predict_batch_oversized_integer_fails_only_its_row(client, sample_payload):
+    """An int too large for a float is a per-row schema error, not a failed batch."""
+    records = [sample_payload, {**sample_payload, "area_mean": 10**400}, sample_payload]
+    response = client.post("/predict/batch", json=records)
+    assert response.status_code == 200
+
+    body = response.get_json()
+    assert body["n_scored"] == 2
+    assert body["results"][1]["details"][0]["type"] == "float_type"
+    assert body["results"][1]["details"][0]["loc"] == ["area_mean"]
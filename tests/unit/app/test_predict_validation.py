@@ -0,0 +1,42 @@
+import src.app as app_module
+from src.serving.model_state import ModelHolder
+
+
+def test_predict_rejects_infinite_values(client, sample_payload):
+    response = client.post("/predict", json={**sample_payload, "area_mean": 1e400})
+    assert response.status_code == 422
+    details = response.get_json()["details"]
+    assert details[0]["type"] == "finite_number"
+    assert details[0]["loc"] == ["area_mean"]
+
+
+def test_predict_rejects_oversized_integers(client, sample_payload):
+    response = client.post("/predict", json={**sample_payload, "area_mean": 10**400})
+    assert response.status_code == 422
+    details = response.get_json()["details"]
+    assert details[0]["type"] == "float_type"
+    assert details[0]["loc"] == ["area_mean"]
+
+
+def test_predict_checks_plausible_ranges(
+    client, trained_model_path, sample_payload, monkeypatch
+):
+    """With a range margin, values far outside the training data are rejected."""
+    holder = ModelHolder(trained_model_path, range_margin=0.5)
+    holder.load()
+    monkeypatch.setattr(app_module, "model_holder", holder)
+
+    # The dummy training data has radius_mean 10..19, so 15 passes and 100 fails
+    payload = {**sample_payload, "radius_mean": 15.0}
+    plausible = {
+        name: holder.current.validator.lows[i]
+        for i, name in enumerate(holder.current.validator.checked)
+    }
+    payload.update({name: plausible[name] for name in payload if name != "radius_mean"})
+    assert client.post("/predict", json=payload).status_code == 200
+
+    response = client.post("/predict", json={**payload, "radius_mean": 100.0})
+    assert response.status_code == 422
+    error = response.get_json()["details"][0]
+    assert error["type"] == "plausible_range"
+    assert error["ctx"] == {"min": 5.5, "max": 23.5}
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from src.batch_client import batch_url, columnar_payload, score_dataframe
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+class FlaskSession:
+    """Sends the client's POSTs to the Flask test client instead of the network."""
+
+    def __init__(self, client):
+        self.client = client
+        self.batch_sizes = []
+
+    def post(self, url, json, timeout):
+        self.batch_sizes.append(len(next(iter(json["columns"].values()))))
+        response = self.client.post("/predict/batch", json=json)
+        return FakeResponse(response.status_code, response.get_json())
+
+
+class FailingSession:
+    """Answers every POST with the given status code."""
+
+    def __init__(self, status):
+        self.status = status
+
+    def post(self, url, json, timeout):
+        return FakeResponse(self.status, {"error": "Payload too large"})
+
+
+def test_batch_url():
+    assert batch_url("http://api:5000/predict") == "http://api:5000/predict/batch"
+
+
+def test_columnar_payload_missing_values_become_null():
+    chunk = pd.DataFrame({"radius_mean": [1.5, np.nan], "id": [1, 2]})
+    payload = columnar_payload(chunk, ["radius_mean", "texture_mean"])
+    assert payload == {"columns": {"radius_mean": [1.5, None]}}
+
+
+def test_score_dataframe_in_chunks(client, sample_payload):
+    """Rows come back in input order, with per-row errors and progress after each chunk."""
+    df = pd.DataFrame([sample_payload] * 7)
+    df.insert(0, "id", range(100, 107))
+    df.loc[3, "radius_mean"] = -1
+    session = FlaskSession(client)
+    progress = []
+
+    results = score_dataframe(
+        df,
+        "http://api/predict/batch",
+        list(sample_payload),
+        chunk_rows=3,
+        workers=2,
+        session=session,
+        on_progress=lambda done, total: progress.append((done, total)),
+    )
+
+    assert sorted(session.batch_sizes) == [1, 3, 3]
+    assert len(progress) == 3 and progress[-1] == (7, 7)
+    assert list(results["id"]) == list(range(100, 107))
+    assert results["error"][3].startswith("radius_mean:")
+    assert pd.isna(results["prediction"][3])
+    valid = results.drop(index=3)
+    assert (valid["error"] == "").all()
+    assert valid["prediction"].isin([0, 1]).all()
+    np.testing.assert_allclose(
+        valid["probability_benign"] + valid["probability_malignant"], 1.0
+    )
+    single = client.post("/predict", json=sample_payload).get_json()
+    assert results["prediction"][0] == single["prediction"]
+
+
+def test_score_dataframe_failed_chunk_sets_all_row_errors(sample_payload):
+    df = pd.DataFrame([sample_payload] * 5)
+    results = score_dataframe(
+        df,
+        "http://api/predict/batch",
+        list(sample_payload),
+        chunk_rows=2,
+        session=FailingSession(413),
+    )
+    assert (results["error"] == "API error 413: Payload too large").all()
+    assert results["prediction"].isna().all()
+    assert "id" not in results.columns
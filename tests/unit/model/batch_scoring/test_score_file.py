@@ -0,0 +1,114 @@
+import os
+
+import pandas as pd
+import pytest
+
+import src.model.batch_scoring as batch_scoring
+from src.model.batch_scoring import checkpoint_path, score_file
+
+
+def test_score_file_writes_predictions_in_input_order(
+    dummy_data_path, trained_model_path, tmp_path
+):
+    """Every input row gets a prediction, in order, whatever the number of workers."""
+    single = tmp_path / "single.csv"
+    pooled = tmp_path / "pooled.csv"
+    score_file(dummy_data_path, str(single), trained_model_path, workers=1, chunksize=3)
+    score_file(dummy_data_path, str(pooled), trained_model_path, workers=2, chunksize=3)
+
+    result = pd.read_csv(single)
+    assert list(result.columns) == [
+        "id",
+        "prediction",
+        "probability_benign",
+        "probability_malignant",
+    ]
+    assert result["id"].tolist() == pd.read_csv(dummy_data_path)["id"].tolist()
+    assert pd.read_csv(pooled).equals(result)
+    assert not os.path.exists(checkpoint_path(str(single)))
+
+
+def test_score_file_resumes_from_checkpoint(
+    dummy_data_path, trained_model_path, tmp_path, mocker
+):
+    """An interrupted run continues after the last completed chunk."""
+    expected = tmp_path / "expected.csv"
+    output = tmp_path / "output.csv"
+    score_file(
+        dummy_data_path, str(expected), trained_model_path, workers=1, chunksize=3
+    )
+
+    original = batch_scoring.score_features
+    calls = []
+
+    def fail_on_second_chunk(features):
+        calls.append(len(features))
+        if len(calls) == 2:
+            raise RuntimeError("interrupted")
+        return original(features)
+
+    mocker.patch.object(
+        batch_scoring, "score_features", side_effect=fail_on_second_chunk
+    )
+    with pytest.raises(RuntimeError):
+        score_file(
+            dummy_data_path, str(output), trained_model_path, workers=1, chunksize=3
+        )
+    assert os.path.exists(checkpoint_path(str(output)))
+
+    # A half-written chunk after the checkpoint is discarded on resume
+    with open(output, "a") as f:
+        f.write("3,1,0.5")
+    mocker.stopall()
+    summary = score_file(
+        dummy_data_path, str(output), trained_model_path, workers=1, chunksize=3
+    )
+
+    assert summary["resumed_from"] == 3
+    assert output.read_text() == expected.read_text()
+
+
+def test_score_file_rejects_checkpoint_of_another_model(
+    dummy_data_path, trained_model_path, tmp_path
+):
+    """A checkpoint written for a different model is not silently reused."""
+    output = tmp_path / "output.csv"
+    output.write_text("id,prediction\n")
+    checkpoint = tmp_path / "output.csv.checkpoint.json"
+    checkpoint.write_text('{"model_signature": [0, 0], "rows_done": 3}')
+    with pytest.raises(ValueError, match="different input or model"):
+        score_file(dummy_data_path, str(output), trained_model_path, workers=1)
+
+
+def test_score_file_validate_reports_invalid_rows(
+    dummy_data_path, trained_model_path, tmp_path
+):
+    """With validate=True, invalid rows get an error message and no prediction."""
+    data = pd.read_csv(dummy_data_path)
+    data.loc[1, "radius_mean"] = -1.0
+    data["area_mean"] = data["area_mean"].astype(object)
+    data.loc[4, "area_mean"] = "abc"
+    input_path = tmp_path / "input.csv"
+    data.to_csv(input_path, index=False)
+    output = tmp_path / "output.csv"
+
+    summary = score_file(
+        str(input_path),
+        str(output),
+        trained_model_path,
+        workers=1,
+        chunksize=3,
+        validate=True,
+    )
+
+    result = pd.read_csv(output, keep_default_na=False)
+    assert summary["invalid_rows"] == 2
+    assert result["error"].tolist()[:5] == [
+        "",
+        "radius_mean: Input should be greater than or equal to 0",
+        "",
+        "",
+        "area_mean: Input should be a valid number, unable to parse string as a number",
+    ]
+    assert result.loc[[1, 4], "prediction"].tolist() == ["", ""]
+    assert (result.loc[result["error"] == "", "prediction"] != "").all()
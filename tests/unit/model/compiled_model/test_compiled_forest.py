@@ -0,0 +1,88 @@
+import joblib
+import numpy as np
+import pytest
+
+from src.model.compiled_model import (
+    CompiledForest,
+    export_compiled_model,
+    load_compiled_model,
+)
+from src.model.data_ingestion import load_raw_data
+from src.model.data_preprocessing import (
+    map_diagnosis_to_numerical,
+    prepare_features_and_target,
+)
+from src.model.model_inference import load_pipeline
+from src.model.model_training import train_and_save_pipeline
+from src.serving.model_state import ModelHolder
+
+
+def load_features():
+    """Raw feature columns of data/data.csv, including 'id' and 'Unnamed: 32'."""
+    X, _ = prepare_features_and_target(map_diagnosis_to_numerical(load_raw_data()))
+    return X
+
+
+@pytest.fixture(scope="module")
+def compiled_models(tmp_path_factory):
+    """Trains on data/data.csv and exports the compiled model next to the pipeline."""
+    model_dir = tmp_path_factory.mktemp("models")
+    model_path = model_dir / "model.joblib"
+    compiled_path = model_dir / "model.npz"
+    train_and_save_pipeline(
+        model_path=str(model_path), compiled_model_path=str(compiled_path)
+    )
+    return joblib.load(model_path), str(compiled_path)
+
+
+def test_compiled_probabilities_are_bit_identical(compiled_models):
+    """The compiled engine reproduces predict_proba and predict exactly."""
+    pipeline, compiled_path = compiled_models
+    compiled = load_compiled_model(compiled_path)
+    X = load_features()
+
+    np.testing.assert_array_equal(compiled.predict_proba(X), pipeline.predict_proba(X))
+    np.testing.assert_array_equal(compiled.predict(X), pipeline.predict(X))
+    np.testing.assert_array_equal(compiled.classes_, pipeline.classes_)
+
+
+def test_compiled_accepts_arrays_in_feature_order(compiled_models):
+    """Plain arrays ordered like feature_names_in_ give the same result as DataFrames."""
+    pipeline, compiled_path = compiled_models
+    compiled = load_compiled_model(compiled_path)
+    X = load_features().iloc[:5]
+
+    matrix = X[list(compiled.feature_names_in_)].to_numpy()
+    np.testing.assert_array_equal(
+        compiled.predict_proba(matrix), pipeline.predict_proba(X)
+    )
+    assert compiled.predict_proba(matrix[0]).shape == (1, 2)
+
+
+def test_load_pipeline_dispatches_npz(compiled_models):
+    """load_pipeline returns the compiled engine for .npz artifacts."""
+    _, compiled_path = compiled_models
+    assert isinstance(load_pipeline(compiled_path), CompiledForest)
+
+
+def test_model_holder_serves_compiled_model(compiled_models):
+    """The API's model holder loads and smoke-tests a compiled artifact."""
+    _, compiled_path = compiled_models
+    loaded = ModelHolder(compiled_path).load()
+    assert isinstance(loaded.pipeline, CompiledForest)
+    assert loaded.feature_names == list(loaded.pipeline.feature_names_in_)
+
+
+def test_directory_layout_is_memory_mapped(compiled_models, tmp_path):
+    """The directory layout loads read-only memory-mapped arrays with the same output."""
+    pipeline, _ = compiled_models
+    arrays_path = tmp_path / "model_arrays"
+    export_compiled_model(pipeline, str(arrays_path))
+
+    compiled = load_pipeline(str(arrays_path))
+    assert isinstance(compiled, CompiledForest)
+    assert isinstance(compiled.value.base, np.memmap)
+    assert not compiled.value.flags.writeable
+
+    X = load_features()
+    np.testing.assert_array_equal(compiled.predict_proba(X), pipeline.predict_proba(X))
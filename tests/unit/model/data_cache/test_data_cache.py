@@ -0,0 +1,82 @@
+import os
+
+import pandas as pd
+
+from src.model import data_cache
+from src.model.data_cache import (
+    cache_path,
+    clear_cache,
+    load_preprocessed_data,
+    warm_cache,
+)
+from src.model.data_ingestion import stream_preprocessed_data
+
+
+def test_load_preprocessed_data_matches_stream(dummy_data_path, tmp_path):
+    """The cached frame equals the freshly preprocessed CSV."""
+    cache_dir = str(tmp_path / "cache")
+    expected = pd.concat(stream_preprocessed_data(dummy_data_path))
+    expected = expected.reset_index(drop=True)
+
+    first = load_preprocessed_data(dummy_data_path, cache_dir)
+    second = load_preprocessed_data(dummy_data_path, cache_dir)
+
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(second, expected)
+
+
+def test_cache_hit_skips_csv_parsing(dummy_data_path, tmp_path, mocker):
+    """A warm cache is loaded without parsing the CSV again."""
+    cache_dir = str(tmp_path / "cache")
+    warm_cache(dummy_data_path, cache_dir)
+    stream_spy = mocker.spy(data_cache, "stream_preprocessed_data")
+
+    load_preprocessed_data(dummy_data_path, cache_dir)
+
+    assert stream_spy.call_count == 0
+
+
+def test_cache_hit_does_not_hash_the_source(dummy_data_path, tmp_path, mocker):
+    """The saved fingerprint is reused until the CSV's size or mtime changes."""
+    cache_dir = str(tmp_path / "cache")
+    warm_cache(dummy_data_path, cache_dir)
+    hash_spy = mocker.spy(data_cache, "source_fingerprint")
+
+    load_preprocessed_data(dummy_data_path, cache_dir)
+    assert hash_spy.call_count == 0
+
+    stat = os.stat(dummy_data_path)
+    os.utime(dummy_data_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    load_preprocessed_data(dummy_data_path, cache_dir)
+    assert hash_spy.call_count == 1
+
+
+def test_changed_source_invalidates_cache(dummy_data_path, tmp_path):
+    """Editing the CSV creates a new cache file and removes the stale one."""
+    cache_dir = str(tmp_path / "cache")
+    old_path = warm_cache(dummy_data_path, cache_dir)
+
+    df = pd.read_csv(dummy_data_path)
+    df.loc[0, "radius_mean"] = 99.0
+    df.to_csv(dummy_data_path, index=False)
+
+    new_path = warm_cache(dummy_data_path, cache_dir)
+    assert new_path != old_path
+    assert new_path == cache_path(dummy_data_path, cache_dir)
+    assert not os.path.exists(old_path)
+    reloaded = load_preprocessed_data(dummy_data_path, cache_dir)
+    assert reloaded.loc[0, "radius_mean"] == 99.0
+
+
+def test_clear_cache(dummy_data_path, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    warm_cache(dummy_data_path, cache_dir)
+    assert clear_cache(cache_dir) == 1
+    assert os.listdir(cache_dir) == []
+
+
+def test_empty_source_is_not_cached(tmp_path):
+    empty_file = tmp_path / "empty.csv"
+    empty_file.write_text("")
+    cache_dir = str(tmp_path / "cache")
+    assert load_preprocessed_data(str(empty_file), cache_dir).empty
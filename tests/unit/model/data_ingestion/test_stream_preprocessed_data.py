@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from src.model.data_ingestion import iter_raw_data, stream_preprocessed_data
+from src.model.data_preprocessing import FEATURE_COLUMNS
+
+
+def test_stream_preprocessed_data_chunks(dummy_data_path):
+    """Chunks are bounded in size, typed and preprocessed."""
+    chunks = list(stream_preprocessed_data(dummy_data_path, chunksize=4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    for chunk in chunks:
+        assert "id" not in chunk.columns
+        assert "Unnamed: 32" not in chunk.columns
+        assert all(chunk[column].dtype == np.float64 for column in FEATURE_COLUMNS)
+        assert isinstance(chunk["diagnosis"].dtype, pd.CategoricalDtype)
+        assert set(chunk["diagnosis"].astype(int)) <= {0, 1}
+
+
+def test_stream_preprocessed_data_float32(dummy_data_path):
+    """float_dtype controls the feature dtype."""
+    chunk = next(stream_preprocessed_data(dummy_data_path, float_dtype="float32"))
+    assert all(chunk[column].dtype == np.float32 for column in FEATURE_COLUMNS)
+
+
+def test_stream_matches_full_load(dummy_data_path):
+    """Concatenated chunks hold the same values as preprocessing the whole file."""
+    streamed = pd.concat(stream_preprocessed_data(dummy_data_path, chunksize=3))
+    full = pd.read_csv(dummy_data_path).drop(columns=["id"])
+
+    np.testing.assert_array_equal(
+        streamed[FEATURE_COLUMNS].to_numpy(), full[FEATURE_COLUMNS].to_numpy()
+    )
+    expected = full["diagnosis"].map({"M": 1, "B": 0}).to_numpy()
+    np.testing.assert_array_equal(
+        streamed["diagnosis"].astype(int).to_numpy(), expected
+    )
+
+
+def test_iter_raw_data_empty_file(tmp_path):
+    """An empty file yields no chunks."""
+    empty_file = tmp_path / "empty.csv"
+    empty_file.write_text("")
+    assert list(iter_raw_data(str(empty_file))) == []
@@ -0,0 +1,37 @@
+import joblib
+import pandas as pd
+
+from src.model.feature_profile import build_feature_profile, load_feature_profile
+
+
+def test_training_saves_profile_of_scaled_features(trained_model_path, dummy_data_path):
+    """The profile covers the scaler's features with its fitted bounds and bins."""
+    profile = load_feature_profile(trained_model_path)
+    scaler = (
+        joblib.load(trained_model_path)
+        .named_steps["preprocessor"]
+        .named_steps["scaler"]
+    )
+
+    assert profile["features"] == list(scaler.feature_names_in_)
+    assert "id" not in profile["features"]
+    assert profile["data_min"] == scaler.data_min_.tolist()
+    assert profile["data_max"] == scaler.data_max_.tolist()
+    for proportions in profile["bin_proportions"]:
+        assert abs(sum(proportions) - 1) < 1e-9
+
+
+def test_profile_statistics(trained_model_path, dummy_data_path):
+    pipeline = joblib.load(trained_model_path)
+    X = pd.read_csv(dummy_data_path).drop(columns="diagnosis")
+    profile = build_feature_profile(pipeline, X, bins=4)
+
+    i = profile["features"].index("radius_mean")
+    assert profile["mean"][i] == X["radius_mean"].mean()
+    assert len(profile["bin_edges"][i]) == 3
+    assert profile["bin_proportions"][i] == [0.3, 0.2, 0.2, 0.3]
+    assert profile["quantiles"][i][3] == X["radius_mean"].median()
+
+
+def test_missing_profile(tmp_path):
+    assert load_feature_profile(str(tmp_path / "model.joblib")) is None
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.metrics import roc_auc_score
+
+from src.model.model_card import (
+    build_model_card,
+    card_path,
+    classification_metrics,
+    curves_path,
+    load_model_card,
+    load_model_curves,
+)
+from src.model.model_registry import resolve_version
+from src.model.model_training import (
+    holdout_split,
+    load_features_and_target,
+    train_and_save_pipeline,
+)
+
+
+@pytest.fixture(scope="module")
+def carded_model(tmp_path_factory):
+    """A pipeline trained on data/data.csv with its model card, also registered."""
+    model_dir = tmp_path_factory.mktemp("models")
+    model_path = str(model_dir / "model.joblib")
+    registry_dir = str(model_dir / "registry")
+    train_and_save_pipeline(
+        model_path=model_path, registry_dir=registry_dir, model_card=True
+    )
+    return model_path, registry_dir
+
+
+def test_classification_metrics_match_scikit_learn():
+    """The rank-based ROC-AUC of every resample equals roc_auc_score, ties included."""
+    rng = np.random.default_rng(0)
+    y = rng.integers(2, size=(20, 30))
+    y[0] = 1
+    proba = np.round(rng.random((20, 30)), 1)
+
+    roc_auc = classification_metrics(y, proba)["roc_auc"]
+
+    assert np.isnan(roc_auc[0])  # a single class has no ROC-AUC
+    np.testing.assert_allclose(
+        roc_auc[1:], [roc_auc_score(t, p) for t, p in zip(y[1:], proba[1:])]
+    )
+
+
+def test_model_card_is_saved_with_the_model(carded_model):
+    model_path, registry_dir = carded_model
+    card = load_model_card(model_path)
+
+    assert card["test_rows"] == 114
+    assert np.sum(card["confusion_matrix"]["matrix"]) == card["test_rows"]
+    for name, interval in card["confidence_intervals"].items():
+        assert interval["low"] <= card["metrics"][name] <= interval["high"]
+    importance = card["permutation_importance"]["features"]
+    assert len(importance) == 30
+    drops = [entry["roc_auc_drop_mean"] for entry in importance]
+    assert drops == sorted(drops, reverse=True)
+
+    curves = load_model_curves(model_path)
+    assert curves["roc_fpr"][0] == 0 and curves["roc_tpr"][-1] == 1
+    assert curves["permutation_roc_auc_drops"].shape == (30, 10)
+    assert len(curves["calibration_prob_true"]) <= 10
+
+    # Registered versions keep their own copy of the card
+    version_path = resolve_version(registry_dir)
+    assert os.path.exists(card_path(version_path))
+    assert os.path.exists(curves_path(version_path))
+
+
+def test_model_card_does_not_depend_on_the_number_of_workers(carded_model):
+    model_path, _ = carded_model
+    X, y = load_features_and_target()
+    _, X_test, _, y_test = holdout_split(model_path, X, y)
+
+    single, _ = build_model_card(model_path, X_test, y_test, workers=1)
+    pooled, _ = build_model_card(model_path, X_test, y_test, workers=2)
+
+    assert pooled["workers"] == 2
+    assert single["confidence_intervals"] == pooled["confidence_intervals"]
+    assert single["permutation_importance"] == pooled["permutation_importance"]
@@ -0,0 +1,106 @@
+import json
+import os
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.model.compiled_model import load_compiled_model
+from src.model.data_ingestion import load_raw_data
+from src.model.data_preprocessing import (
+    map_diagnosis_to_numerical,
+    prepare_features_and_target,
+)
+from src.model.feature_profile import profile_path
+from src.model.model_compression import (
+    compress_and_save_pipeline,
+    greedy_tree_selection,
+    out_of_bag_mask,
+)
+from src.model.model_training import train_and_save_pipeline
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory):
+    """A pipeline trained on data/data.csv."""
+    path = tmp_path_factory.mktemp("models") / "model.joblib"
+    train_and_save_pipeline(model_path=str(path))
+    return str(path)
+
+
+def test_out_of_bag_mask_matches_scikit_learn():
+    """Averaging every tree over its out-of-bag rows reproduces oob_decision_function_."""
+    X, y = prepare_features_and_target(map_diagnosis_to_numerical(load_raw_data()))
+    X = X.drop(columns=["id", "Unnamed: 32"]).to_numpy()
+    forest = RandomForestClassifier(n_estimators=30, oob_score=True, random_state=0)
+    forest.fit(X, y)
+
+    mask = out_of_bag_mask(forest, len(X))
+    proba = np.array([tree.predict_proba(X)[:, 1] for tree in forest.estimators_])
+    oob = (proba * mask).sum(axis=0) / mask.sum(axis=0)
+    np.testing.assert_allclose(oob, forest.oob_decision_function_[:, 1])
+
+    order, curve = greedy_tree_selection(forest, X, y.to_numpy(), mask)
+    assert sorted(order) == list(range(30))
+    assert [point["trees"] for point in curve] == list(range(1, 31))
+
+
+def test_compression_saves_the_fastest_qualifying_variant(model_path, tmp_path):
+    """The report covers every candidate and the saved pipeline is the chosen one."""
+    output = str(tmp_path / "compressed.joblib")
+    report = compress_and_save_pipeline(
+        model_path=model_path, output_path=output, latency_repeats=5
+    )
+
+    candidates = {entry["name"]: entry for entry in report["candidates"]}
+    assert set(candidates) == {
+        "original",
+        "reference",
+        "top_k_trees",
+        "depth_4",
+        "depth_6",
+        "depth_8",
+        "distilled_tree",
+        "distilled_logistic",
+    }
+    chosen = candidates[report["chosen"]]
+    assert report["chosen"] == "original" or chosen["qualifies"]
+    assert chosen["latency_1_row_ms"] == min(
+        entry["latency_1_row_ms"]
+        for entry in candidates.values()
+        if entry.get("qualifies") or entry["name"] == "original"
+    )
+    assert candidates["top_k_trees"]["trees"] == report["top_k_trees"]
+    saved = joblib.load(output).named_steps["classifier"]
+    assert len(getattr(saved, "estimators_", [])) == chosen.get("trees", 0)
+    with open(os.path.splitext(output)[0] + ".compression.json") as f:
+        assert json.load(f)["chosen"] == report["chosen"]
+    assert os.path.exists(profile_path(output))
+
+
+def test_compressed_variant_is_a_drop_in_pipeline(model_path, tmp_path):
+    """A forced variant keeps the preprocessor and can still be compiled."""
+    output = str(tmp_path / "compressed.joblib")
+    compiled = str(tmp_path / "compressed.npz")
+    report = compress_and_save_pipeline(
+        model_path=model_path,
+        output_path=output,
+        trees=10,
+        variant="top_k_trees",
+        compiled_model_path=compiled,
+        latency_repeats=5,
+    )
+
+    assert report["chosen"] == "top_k_trees"
+    pipeline = joblib.load(output)
+    assert len(pipeline.named_steps["classifier"].estimators_) == 10
+    X, _ = prepare_features_and_target(map_diagnosis_to_numerical(load_raw_data()))
+    proba = pipeline.predict_proba(X)
+    assert proba.shape == (len(X), 2)
+    np.testing.assert_array_equal(load_compiled_model(compiled).predict_proba(X), proba)
+
+    with pytest.raises(ValueError, match="Unknown variant"):
+        compress_and_save_pipeline(
+            model_path=model_path, output_path=output, variant="tiny"
+        )
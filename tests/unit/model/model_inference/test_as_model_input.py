@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from src.model.compiled_model import export_compiled_model
+from src.model.model_inference import as_model_input, load_pipeline
+
+
+def test_pipeline_input_is_a_named_dataframe(trained_model_path):
+    """scikit-learn pipelines get a DataFrame with the feature names as columns."""
+    pipeline = load_pipeline(trained_model_path)
+    names = list(pipeline.feature_names_in_)
+    features = np.ones((2, len(names)))
+
+    model_input = as_model_input(pipeline, features, names)
+    assert isinstance(model_input, pd.DataFrame)
+    assert list(model_input.columns) == names
+
+
+def test_compiled_model_input_is_the_array(trained_model_path, tmp_path):
+    """Compiled models get the feature matrix without a pandas round trip."""
+    compiled_path = str(tmp_path / "model.npz")
+    export_compiled_model(load_pipeline(trained_model_path), compiled_path)
+    compiled = load_pipeline(compiled_path)
+    names = list(compiled.feature_names_in_)
+    features = np.ones((2, len(names)))
+
+    assert as_model_input(compiled, features, names) is features
@@ -0,0 +1,78 @@
+import os
+
+import joblib
+import pytest
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+import src.model.model_inference as model_inference
+from src.model.model_inference import get_pipeline, invalidate_pipeline_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Ensures every test starts and ends with an empty pipeline cache."""
+    invalidate_pipeline_cache()
+    yield
+    invalidate_pipeline_cache()
+
+
+def test_get_pipeline_loads_once(tmp_path, mocker):
+    """Repeated calls for an unchanged file only unpickle it once."""
+    model_path = tmp_path / "model.joblib"
+    joblib.dump(StandardScaler(), model_path)
+    load_spy = mocker.spy(model_inference, "load_pipeline")
+
+    first = get_pipeline(str(model_path))
+    second = get_pipeline(str(model_path))
+
+    assert first is second
+    assert load_spy.call_count == 1
+
+
+def test_get_pipeline_reloads_changed_file(tmp_path):
+    """A rewritten model file (new mtime/size) is loaded again."""
+    model_path = tmp_path / "model.joblib"
+    joblib.dump(StandardScaler(), model_path)
+    assert isinstance(get_pipeline(str(model_path)), StandardScaler)
+
+    joblib.dump(MinMaxScaler(), model_path)
+    stat = os.stat(model_path)
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert isinstance(get_pipeline(str(model_path)), MinMaxScaler)
+
+
+def test_get_pipeline_lru_eviction(tmp_path, mocker):
+    """Only MAX_CACHED_PIPELINES pipelines are kept; the oldest is evicted."""
+    mocker.patch.object(model_inference, "MAX_CACHED_PIPELINES", 2)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"model_{i}.joblib"
+        joblib.dump(StandardScaler(), path)
+        paths.append(str(path))
+        get_pipeline(str(path))
+
+    load_spy = mocker.spy(model_inference, "load_pipeline")
+    get_pipeline(paths[2])
+    assert load_spy.call_count == 0
+    get_pipeline(paths[0])
+    assert load_spy.call_count == 1
+
+
+def test_invalidate_pipeline_cache(tmp_path, mocker):
+    """An invalidated path is loaded from disk again on the next call."""
+    model_path = tmp_path / "model.joblib"
+    joblib.dump(StandardScaler(), model_path)
+    get_pipeline(str(model_path))
+    load_spy = mocker.spy(model_inference, "load_pipeline")
+
+    invalidate_pipeline_cache(str(model_path))
+    get_pipeline(str(model_path))
+
+    assert load_spy.call_count == 1
+
+
+def test_get_pipeline_missing_file():
+    """A missing file raises the same FileNotFoundError as load_pipeline."""
+    with pytest.raises(FileNotFoundError, match="Model pipeline not found"):
+        get_pipeline("non_existent_path/model.joblib")
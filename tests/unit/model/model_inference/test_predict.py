@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import src.model.model_inference as model_inference
 
@@ -43,9 +44,10 @@ def test_predict_function_with_mocker(mocker):
     expected_prediction = [0]
 
     # Create a mock for the pipeline object that the 'load_pipeline' function in
-    # model_inference.py would return
+    # model_inference.py would return. The label is derived from predict_proba.
     mock_pipeline = mocker.MagicMock()
-    mock_pipeline.predict.return_value = expected_prediction
+    mock_pipeline.predict_proba.return_value = np.array([[0.8, 0.2]])
+    mock_pipeline.classes_ = np.array([0, 1])
 
     # Patch 'load_pipeline' to return our mock pipeline
     mock_load_pipeline = mocker.patch(
@@ -60,7 +62,8 @@ def test_predict_function_with_mocker(mocker):
     # Assertions
     # 1. The 'load_pipeline' function was called once with the correct path
     mock_load_pipeline.assert_called_once_with("dummy/path.joblib")
-    # 2. The 'predict' function of the mock pipeline was called once with the correct data
-    mock_pipeline.predict.assert_called_once_with(sample_data)
+    # 2. 'predict_proba' was called once with the correct data, and 'predict' never
+    mock_pipeline.predict_proba.assert_called_once_with(sample_data)
+    mock_pipeline.predict.assert_not_called()
     # 3. The prediction result is as expected
     assert prediction_result == expected_prediction
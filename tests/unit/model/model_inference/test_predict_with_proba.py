@@ -0,0 +1,37 @@
+import joblib
+import numpy as np
+
+from src.model.data_ingestion import load_raw_data
+from src.model.data_preprocessing import (
+    map_diagnosis_to_numerical,
+    prepare_features_and_target,
+)
+from src.model.model_inference import predict_with_proba
+
+
+def test_predict_with_proba_matches_predict(trained_model_path, dummy_data_path):
+    """Labels and probabilities are identical to predict() and predict_proba()."""
+    pipeline = joblib.load(trained_model_path)
+    X, _ = prepare_features_and_target(
+        map_diagnosis_to_numerical(load_raw_data(dummy_data_path))
+    )
+
+    labels, proba = predict_with_proba(pipeline, X)
+
+    np.testing.assert_array_equal(labels, pipeline.predict(X))
+    np.testing.assert_array_equal(proba, pipeline.predict_proba(X))
+    assert labels.dtype == pipeline.predict(X).dtype
+
+
+def test_predict_with_proba_calls_forest_once(mocker):
+    """Only predict_proba is called; the label is mapped through classes_."""
+    pipeline = mocker.MagicMock()
+    pipeline.predict_proba.return_value = np.array([[0.3, 0.7], [0.6, 0.4]])
+    pipeline.classes_ = np.array([0, 1])
+
+    labels, proba = predict_with_proba(pipeline, "data")
+
+    pipeline.predict_proba.assert_called_once_with("data")
+    pipeline.predict.assert_not_called()
+    np.testing.assert_array_equal(labels, [1, 0])
+    np.testing.assert_array_equal(proba, [[0.3, 0.7], [0.6, 0.4]])
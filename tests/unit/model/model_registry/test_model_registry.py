@@ -0,0 +1,89 @@
+import json
+import os
+
+import joblib
+import pytest
+
+from src.model.model_registry import (
+    activate_version,
+    current_version,
+    garbage_collect,
+    list_versions,
+    register_model,
+    resolve_version,
+    rollback,
+)
+from src.model.model_training import train_and_save_pipeline
+
+
+@pytest.fixture
+def two_pipelines(trained_model_path):
+    """Two different fitted pipelines (the second one has fewer trees)."""
+    first = joblib.load(trained_model_path)
+    second = joblib.load(trained_model_path)
+    second.named_steps["classifier"].estimators_ = second.named_steps[
+        "classifier"
+    ].estimators_[:10]
+    return first, second
+
+
+def test_register_stores_content_addressed_version(two_pipelines, tmp_path):
+    """Versions are named by content hash; registering the same content is a no-op."""
+    registry = str(tmp_path / "registry")
+    first, _ = two_pipelines
+    version = register_model(first, registry, metadata={"metrics": {"accuracy": 0.9}})
+
+    assert register_model(first, registry) == version
+    assert current_version(registry) == version
+    assert resolve_version(registry) == resolve_version(registry, version)
+    (entry,) = list_versions(registry)
+    assert entry["version"] == version
+    assert entry["metrics"] == {"accuracy": 0.9}
+
+
+def test_rollback_flips_current_pointer(two_pipelines, tmp_path):
+    """rollback() re-activates the previously current version."""
+    registry = str(tmp_path / "registry")
+    first, second = two_pipelines
+    v1 = register_model(first, registry)
+    v2 = register_model(second, registry)
+    assert v1 != v2
+    assert current_version(registry) == v2
+
+    assert rollback(registry) == v1
+    assert current_version(registry) == v1
+    with pytest.raises(FileNotFoundError):
+        activate_version("does-not-exist", registry)
+
+
+def test_garbage_collect_keeps_recent_and_current(two_pipelines, tmp_path):
+    """Old versions are deleted, but never the current one."""
+    registry = str(tmp_path / "registry")
+    first, second = two_pipelines
+    v1 = register_model(first, registry)
+    v2 = register_model(second, registry, activate=False)
+
+    assert garbage_collect(registry, keep=0) == [v2]
+    assert [entry["version"] for entry in list_versions(registry)] == [v1]
+
+
+def test_training_registers_version_with_metadata(dummy_data_path, tmp_path):
+    """train_and_save_pipeline records data fingerprint, metrics and hyperparameters."""
+    registry = str(tmp_path / "registry")
+    train_and_save_pipeline(
+        data_path=dummy_data_path,
+        model_path=str(tmp_path / "model.joblib"),
+        registry_dir=registry,
+    )
+
+    version = current_version(registry)
+    with open(os.path.join(registry, "versions", version, "metadata.json")) as f:
+        metadata = json.load(f)
+    assert len(metadata["data_fingerprint"]) == 16
+    assert "accuracy" in metadata["metrics"]
+    assert metadata["hyperparameters"]["random_state"] == 42
+    assert metadata["training_seconds"] >= 0
+    # The feature profile is stored with the version, next to the artifact
+    assert os.path.exists(
+        os.path.join(registry, "versions", version, "model.profile.json")
+    )
@@ -0,0 +1,99 @@
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.model.model_training import (
+    extend_scaler_ranges,
+    incremental_train_and_save_pipeline,
+    search_and_save_pipeline,
+    train_and_save_pipeline,
+)
+
+
+def append_rows(data_path, n_rows, scale=1.0):
+    """Appends copies of the first rows (numeric columns times scale) to the CSV."""
+    df = pd.read_csv(data_path)
+    extra = df.head(n_rows).copy()
+    numeric = extra.columns.drop(["id", "diagnosis"])
+    extra[numeric] = extra[numeric] * scale
+    extra["id"] = extra["id"] + len(df)
+    pd.concat([df, extra]).to_csv(data_path, index=False)
+
+
+def test_appended_rows_grow_the_forest(dummy_data_path, tmp_path):
+    """Only new trees are trained when rows are appended, and the report compares with a full retrain."""
+    model_path = str(tmp_path / "model.joblib")
+    train_and_save_pipeline(data_path=dummy_data_path, model_path=model_path)
+    append_rows(dummy_data_path, 6)
+
+    report = incremental_train_and_save_pipeline(
+        data_path=dummy_data_path, model_path=model_path, new_trees=7
+    )
+
+    assert report["mode"] == "incremental"
+    assert report["new_rows"] == 6
+    assert report["trees"] == 107
+    assert not report["scaler_refit"]
+    assert "accuracy_difference" in report
+    assert len(joblib.load(model_path).named_steps["classifier"].estimators_) == 107
+
+    again = incremental_train_and_save_pipeline(
+        data_path=dummy_data_path, model_path=model_path
+    )
+    assert again == {"mode": "unchanged", "rows": 16}
+
+
+def test_edited_data_falls_back_to_full_retrain(dummy_data_path, tmp_path):
+    model_path = str(tmp_path / "model.joblib")
+    train_and_save_pipeline(data_path=dummy_data_path, model_path=model_path)
+    df = pd.read_csv(dummy_data_path)
+    df.loc[0, "radius_mean"] = 99.0
+    df.to_csv(dummy_data_path, index=False)
+
+    report = incremental_train_and_save_pipeline(
+        data_path=dummy_data_path, model_path=model_path
+    )
+    assert report["mode"] == "full"
+
+
+def test_searched_model_keeps_its_hyperparameters(dummy_data_path, tmp_path):
+    """A tuned forest is extended incrementally, and a full retrain reuses its parameters."""
+    model_path = str(tmp_path / "model.joblib")
+    search_and_save_pipeline(
+        data_path=dummy_data_path,
+        model_path=model_path,
+        n_iter=2,
+        cv=2,
+        n_jobs=1,
+        scoring="accuracy",
+    )
+    tuned = joblib.load(model_path).named_steps["classifier"].get_params()
+    append_rows(dummy_data_path, 6)
+
+    report = incremental_train_and_save_pipeline(
+        data_path=dummy_data_path, model_path=model_path, new_trees=3
+    )
+    assert report["mode"] == "incremental"
+    assert report["trees"] == tuned["n_estimators"] + 3
+
+    df = pd.read_csv(dummy_data_path)
+    df.loc[0, "radius_mean"] = 99.0
+    df.to_csv(dummy_data_path, index=False)
+    report = incremental_train_and_save_pipeline(
+        data_path=dummy_data_path, model_path=model_path
+    )
+    assert report["mode"] == "full"
+    params = joblib.load(model_path).named_steps["classifier"].get_params()
+    assert params == {**tuned, "n_estimators": tuned["n_estimators"] + 3}
+
+
+def test_scaler_refit_keeps_existing_trees(trained_model_path, dummy_data_path):
+    """Widening the scaler bounds remaps thresholds, so old trees decide the same way."""
+    pipeline = joblib.load(trained_model_path)
+    X = pd.read_csv(dummy_data_path).drop(columns="diagnosis")
+    wider = pd.concat([X, X * 3])
+    before = pipeline.predict_proba(wider)
+
+    assert extend_scaler_ranges(pipeline, wider)
+    np.testing.assert_allclose(pipeline.predict_proba(wider), before)
+    assert not extend_scaler_ranges(pipeline, X)
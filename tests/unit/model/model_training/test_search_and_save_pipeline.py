@@ -0,0 +1,49 @@
+import json
+
+import joblib
+import pytest
+
+from src.model.model_training import search_and_save_pipeline
+from src.model.pipeline_utils import create_hyperparameter_search
+
+
+def run_search(dummy_data_path, tmp_path, name, strategy="random"):
+    model_path = tmp_path / name / "model.joblib"
+    report = search_and_save_pipeline(
+        data_path=dummy_data_path,
+        model_path=str(model_path),
+        strategy=strategy,
+        n_iter=3,
+        cv=2,
+        n_jobs=1,
+        scoring="accuracy",
+    )
+    return model_path, report
+
+
+def test_search_saves_model_and_report(dummy_data_path, tmp_path):
+    """The best pipeline and a JSON report are written next to each other."""
+    model_path, report = run_search(dummy_data_path, tmp_path, "run")
+
+    assert model_path.is_file()
+    assert hasattr(joblib.load(model_path), "predict")
+
+    report_path = model_path.with_suffix(".search.json")
+    assert json.loads(report_path.read_text())["best_params"] == report["best_params"]
+    assert report["n_candidates"] == 3
+    assert report["cv_folds"] == 2
+    assert len(report["top_candidates"]) == 3
+    assert report["top_candidates"][0]["rank"] == 1
+
+
+def test_search_is_reproducible(dummy_data_path, tmp_path):
+    """Two searches with the same seed select the same candidate and scores."""
+    _, first = run_search(dummy_data_path, tmp_path, "first")
+    _, second = run_search(dummy_data_path, tmp_path, "second")
+    assert first["best_params"] == second["best_params"]
+    assert first["top_candidates"] == second["top_candidates"]
+
+
+def test_create_hyperparameter_search_rejects_unknown_strategy():
+    with pytest.raises(ValueError, match="Unknown search strategy"):
+        create_hyperparameter_search(strategy="grid")
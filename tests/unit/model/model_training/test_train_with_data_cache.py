@@ -0,0 +1,34 @@
+import joblib
+import numpy as np
+
+from src.model.model_training import load_train_test_split, train_and_save_pipeline
+
+
+def test_cached_split_matches_csv_split(dummy_data_path, tmp_path, monkeypatch):
+    """The cached path yields the same features and target as parsing the CSV."""
+    monkeypatch.chdir(tmp_path)  # the default cache directory is relative
+    X_train, X_test, y_train, y_test = load_train_test_split(dummy_data_path)
+    cX_train, cX_test, cy_train, cy_test = load_train_test_split(
+        dummy_data_path, use_data_cache=True
+    )
+
+    assert (tmp_path / "data" / ".cache").is_dir()
+    np.testing.assert_array_equal(
+        cX_train.to_numpy(), X_train.drop(columns="id").to_numpy()
+    )
+    np.testing.assert_array_equal(
+        cX_test.to_numpy(), X_test.drop(columns="id").to_numpy()
+    )
+    np.testing.assert_array_equal(cy_train.astype(int), y_train)
+    np.testing.assert_array_equal(cy_test.astype(int), y_test)
+
+
+def test_train_and_save_pipeline_with_data_cache(
+    dummy_data_path, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    model_path = tmp_path / "models" / "model.joblib"
+    train_and_save_pipeline(
+        data_path=dummy_data_path, model_path=str(model_path), use_data_cache=True
+    )
+    assert "id" not in joblib.load(model_path).feature_names_in_
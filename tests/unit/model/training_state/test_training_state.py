@@ -0,0 +1,51 @@
+import pandas as pd
+
+from src.model.training_state import (
+    appended_rows_start,
+    block_fingerprints,
+    load_training_state,
+    save_training_state,
+)
+
+
+def make_rows(n_rows):
+    X = pd.DataFrame({"a": [float(i) for i in range(n_rows)], "b": range(n_rows)})
+    y = pd.Series([i % 2 for i in range(n_rows)], name="diagnosis")
+    return X, y
+
+
+def test_block_fingerprints_cover_all_rows():
+    X, y = make_rows(10)
+    blocks = block_fingerprints(X, y, block_rows=4)
+    assert len(blocks) == 3
+    assert blocks == block_fingerprints(X.copy(), y.copy(), block_rows=4)
+
+
+def test_appended_rows_are_detected(tmp_path):
+    """Rows appended after the saved state start at the old row count."""
+    model_path = str(tmp_path / "model.joblib")
+    X, y = make_rows(10)
+    save_training_state(model_path, X, y, test_rows=[3, 1], block_rows=4)
+    state = load_training_state(model_path)
+    assert state["test_rows"] == [1, 3]
+
+    X_more, y_more = make_rows(15)
+    assert appended_rows_start(state, X_more, y_more) == 10
+    assert appended_rows_start(state, X, y) == 10
+
+
+def test_edited_or_removed_rows_are_not_an_append(tmp_path):
+    model_path = str(tmp_path / "model.joblib")
+    X, y = make_rows(10)
+    save_training_state(model_path, X, y, test_rows=[], block_rows=4)
+    state = load_training_state(model_path)
+
+    edited = X.copy()
+    edited.loc[2, "a"] = -1.0
+    assert appended_rows_start(state, edited, y) is None
+    assert appended_rows_start(state, X.iloc[:8], y.iloc[:8]) is None
+    assert appended_rows_start(state, X[["b", "a"]], y) is None
+
+
+def test_missing_state(tmp_path):
+    assert load_training_state(str(tmp_path / "model.joblib")) is None
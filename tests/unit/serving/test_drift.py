@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from src.serving.drift import DriftMonitor
+
+FEATURE_NAMES = ["id", "a", "b"]
+
+
+@pytest.fixture
+def profile():
+    """Reference profile of features a and b, both uniform over 0..99."""
+    reference = np.arange(100.0)
+    edges = np.quantile(reference, np.linspace(0, 1, 5)[1:-1]).tolist()
+    proportions = (np.bincount(np.searchsorted(edges, reference)) / 100).tolist()
+    return {
+        "features": ["a", "b"],
+        "n_rows": 100,
+        "mean": [reference.mean()] * 2,
+        "std": [reference.std()] * 2,
+        "quantile_levels": [0.05, 0.5, 0.95],
+        "quantiles": [np.quantile(reference, [0.05, 0.5, 0.95]).tolist()] * 2,
+        "data_min": [0.0, 0.0],
+        "data_max": [99.0, 99.0],
+        "bin_edges": [edges, edges[:1]],
+        "bin_proportions": [proportions, [0.25, 0.75]],
+    }
+
+
+def rows(a, b):
+    return np.column_stack([np.zeros(len(a)), a, b])
+
+
+def test_running_mean_and_variance_match_numpy(profile):
+    """Row-by-row and batched updates give the exact mean and variance."""
+    rng = np.random.default_rng(0)
+    a, b = rng.uniform(0, 99, 500), rng.normal(50, 10, 500)
+    monitor = DriftMonitor(profile, FEATURE_NAMES)
+    monitor.update(rows(a[:1], b[:1]))
+    monitor.update(rows(a[1:300], b[1:300]))
+    for i in range(300, 500):
+        monitor.update(rows(a[i : i + 1], b[i : i + 1]))
+
+    report = monitor.report()
+    assert report["n_samples"] == 500
+    assert report["features"]["a"]["mean"] == pytest.approx(a.mean())
+    assert report["features"]["a"]["std"] == pytest.approx(a.std())
+    assert report["features"]["b"]["std"] == pytest.approx(b.std())
+
+
+def test_same_distribution_does_not_drift(profile):
+    monitor = DriftMonitor(profile, FEATURE_NAMES)
+    values = np.arange(100.0)
+    monitor.update(rows(values, values))
+
+    report = monitor.report()
+    assert report["drifted_features"] == []
+    assert report["features"]["a"]["psi"] == pytest.approx(0.0)
+    assert report["features"]["a"]["quantiles"]["0.5"] == pytest.approx(49.5, abs=1)
+
+
+def test_shifted_feature_drifts_and_counts_out_of_range(profile):
+    monitor = DriftMonitor(profile, FEATURE_NAMES)
+    values = np.arange(100.0)
+    monitor.update(rows(values + 50, values))
+
+    report = monitor.report()
+    assert report["drifted_features"] == ["a"]
+    assert report["features"]["a"]["out_of_range_high"] == 50
+    assert report["features"]["a"]["out_of_range_low"] == 0
+    assert report["features"]["a"]["out_of_range_rate"] == 0.5
+
+
+def test_drift_needs_min_samples(profile):
+    monitor = DriftMonitor(profile, FEATURE_NAMES, min_samples=100)
+    monitor.update(rows(np.full(10, 500.0), np.zeros(10)))
+    assert monitor.report()["drifted_features"] == []
+
+
+def test_memory_is_constant(profile):
+    monitor = DriftMonitor(profile, FEATURE_NAMES)
+    shapes = [array.shape for array in (monitor.counts, monitor.mean, monitor.m2)]
+    monitor.update(rows(np.arange(10_000.0), np.arange(10_000.0)))
+    assert [a.shape for a in (monitor.counts, monitor.mean, monitor.m2)] == shapes
@@ -0,0 +1,103 @@
+import time
+
+import pytest
+
+from src.model.model_inference import as_model_input, predict_with_proba
+from src.serving.experiments import (
+    PRIMARY,
+    ExperimentStats,
+    Experiments,
+    parse_models,
+    parse_weighted_models,
+)
+from src.serving.model_state import ModelHolder
+
+
+def wait_for_comparisons(experiments, timeout=10):
+    """Waits until every queued background comparison has finished."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if experiments._pending == 0:
+            return
+        time.sleep(0.01)
+    raise TimeoutError("Background comparisons did not finish.")
+
+
+@pytest.fixture
+def holder(trained_model_path):
+    holder = ModelHolder(trained_model_path)
+    holder.load()
+    return holder
+
+
+def test_stats_are_bounded():
+    """Only the last max_records observations per model are summarized."""
+    stats = ExperimentStats(max_records=3)
+    for seconds in (1.0, 1.0, 0.001, 0.001, 0.001):
+        stats.record_latency("a", seconds)
+    stats.record_comparison("a", True, 0.5)
+    stats.record_comparison("a", False, 0.1)
+
+    summary = stats.summary()["a"]
+    assert summary["latency_ms"]["n"] == 3
+    assert summary["latency_ms"]["p99"] == pytest.approx(1.0)
+    assert summary["compared"] == 2
+    assert summary["disagreement_rate"] == 0.5
+    assert summary["mean_abs_probability_diff"] == pytest.approx(0.3)
+
+
+def test_canary_weights_must_not_exceed_one(holder):
+    with pytest.raises(ValueError):
+        Experiments(canaries=[("a", holder, 0.7), ("b", holder, 0.4)])
+
+
+def test_choose_splits_traffic_by_weight(holder, mocker):
+    """A draw below the canary weight goes to the canary, the rest to the primary."""
+    experiments = Experiments(canaries=[("canary", holder, 0.25)])
+    primary = object()
+
+    mocker.patch("src.serving.experiments.random.random", return_value=0.1)
+    assert experiments.choose(primary) == ("canary", holder.current)
+    mocker.patch("src.serving.experiments.random.random", return_value=0.9)
+    assert experiments.choose(primary) == (PRIMARY, primary)
+
+
+def test_unloaded_canary_falls_back_to_primary(tmp_path, mocker):
+    experiments = Experiments(
+        canaries=[("canary", ModelHolder(str(tmp_path / "missing.joblib")), 1.0)]
+    )
+    mocker.patch("src.serving.experiments.random.random", return_value=0.0)
+    primary = object()
+    assert experiments.choose(primary) == (PRIMARY, primary)
+
+
+def test_shadow_is_compared_in_background(holder, sample_payload):
+    """The shadow scores the payload off the request path and records the comparison."""
+    experiments = Experiments(shadows=[("shadow", holder)])
+    loaded = holder.current
+    row = loaded.decoder.decode(sample_payload)
+    labels, proba = predict_with_proba(
+        loaded.pipeline, as_model_input(loaded.pipeline, row, loaded.feature_names)
+    )
+    experiments.compare_in_background(PRIMARY, sample_payload, labels, proba, loaded)
+    wait_for_comparisons(experiments)
+
+    summary = experiments.summary()["models"]["shadow"]
+    assert summary["compared"] == 1
+    assert summary["disagreement_rate"] == 0.0
+    assert summary["latency_ms"]["n"] == 1
+
+
+def test_comparisons_are_dropped_when_backlogged(holder, sample_payload):
+    """Past max_pending queued jobs, comparisons are dropped and counted."""
+    experiments = Experiments(shadows=[("shadow", holder)], max_pending=0)
+    experiments.compare_in_background(PRIMARY, sample_payload, [0], [[1.0, 0.0]], None)
+    assert experiments.dropped == 1
+    assert experiments._executor is None
+
+
+def test_parse_model_specs():
+    assert parse_models(" a.joblib, b.joblib ,") == ["a.joblib", "b.joblib"]
+    assert parse_weighted_models("a=0.1,b=0.05") == [("a", 0.1), ("b", 0.05)]
+    with pytest.raises(ValueError):
+        parse_weighted_models("a")
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from src.schemas import FEATURE_NAMES, PredictRequest
+from src.serving.decoding import FeatureDecoder
+
+MODEL_FEATURES = ["id", *FEATURE_NAMES, "Unnamed: 32"]
+
+
+def reference_row(data):
+    """The row the original pydantic + DataFrame alignment path produced."""
+    payload = PredictRequest.model_validate(data).model_dump(by_alias=True)
+    return np.array([[payload.get(name, 0) for name in MODEL_FEATURES]], dtype=float)
+
+
+def test_decode_orders_features_like_the_model(sample_payload):
+    """Values land in the model's column order; unknown model columns are 0."""
+    row = FeatureDecoder(MODEL_FEATURES).decode(sample_payload)
+    assert row.dtype == np.float64
+    assert row.shape == (1, len(MODEL_FEATURES))
+    np.testing.assert_array_equal(row, reference_row(sample_payload))
+    assert row[0, 0] == 0 and row[0, -1] == 0
+
+
+@pytest.mark.parametrize(
+    "override",
+    [
+        {"radius_mean": "17.99"},  # numeric string, coerced by pydantic
+        {"radius_mean": True},  # bool, coerced by pydantic
+        {"radius_mean": 18},  # int
+        {"radius_mean": float("inf")},  # allowed by the schema
+    ],
+)
+def test_decode_coercions_match_pydantic(sample_payload, override):
+    """Inputs outside the fast path are coerced exactly like the schema does."""
+    data = {**sample_payload, **override}
+    np.testing.assert_array_equal(
+        FeatureDecoder(MODEL_FEATURES).decode(data), reference_row(data)
+    )
+
+
+def test_decode_accepts_pythonic_names(sample_payload):
+    """populate_by_name payloads still decode (through the schema)."""
+    data = dict(sample_payload)
+    data["concave_points_mean"] = data.pop("concave points_mean")
+    np.testing.assert_array_equal(
+        FeatureDecoder(MODEL_FEATURES).decode(data), reference_row(sample_payload)
+    )
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda d: d.update(radius_mean=-1.0),
+        lambda d: d.update(radius_mean=float("nan")),
+        lambda d: d.update(radius_mean=None),
+        lambda d: d.update(radius_mean="abc"),
+        lambda d: d.update(radius_mean=10**400),
+        lambda d: d.update(unexpected=1.0),
+        lambda d: d.pop("area_worst"),
+    ],
+)
+def test_decode_errors_match_pydantic(sample_payload, mutate):
+    """Invalid payloads raise the same ValidationError details as the schema."""
+    data = dict(sample_payload)
+    mutate(data)
+
+    with pytest.raises(ValidationError) as expected:
+        PredictRequest.model_validate(data)
+    with pytest.raises(ValidationError) as actual:
+        FeatureDecoder(MODEL_FEATURES).decode(data)
+
+    assert repr(actual.value.errors()) == repr(expected.value.errors())
+
+
+def test_decode_rejects_non_objects():
+    """Non-object bodies produce the schema's model_type error."""
+    with pytest.raises(ValidationError) as e:
+        FeatureDecoder(MODEL_FEATURES).decode([1, 2, 3])
+    assert e.value.errors()[0]["type"] == "model_type"
+
+
+def test_decode_many_matches_single_decoding(sample_payload):
+    """Fast-path and schema-path records decode like decode(); rejected ones stay 0."""
+    pythonic = dict(sample_payload)
+    pythonic["concave_points_mean"] = pythonic.pop("concave points_mean")
+    negative = {**sample_payload, "radius_mean": -1.0}
+    missing = {k: v for k, v in sample_payload.items() if k != "area_worst"}
+    records = [sample_payload, pythonic, {**sample_payload, "radius_mean": "18"}]
+
+    matrix, row_errors = FeatureDecoder(MODEL_FEATURES).decode_many(
+        [*records, negative, missing]
+    )
+
+    for index, record in enumerate(records):
+        np.testing.assert_array_equal(matrix[index : index + 1], reference_row(record))
+    # Numeric checks of fast-path records are left to the matrix validator
+    assert matrix[3, MODEL_FEATURES.index("radius_mean")] == -1.0
+    assert list(row_errors) == [4]
+    assert row_errors[4][0]["loc"] == ("area_worst",)
+    assert not matrix[4].any()
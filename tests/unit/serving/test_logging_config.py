@@ -0,0 +1,99 @@
+import json
+import logging
+import os
+
+import pytest
+
+from src.serving.logging_config import (
+    REQUEST_LOGGER,
+    JsonFormatter,
+    RequestSampler,
+    configure_logging,
+    stop_logging,
+    worker_log_file,
+)
+
+
+def make_record(name, level, msg="message", **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    """Fields passed through extra= end up as top-level JSON keys."""
+    entry = json.loads(
+        JsonFormatter().format(
+            make_record(
+                REQUEST_LOGGER,
+                logging.INFO,
+                "Prediction successful.",
+                result={"prediction": 1},
+            )
+        )
+    )
+    assert entry["message"] == "Prediction successful."
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == REQUEST_LOGGER
+    assert entry["result"] == {"prediction": 1}
+
+
+def test_request_sampler_only_drops_request_info_lines():
+    """With a zero rate, request info lines are dropped but warnings and other loggers pass."""
+    sampler = RequestSampler(0.0)
+    assert not sampler.filter(make_record(REQUEST_LOGGER, logging.INFO))
+    assert sampler.filter(make_record(REQUEST_LOGGER, logging.WARNING))
+    assert sampler.filter(make_record("root", logging.INFO))
+    assert RequestSampler(1.0).filter(make_record(REQUEST_LOGGER, logging.INFO))
+
+
+def test_configure_logging_writes_json_lines(tmp_path):
+    """Records logged through the queue are written to the log file as JSON lines."""
+    log_file = tmp_path / "api.log"
+    configure_logging(log_file=str(log_file), sample_rate=0.0)
+    try:
+        logging.getLogger(REQUEST_LOGGER).info("Prediction endpoint hit.")
+        logging.warning("Invalid JSON body.")
+        try:
+            raise ValueError("bad row")
+        except ValueError:
+            logging.error("Prediction %s failed.", "42", exc_info=True)
+        stop_logging()
+        entries = [json.loads(line) for line in log_file.read_text().splitlines()]
+    finally:
+        configure_logging(log_file="")
+    assert [entry["message"] for entry in entries] == [
+        "Invalid JSON body.",
+        "Prediction 42 failed.",
+    ]
+    assert "exception" not in entries[0]
+    assert entries[1]["exception"].startswith("Traceback")
+    assert "ValueError: bad row" in entries[1]["exception"]
+
+
+def test_worker_log_file():
+    assert worker_log_file("logs/api_logs.log", 1234) == "logs/api_logs.1234.log"
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")  # fork with threads running
+def test_forked_child_logs_to_its_own_file(tmp_path):
+    """A forked child restarts the listener and writes to its pid's file, not the parent's."""
+    log_file = tmp_path / "api.log"
+    configure_logging(log_file=str(log_file))
+    try:
+        pid = os.fork()
+        if pid == 0:
+            logging.warning("From the child.")
+            stop_logging()
+            os._exit(0)
+        os.waitpid(pid, 0)
+        logging.warning("From the parent.")
+        stop_logging()
+        child_file = tmp_path / f"api.{pid}.log"
+        parent = [json.loads(line) for line in log_file.read_text().splitlines()]
+        child = [json.loads(line) for line in child_file.read_text().splitlines()]
+    finally:
+        configure_logging(log_file="")
+    assert [entry["message"] for entry in parent] == ["From the parent."]
+    assert [entry["message"] for entry in child] == ["From the child."]
+    assert child[0]["process"] == pid
@@ -0,0 +1,43 @@
+from src.serving.metrics import Counter, Gauge, Histogram, Registry
+
+
+def test_counter_and_gauge_render_per_label_set():
+    """Counters and gauges keep one sample per label combination."""
+    registry = Registry()
+    counter = registry.register(Counter("requests_total", "Requests.", ("status",)))
+    gauge = registry.register(Gauge("in_flight", "In flight."))
+    counter.inc(status=200)
+    counter.inc(status=200)
+    counter.inc(status=422)
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{status="200"} 2' in text
+    assert 'requests_total{status="422"} 1' in text
+    assert "# TYPE in_flight gauge" in text
+    assert "in_flight 1" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    """Histogram buckets count every observation at or below their bound."""
+    histogram = Histogram("latency_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, stage="inference")
+
+    lines = histogram.render().splitlines()
+    assert 'latency_seconds_bucket{stage="inference",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{stage="inference",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{stage="inference",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{stage="inference"} 3.65' in lines
+    assert 'latency_seconds_count{stage="inference"} 4' in lines
+
+
+def test_histogram_timer_observes_block_duration():
+    """Histogram.time() records one observation per block."""
+    histogram = Histogram("stage_seconds", "Stage.", ("stage",))
+    with histogram.time(stage="parse"):
+        pass
+    assert histogram.get_count(stage="parse") == 1
@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.serving.micro_batching import MicroBatcher
+
+
+class CountingModel:
+    """Fake pipeline: P(malignant) is the first feature; counts predict_proba calls."""
+
+    classes_ = np.array([0, 1])
+
+    def __init__(self, fail=False):
+        self.batch_sizes = []
+        self.fail = fail
+
+    def predict_proba(self, X):
+        if self.fail:
+            raise RuntimeError("boom")
+        self.batch_sizes.append(len(X))
+        p = X.to_numpy()[:, 0]
+        return np.column_stack([1 - p, p])
+
+
+def snapshot(pipeline):
+    return SimpleNamespace(pipeline=pipeline, feature_names=["a", "b"])
+
+
+async def predict_many(batcher, loaded, values):
+    batcher.start()
+    try:
+        return await asyncio.gather(
+            *(batcher.predict(loaded, np.array([[v, 0.0]])) for v in values)
+        )
+    finally:
+        await batcher.stop()
+
+
+def test_concurrent_requests_share_one_call():
+    """Requests arriving together are scored with a single predict_proba call."""
+    model = CountingModel()
+    values = [0.1, 0.9, 0.4, 0.7]
+    results = asyncio.run(
+        predict_many(MicroBatcher(max_wait_ms=50), snapshot(model), values)
+    )
+
+    assert model.batch_sizes == [4]
+    for value, (label, proba) in zip(values, results):
+        assert label == int(value > 0.5)
+        np.testing.assert_allclose(proba, [1 - value, value])
+
+
+def test_batches_are_capped_at_max_batch_size():
+    model = CountingModel()
+    asyncio.run(
+        predict_many(
+            MicroBatcher(max_batch_size=3, max_wait_ms=50), snapshot(model), [0.1] * 7
+        )
+    )
+    assert model.batch_sizes == [3, 3, 1]
+
+
+def test_snapshots_are_scored_separately():
+    """Rows decoded for different model snapshots never share a batch."""
+    old, new = CountingModel(), CountingModel()
+
+    async def run():
+        batcher = MicroBatcher(max_wait_ms=50)
+        batcher.start()
+        try:
+            row = np.array([[0.2, 0.0]])
+            await asyncio.gather(
+                batcher.predict(snapshot(old), row),
+                batcher.predict(snapshot(new), row),
+            )
+        finally:
+            await batcher.stop()
+
+    asyncio.run(run())
+    assert old.batch_sizes == [1]
+    assert new.batch_sizes == [1]
+
+
+def test_inference_errors_reach_every_caller():
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(
+            predict_many(MicroBatcher(), snapshot(CountingModel(fail=True)), [0.1, 0.2])
+        )
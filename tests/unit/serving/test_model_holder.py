@@ -0,0 +1,128 @@
+import os
+import time
+
+import joblib
+import pytest
+
+from src.serving.model_state import ModelHolder
+
+
+def wait_for_reload(holder, timeout=10):
+    """Waits until the holder's background reload (if any) has finished."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if holder._reload_lock.acquire(blocking=False):
+            holder._reload_lock.release()
+            return
+        time.sleep(0.01)
+    raise TimeoutError("Background reload did not finish.")
+
+
+def touch_later(path):
+    """Bumps the file's mtime so a rewrite is seen as a change."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_load_activates_model(trained_model_path):
+    """load() publishes a snapshot with version, load time and feature order."""
+    holder = ModelHolder(trained_model_path)
+    loaded = holder.load()
+
+    assert holder.current is loaded
+    assert len(loaded.version) == 12
+    assert loaded.loaded_at
+    assert "radius_mean" in loaded.feature_names
+    assert not holder.has_changed()
+
+
+def test_load_missing_file(tmp_path):
+    """A missing model file raises FileNotFoundError and leaves no model active."""
+    holder = ModelHolder(str(tmp_path / "missing.joblib"))
+    with pytest.raises(FileNotFoundError):
+        holder.load()
+    assert holder.current is None
+
+
+def test_background_reload_swaps_model(trained_model_path):
+    """A changed file is reloaded in the background and swapped in."""
+    holder = ModelHolder(trained_model_path)
+    old = holder.load()
+
+    pipeline = joblib.load(trained_model_path)
+    pipeline.named_steps["classifier"].n_estimators = 99  # different bytes
+    joblib.dump(pipeline, trained_model_path)
+    touch_later(trained_model_path)
+    assert holder.has_changed()
+
+    assert holder.reload_in_background()
+    wait_for_reload(holder)
+
+    assert holder.current is not old
+    assert holder.current.version != old.version
+    assert holder.last_error is None
+
+
+def test_failed_reload_keeps_active_model(trained_model_path):
+    """A model that fails the smoke test is not swapped in."""
+    holder = ModelHolder(trained_model_path)
+    old = holder.load()
+
+    with open(trained_model_path, "wb") as f:
+        f.write(b"not a model")
+    touch_later(trained_model_path)
+
+    assert holder.reload_in_background()
+    wait_for_reload(holder)
+
+    assert holder.current is old
+    assert holder.last_error is not None
+    # The watcher does not retry the broken file until it is rewritten
+    assert not holder.has_changed()
+    touch_later(trained_model_path)
+    assert holder.has_changed()
+
+
+def test_pipeline_failing_smoke_test_is_not_cached(trained_model_path, mocker):
+    """A pipeline that fails the smoke test takes no slot in the pipeline cache."""
+    from src.model import model_inference
+
+    model_inference.invalidate_pipeline_cache()
+    mocker.patch(
+        "src.serving.model_state.smoke_test", side_effect=ValueError("bad output")
+    )
+    holder = ModelHolder(trained_model_path)
+    with pytest.raises(ValueError):
+        holder.load()
+
+    assert not model_inference._pipeline_cache
+    assert not holder.has_changed()
+
+
+def test_registry_rollback_is_picked_up_from_cache(
+    trained_model_path, tmp_path, mocker
+):
+    """Flipping the registry pointer back reloads the old version without unpickling it."""
+    from src.model import model_inference
+    from src.model.model_registry import register_model, rollback
+
+    registry = str(tmp_path / "registry")
+    first = joblib.load(trained_model_path)
+    second = joblib.load(trained_model_path)
+    second.named_steps["classifier"].estimators_ = second.named_steps[
+        "classifier"
+    ].estimators_[:10]
+    v1 = register_model(first, registry)
+    holder = ModelHolder(trained_model_path, registry_dir=registry)
+    first_loaded = holder.load()
+    register_model(second, registry)
+    assert holder.has_changed()
+    holder.load()
+
+    rollback(registry)
+    assert holder.has_changed()
+    load_pipeline = mocker.spy(model_inference, "load_pipeline")
+    loaded = holder.load()
+    load_pipeline.assert_not_called()
+    assert loaded.version == first_loaded.version == v1
+    assert loaded.pipeline is first_loaded.pipeline
@@ -0,0 +1,43 @@
+import numpy as np
+
+from src.serving.prediction_cache import PredictionCache
+
+ROW = np.array([[1.0, 2.0, 3.0]])
+
+
+def test_get_returns_stored_result_and_counts_hits():
+    """A stored row is returned for the same model version and counted as a hit."""
+    cache = PredictionCache(max_size=4)
+    assert cache.get("v1", ROW) is None
+    cache.put("v1", ROW, {"prediction": 1})
+    assert cache.get("v1", ROW.copy()) == {"prediction": 1}
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_new_model_version_clears_the_cache():
+    """Results cached for a previous model version are never returned."""
+    cache = PredictionCache(max_size=4)
+    cache.put("v1", ROW, {"prediction": 1})
+    assert cache.get("v2", ROW) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Beyond max_size, the least recently used row is dropped."""
+    cache = PredictionCache(max_size=2)
+    rows = [ROW + i for i in range(3)]
+    cache.put("v1", rows[0], 0)
+    cache.put("v1", rows[1], 1)
+    cache.get("v1", rows[0])
+    cache.put("v1", rows[2], 2)
+    assert cache.get("v1", rows[1]) is None
+    assert cache.get("v1", rows[0]) == 0
+    assert cache.get("v1", rows[2]) == 2
+
+
+def test_expired_entries_miss():
+    """Entries older than the TTL are treated as misses."""
+    cache = PredictionCache(max_size=2, ttl=-1)
+    cache.put("v1", ROW, {"prediction": 1})
+    assert cache.get("v1", ROW) is None
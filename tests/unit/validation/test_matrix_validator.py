@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from src.schemas import FEATURE_NAMES, PredictRequest
+from src.validation import MatrixValidator, plausible_ranges
+
+MODEL_FEATURES = ["id", *FEATURE_NAMES]
+
+
+@pytest.fixture
+def matrix(sample_payload):
+    """Four copies of the sample payload as rows in MODEL_FEATURES order."""
+    row = [0.0] + [float(sample_payload[name]) for name in FEATURE_NAMES]
+    return np.array([row] * 4)
+
+
+def column(name):
+    return MODEL_FEATURES.index(name)
+
+
+def test_valid_matrix_has_no_errors(matrix):
+    validation = MatrixValidator(MODEL_FEATURES).validate(matrix)
+    assert not validation.invalid.any()
+    assert validation.row_errors() == {}
+    np.testing.assert_array_equal(validation.values, matrix)
+
+
+def test_errors_match_pydantic_shape(matrix, sample_payload):
+    """Negative values get exactly the details the schema produces for them."""
+    matrix[2, column("concave points_mean")] = -1.0
+
+    row_errors = MatrixValidator(MODEL_FEATURES).validate(matrix).row_errors()
+
+    with pytest.raises(ValidationError) as expected:
+        PredictRequest.model_validate({**sample_payload, "concave points_mean": -1.0})
+    assert list(row_errors) == [2]
+    assert row_errors[2] == expected.value.errors()
+
+
+def test_non_finite_and_negative_values(matrix):
+    matrix[0, column("radius_mean")] = np.nan
+    matrix[1, column("area_worst")] = np.inf
+    matrix[1, column("texture_se")] = -2.0
+    matrix[3, 0] = np.nan  # 'id' is not a schema feature and is not checked
+
+    validation = MatrixValidator(MODEL_FEATURES).validate(matrix)
+
+    np.testing.assert_array_equal(validation.invalid, [True, True, False, False])
+    row_errors = validation.row_errors()
+    assert [e["type"] for e in row_errors[0]] == ["finite_number"]
+    assert sorted((e["loc"], e["type"]) for e in row_errors[1]) == [
+        (("area_worst",), "finite_number"),
+        (("texture_se",), "greater_than_equal"),
+    ]
+
+
+def test_plausible_ranges_from_profile(matrix):
+    profile = {
+        "features": ["radius_mean"],
+        "data_min": [10.0],
+        "data_max": [20.0],
+    }
+    ranges = plausible_ranges(profile, margin=0.5)
+    assert ranges == {"radius_mean": (5.0, 25.0)}
+
+    matrix[:, column("radius_mean")] = [4.0, 5.0, 25.0, 26.0]
+    validation = MatrixValidator(MODEL_FEATURES, ranges).validate(matrix)
+
+    np.testing.assert_array_equal(validation.invalid, [True, False, False, True])
+    error = validation.row_errors()[3][0]
+    assert error["type"] == "plausible_range"
+    assert error["loc"] == ("radius_mean",)
+    assert error["input"] == 26.0
+    assert error["ctx"] == {"min": 5.0, "max": 25.0}
+
+
+def test_dataframe_missing_and_non_numeric_columns(sample_payload):
+    frame = pd.DataFrame([sample_payload] * 3).drop(columns="area_mean")
+    frame["radius_mean"] = frame["radius_mean"].astype(object)
+    frame.loc[1, "radius_mean"] = "abc"
+    frame.loc[2, "texture_mean"] = None
+
+    validation = MatrixValidator(FEATURE_NAMES).validate(frame)
+
+    row_errors = validation.row_errors()
+    assert validation.invalid.all()
+    assert [e["type"] for e in row_errors[0]] == ["missing"]
+    assert {e["type"] for e in row_errors[1]} == {"missing", "float_parsing"}
+    parse_error = next(e for e in row_errors[1] if e["type"] == "float_parsing")
+    assert parse_error["input"] == "abc"
+    assert {e["type"] for e in row_errors[2]} == {"missing", "finite_number"}